@@ -1,4 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+
+from dependency_injector.wiring import Provide, inject
+
+from app.core.containers.application_container import ApplicationContainer
+from app.core.dependencies.redis import RedisConnectionManager
+from app.db.databases.postgres import PostgresDatabase
+from app.services.node_definition_service import NodeDefinitionService
 
 router = APIRouter(prefix='/health', tags=['health'])
 
@@ -9,3 +16,45 @@ async def health_check():
         return {'status': 'ok', 'message': 'Server is healthy!'}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get('/db-pool', response_model=dict)
+@inject
+async def db_pool_status(
+    postgres_db: PostgresDatabase = Depends(
+        Provide[ApplicationContainer.database.postgres_db]
+    ),
+):
+    '''Connection pool usage of this worker process.'''
+    try:
+        return {'postgres': postgres_db.pool_status()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get('/redis', response_model=dict)
+@inject
+async def redis_status(
+    redis_manager: RedisConnectionManager = Depends(
+        Provide[ApplicationContainer.custom_containers.redis_manager]
+    ),
+):
+    '''Redis connection pool state of this worker process.'''
+    try:
+        return {'redis': await redis_manager.health()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get('/node-definitions', response_model=dict)
+@inject
+async def node_definition_cache_status(
+    node_def_svc: NodeDefinitionService = Depends(
+        Provide[ApplicationContainer.services.node_definition_service]
+    ),
+):
+    '''Node definition cache hit/miss counters of this worker process.'''
+    try:
+        return {'node_definitions': node_def_svc.stats()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,11 +1,23 @@
+import asyncio
 import json
+from typing import Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+from fastapi.responses import StreamingResponse
 
 from dependency_injector.wiring import Provide, inject
 
+from app.api.responses import model_response
 from app.core.containers.application_container import ApplicationContainer
+from app.core.cache.workflow_definition_store import WorkflowDefinitionStore
 from app.core.dependencies.auth_deps import get_current_user
+from app.core.dependencies.http_cache import (
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+    version_etag,
+)
+from app.core.dependencies.redis import WorkflowClient
 from app.schemas.system_schema import (
     CreateSystemRequest,
     SystemListResponse,
@@ -39,18 +51,34 @@ def create_system(
 
 @router.get('/{workspace_id}/systems', response_model=SystemListResponse)
 @inject
-def get_systems(
+async def get_systems(
     workspace_id: str,
+    page: int | None = None,
+    per_page: int | None = None,
+    cursor: str | None = None,
+    stream: bool = False,
     current_user: UserResponse = Depends(get_current_user),
     system_service: SystemService = Depends(
         Provide[ApplicationContainer.services.system_service]
     ),
 ):
+    '''List systems. `stream=true` returns every system as NDJSON instead.'''
     try:
         if not current_user:
             raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return system_service.get_all_systems(UUID(workspace_id), current_user.id)
+        if stream:
+            # the ownership check blocks; the sync iterator runs in the threadpool
+            lines = await asyncio.to_thread(
+                system_service.stream_systems, UUID(workspace_id), current_user.id
+            )
+            return StreamingResponse(lines, media_type='application/x-ndjson')
+
+        return model_response(
+            await system_service.get_all_systems_async(
+                UUID(workspace_id), current_user.id, page, per_page, cursor
+            )
+        )
     except Exception:
         raise
 
@@ -60,18 +88,37 @@ def get_systems(
 def get_system_info(
     workspace_id: str,
     system_id: str,
+    if_none_match: Optional[str] = Header(None),
     current_user: UserResponse = Depends(get_current_user),
     system_service: SystemService = Depends(
         Provide[ApplicationContainer.services.system_service]
     ),
+    cache_control: str = Depends(
+        Provide[ApplicationContainer.config.CACHE_CONTROL_SYSTEM]
+    ),
 ):
     try:
         if not current_user:
             raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return system_service.get_system(
+        if if_none_match:
+            # version-only query: nothing loaded or serialized when unchanged
+            etag = system_service.get_system_etag(
+                UUID(workspace_id), UUID(system_id), current_user.id
+            )
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, cache_control)
+
+        system = system_service.get_system(
             UUID(workspace_id), UUID(system_id), current_user.id
         )
+        response = model_response(system)
+        set_cache_headers(
+            response,
+            version_etag(system.id, system.updated_at, system.created_at),
+            cache_control,
+        )
+        return response
     except Exception:
         raise
 
@@ -79,13 +126,21 @@ def get_system_info(
 @router.post('/{workspace_id}/systems/{system_id}/activate', response_model=dict)
 @inject
 async def activate_system(
-    request: Request,
     workspace_id: str,
     system_id: str,
     # current_user: UserResponse = Depends(get_current_user),
     system_service: SystemService = Depends(
         Provide[ApplicationContainer.services.system_service]
     ),
+    workflow_client: WorkflowClient = Depends(
+        Provide[ApplicationContainer.custom_containers.workflow_client]
+    ),
+    definition_store: WorkflowDefinitionStore = Depends(
+        Provide[ApplicationContainer.services.workflow_definition_store]
+    ),
+    jobs_by_reference: bool = Depends(
+        Provide[ApplicationContainer.config.WORKFLOW_JOBS_BY_REFERENCE]
+    ),
 ):
     try:
         # if not current_user:
@@ -116,11 +171,18 @@ async def activate_system(
                     "job_id": str(uuid4()),
                     "workflow_id": req["id"],
                     "task_name": "start",
-                    "payload": req,
                     "exec_id": str(uuid4()),
                 }
+                if jobs_by_reference:
+                    # consumers fetch `workflow:def:<hash>` once and cache it
+                    job["workflow_hash"] = await definition_store.publish(req)
+                else:
+                    job["payload"] = req
                 print(f"Enqueued job: {job['job_id']}")
-                await request.app.state.redis.lpush("queue:main", json.dumps(job))
+                # goes through the configured queue backend (list or stream)
+                await workflow_client.connect()
+                await workflow_client.enqueue_jobs([job])
+                await workflow_client.close()
         except FileNotFoundError:
             raise HTTPException(status_code=500, detail='Workflow file not found.')
 
@@ -1,16 +1,52 @@
+import json
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from dependency_injector.wiring import Provide, inject
 
+from app.api.responses import model_response
 from app.core.containers.application_container import ApplicationContainer
-from app.core.dependencies.auth_deps import get_current_user
+from app.core.dependencies.auth_deps import (
+    authenticate_user,
+    get_current_user,
+    get_stream_user,
+)
+from app.core.dependencies.execution_events import ExecutionEventHub, check_event_id
+from app.core.dependencies.http_cache import (
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.dependencies.jwt_verifier import JwtVerifier
+from app.core.dependencies.upload_trigger_deps import get_trigger_config
+from app.db.databases.supabase import SupabaseDatabase
+from app.db.unit_of_work import without_unit_of_work
+from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserResponse
 from app.schemas.system_execution_schema import (
+    BatchStartExecutionRequest,
+    BatchStartExecutionResponse,
     CreateSystemExecutionRequest,
+    ExecutionLogListResponse,
     SystemExecutionResponse,
+    UploadTriggerResponse,
 )
+from app.schemas.node_definition_schema import FileUploadTriggerNode
 from app.services.system_execution_service import SystemExecutionService
+from app.services.upload_trigger_service import UploadTriggerService
 
 
 router = APIRouter(prefix='/executions', tags=['system execution'])
@@ -39,6 +75,242 @@ def create_execution(
 @router.get('/{execution_id}', response_model=SystemExecutionResponse)
 @inject
 def get_execution(
+    execution_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user),
+    execution_service: SystemExecutionService = Depends(
+        Provide[ApplicationContainer.services.system_execution_service]
+    ),
+    cache_control: str = Depends(
+        Provide[ApplicationContainer.config.CACHE_CONTROL_EXECUTION]
+    ),
+):
+    try:
+        if not current_user:
+            raise HTTPException(status_code=401, detail='Unauthorized access.')
+
+        if if_none_match:
+            # version-only query: system_json is neither loaded nor resolved
+            etag = execution_service.get_execution_etag(UUID(execution_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, cache_control)
+
+        execution = execution_service.get_execution(UUID(execution_id))
+        response = model_response(execution)
+        set_cache_headers(
+            response, execution_service.execution_etag(execution), cache_control
+        )
+        return response
+    except Exception:
+        raise
+
+
+@router.get('/{execution_id}/logs', response_model=ExecutionLogListResponse)
+@inject
+def get_execution_logs(
+    execution_id: str,
+    after: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    stream: bool = False,
+    current_user: UserResponse = Depends(get_current_user),
+    execution_service: SystemExecutionService = Depends(
+        Provide[ApplicationContainer.services.system_execution_service]
+    ),
+):
+    '''Log lines with seq > `after`. `stream=true` returns all of them as NDJSON.'''
+    try:
+        if not current_user:
+            raise HTTPException(status_code=401, detail='Unauthorized access.')
+
+        if stream:
+            return StreamingResponse(
+                execution_service.stream_logs(UUID(execution_id), after),
+                media_type='application/x-ndjson',
+            )
+
+        return model_response(
+            execution_service.get_logs(UUID(execution_id), after, limit)
+        )
+    except Exception:
+        raise
+
+
+def _sse_message(event: Optional[dict]) -> str:
+    if event is None:
+        # comment line: keeps proxies from closing an idle connection
+        return ': ping\n\n'
+    return (
+        f"id: {event['id']}\n"
+        f"event: {event['type']}\n"
+        f"data: {json.dumps(event['data'], separators=(',', ':'))}\n\n"
+    )
+
+
+@router.get('/{execution_id}/events')
+@inject
+async def stream_execution_events(
+    execution_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    after: Optional[str] = Query(None, description='Resume after this event id'),
+    current_user: UserResponse = Depends(get_stream_user),
+    execution_service: SystemExecutionService = Depends(
+        Provide[ApplicationContainer.services.system_execution_service]
+    ),
+    event_hub: ExecutionEventHub = Depends(
+        Provide[ApplicationContainer.custom_containers.execution_event_hub]
+    ),
+    heartbeat: int = Depends(
+        Provide[ApplicationContainer.config.EXECUTION_EVENTS_HEARTBEAT_SECONDS]
+    ),
+):
+    '''Server-Sent Events of an execution: status changes and log lines.
+
+    Events stored since `Last-Event-ID` (sent by `EventSource` on reconnect)
+    or `after` are replayed first, then live events follow.
+    '''
+    try:
+        if not current_user:
+            raise HTTPException(status_code=401, detail='Unauthorized access.')
+
+        resume_after = last_event_id or after
+        try:
+            check_event_id(resume_after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        await run_in_threadpool(execution_service.ensure_exists, UUID(execution_id))
+
+        async def events():
+            async for event in event_hub.subscribe(
+                execution_id, resume_after, heartbeat=heartbeat
+            ):
+                if event is None and await request.is_disconnected():
+                    break
+                yield _sse_message(event)
+
+        return StreamingResponse(
+            events(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+    except Exception:
+        raise
+
+
+@router.websocket('/{execution_id}/events/ws')
+@inject
+async def execution_events_ws(
+    websocket: WebSocket,
+    execution_id: str,
+    access_token: Optional[str] = None,
+    after: Optional[str] = None,
+    supabase_db: SupabaseDatabase = Depends(
+        Provide[ApplicationContainer.database.supabase_db]
+    ),
+    user_repo: UserRepository = Depends(
+        Provide[ApplicationContainer.repositories.user_repository]
+    ),
+    jwt_verifier: JwtVerifier = Depends(
+        Provide[ApplicationContainer.custom_containers.jwt_verifier]
+    ),
+    execution_service: SystemExecutionService = Depends(
+        Provide[ApplicationContainer.services.system_execution_service]
+    ),
+    event_hub: ExecutionEventHub = Depends(
+        Provide[ApplicationContainer.custom_containers.execution_event_hub]
+    ),
+    heartbeat: int = Depends(
+        Provide[ApplicationContainer.config.EXECUTION_EVENTS_HEARTBEAT_SECONDS]
+    ),
+):
+    '''Same events as `GET /{execution_id}/events`, as JSON WebSocket messages.'''
+    try:
+        check_event_id(after)
+        await run_in_threadpool(
+            authenticate_user, access_token, supabase_db, user_repo, jwt_verifier
+        )
+        await run_in_threadpool(execution_service.ensure_exists, UUID(execution_id))
+    except (HTTPException, ValueError) as e:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason=getattr(e, 'detail', str(e)),
+        )
+        return
+
+    await websocket.accept()
+    try:
+        async for event in event_hub.subscribe(
+            execution_id, after, heartbeat=heartbeat
+        ):
+            await websocket.send_json(event if event is not None else {'type': 'ping'})
+    except WebSocketDisconnect:
+        pass
+
+
+# declared before '/{execution_id}' so 'batch-start' is not taken for an id
+@router.post('/batch-start', response_model=BatchStartExecutionResponse)
+@inject
+def batch_start_workflows(
+    payload: BatchStartExecutionRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    execution_service: SystemExecutionService = Depends(
+        Provide[ApplicationContainer.services.system_execution_service]
+    ),
+):
+    try:
+        if not current_user:
+            raise HTTPException(status_code=401, detail='Unauthorized access.')
+
+        return execution_service.start_many(payload.execution_ids)
+    except Exception:
+        raise
+
+
+@router.post(
+    '/{execution_id}/upload',
+    response_model=UploadTriggerResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    # the body can stream for minutes: don't hold a connection for the request
+    dependencies=[Depends(without_unit_of_work)],
+)
+@inject
+async def upload_trigger(
+    execution_id: str,
+    request: Request,
+    x_file_name: Optional[str] = Header(None),
+    content_type: Optional[str] = Header(None),
+    content_length: Optional[int] = Header(None),
+    current_user: UserResponse = Depends(get_current_user),
+    trigger_config: FileUploadTriggerNode = Depends(get_trigger_config),
+    upload_service: UploadTriggerService = Depends(
+        Provide[ApplicationContainer.services.upload_trigger_service]
+    ),
+):
+    '''Start an execution from an uploaded file.
+
+    The body is the raw file (not multipart) and is streamed to storage;
+    `X-File-Name` names it. The trigger job receives the file reference.
+    '''
+    try:
+        if not current_user:
+            raise HTTPException(status_code=401, detail='Unauthorized access.')
+
+        return await upload_service.upload(
+            UUID(execution_id),
+            trigger_config,
+            request.stream(),
+            x_file_name,
+            content_type,
+            content_length,
+        )
+    except Exception:
+        raise
+
+
+@router.post('/{execution_id}/stop', response_model=SystemExecutionResponse)
+@inject
+async def stop_workflow(
     execution_id: str,
     current_user: UserResponse = Depends(get_current_user),
     execution_service: SystemExecutionService = Depends(
@@ -49,7 +321,7 @@ def get_execution(
         if not current_user:
             raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return execution_service.get_execution(UUID(execution_id))
+        return await execution_service.stop(UUID(execution_id))
     except Exception:
         raise
 
@@ -59,7 +331,6 @@ def get_execution(
 async def start_workflow(
     execution_id: str,
     # current_user: UserResponse = Depends(get_current_user),
-    background_tasks: BackgroundTasks,
     execution_service: SystemExecutionService = Depends(
         Provide[ApplicationContainer.services.system_execution_service]
     ),
@@ -68,6 +339,6 @@ async def start_workflow(
         # if not current_user:
         #     raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return await execution_service.start(UUID(execution_id), background_tasks)
+        return await execution_service.start(UUID(execution_id))
     except Exception:
         raise
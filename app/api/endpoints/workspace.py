@@ -1,10 +1,18 @@
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, status
 
 from dependency_injector.wiring import Provide, inject
 
+from app.api.responses import model_response
 from app.core.containers.application_container import ApplicationContainer
 from app.core.dependencies.auth_deps import get_current_user
+from app.core.dependencies.http_cache import (
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+    version_etag,
+)
 from app.schemas.user_schema import UserResponse
 from app.schemas.workspace_schema import (
     CreateWorkspaceRequest,
@@ -37,9 +45,11 @@ def create_workspace(
 
 @router.get('/', response_model=WorkspaceListResponse)
 @inject
-def get_workspace(
+async def get_workspace(
     page: int = 1,
     per_page: int = 10,
+    include_total: bool = True,
+    cursor: str | None = None,
     current_user: UserResponse = Depends(get_current_user),
     workspace_service: WorkspaceService = Depends(
         Provide[ApplicationContainer.services.workspace_service]
@@ -49,7 +59,11 @@ def get_workspace(
         if not current_user:
             raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return workspace_service.get_all_workspaces(current_user.id, page, per_page)
+        return model_response(
+            await workspace_service.get_all_workspaces_async(
+                current_user.id, page, per_page, include_total, cursor
+            )
+        )
     except Exception:
         raise
 
@@ -58,23 +72,42 @@ def get_workspace(
 @inject
 def get_workspace_info(
     workspace_id: str,
+    if_none_match: Optional[str] = Header(None),
     current_user: UserResponse = Depends(get_current_user),
     workspace_service: WorkspaceService = Depends(
         Provide[ApplicationContainer.services.workspace_service]
     ),
+    cache_control: str = Depends(
+        Provide[ApplicationContainer.config.CACHE_CONTROL_WORKSPACE]
+    ),
 ):
     try:
         if not current_user:
             raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return workspace_service.get_workspace(UUID(workspace_id), current_user.id)
+        if if_none_match:
+            # version-only query: nothing loaded or serialized when unchanged
+            etag = workspace_service.get_workspace_etag(
+                UUID(workspace_id), current_user.id
+            )
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, cache_control)
+
+        workspace = workspace_service.get_workspace(UUID(workspace_id), current_user.id)
+        response = model_response(workspace)
+        set_cache_headers(
+            response,
+            version_etag(workspace.id, workspace.updated_at, workspace.created_at),
+            cache_control,
+        )
+        return response
     except Exception:
         raise
 
 
 @router.post('/search', response_model=WorkspaceListResponse)
 @inject
-def search_workspace(
+async def search_workspace(
     payload: SearchWorkspaceRequest,
     current_user: UserResponse = Depends(get_current_user),
     workspace_service: WorkspaceService = Depends(
@@ -85,7 +118,9 @@ def search_workspace(
         if not current_user:
             raise HTTPException(status_code=401, detail='Unauthorized access.')
 
-        return workspace_service.search_workspace(payload, current_user.id)
+        return model_response(
+            await workspace_service.search_workspace_async(payload, current_user.id)
+        )
     except Exception:
         raise
 
@@ -0,0 +1,25 @@
+'''Fast JSON rendering of already-built response models.
+
+Returning a model from an endpoint makes FastAPI dump it to a dict,
+validate the dict against `response_model` again, run `jsonable_encoder`
+and finally `json.dumps`. For a model the service built with exactly the
+`response_model` type, all of that is redundant:
+
+  return model_response(workspace_service.get_all_workspaces(...))
+
+renders it once with pydantic-core's Rust serializer. Keep `response_model`
+on the route: it still documents the response in the OpenAPI schema.
+'''
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+
+def model_response(
+    model: BaseModel, status_code: int = status.HTTP_200_OK
+) -> Response:
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type='application/json',
+    )
@@ -6,18 +6,19 @@ This moves the procedural functions from `app/main.py` into an
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import Optional
 
 from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
-# from redis import asyncio as aioredis
-
 from app.api.routes import routers
 from app.configs.app_config import configs
 from app.core.containers.application_container import ApplicationContainer
+from app.db.unit_of_work import UnitOfWorkMiddleware
 
 
 class Application:
@@ -45,6 +46,16 @@ class Application:
                 allow_headers=['*'],
             )
 
+    def _add_unit_of_work(self, app: FastAPI) -> None:
+        '''One database session and transaction per request (see
+        `app.db.unit_of_work`); the database comes from the container.
+        '''
+
+        if self.configs.DB_UNIT_OF_WORK_ENABLED:
+            app.add_middleware(
+                UnitOfWorkMiddleware, database=self.container.database.postgres_db
+            )
+
     def _add_simple_endpoints(self, app: FastAPI) -> None:
         @app.get('/', include_in_schema=False)
         async def health() -> dict[str, str]:
@@ -74,11 +85,43 @@ class Application:
 
         self.container.init_resources()
         app.state.container = self.container
+
+        async_db = None
+        if self.configs.DB_ASYNC_ENABLED:
+            async_db = self.container.database.async_postgres_db()
+
+        redis_manager = self.container.custom_containers.redis_manager()
+        await redis_manager.start()
+        app.state.redis = redis_manager.client
+
+        event_hub = self.container.custom_containers.execution_event_hub()
+        await event_hub.start()
+
+        if self.configs.NODE_DEFINITION_PRELOAD:
+            try:
+                await asyncio.to_thread(
+                    self.container.services.node_definition_service().preload
+                )
+            except Exception as e:
+                # the cache fills on demand instead; not a reason to refuse to start
+                logger.warning('Node definition preload failed: %s', e)
+
+        outbox_relay = None
+        if self.configs.OUTBOX_RELAY_ENABLED:
+            outbox_relay = self.container.services.outbox_relay()
+            await outbox_relay.start()
+
         # keep backward-compatible shortcut used elsewhere
         try:
             yield
         finally:
             logger.info('Shutting down application...')
+            if outbox_relay is not None:
+                await outbox_relay.stop()
+            await event_hub.stop()
+            await redis_manager.stop()
+            if async_db is not None:
+                await async_db.dispose()
             self.container.shutdown_resources()
             logger.info('Application shutdown complete')
 
@@ -93,12 +136,10 @@ class Application:
             version='0.0.1',
             openapi_url=f'{self.configs.API}/openapi.json',
             lifespan=self._lifespan,
+            # orjson renders the (validated) responses of every other route
+            default_response_class=ORJSONResponse,
         )
-        # redis = aioredis.from_url(
-        #     configs.REDIS_URL, encoding="utf-8", decode_responses=True
-        # )
-        # app.state.redis = redis
-
+        self._add_unit_of_work(app)
         self._add_cors(app)
         self._add_simple_endpoints(app)
         self._include_routes(app)
@@ -61,11 +61,157 @@ class AppConfig(BaseSettings):
         database=DB_NAME,
     )
 
+    # Connection pool (per process: size the pool for the uvicorn worker count,
+    # total connections = workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW))
+    DB_POOL_SIZE: int = os.getenv('DB_POOL_SIZE', 5)
+    DB_MAX_OVERFLOW: int = os.getenv('DB_MAX_OVERFLOW', 10)
+    DB_POOL_TIMEOUT: int = os.getenv('DB_POOL_TIMEOUT', 30)
+    DB_POOL_RECYCLE: int = os.getenv('DB_POOL_RECYCLE', 1800)
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', True)
+    # 0 disables the server-side statement timeout
+    DB_STATEMENT_TIMEOUT_MS: int = os.getenv('DB_STATEMENT_TIMEOUT_MS', 0)
+    # one session and one transaction per HTTP request (app/db/unit_of_work.py)
+    DB_UNIT_OF_WORK_ENABLED: bool = os.getenv('DB_UNIT_OF_WORK_ENABLED', True)
+
+    # Same database through asyncpg, used by the async repositories
+    ASYNC_DATABASE_URI: str = DATABASE_URI_FORMAT.format(
+        db_engine='postgresql+asyncpg',
+        user=DB_USER,
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=DB_PORT,
+        database=DB_NAME,
+    )
+    # The workspace and system list endpoints read through asyncpg on the event
+    # loop (a second pool of DB_POOL_SIZE); off: the sync repositories in threads
+    DB_ASYNC_ENABLED: bool = os.getenv('DB_ASYNC_ENABLED', False)
+
     SUPABASE_URL: str = os.getenv('SUPABASE_URL', '')
     SUPABASE_ANON_KEY: str = os.getenv('SUPABASE_ANON_KEY', '')
+    SUPABASE_JWT_SECRET: str = os.getenv('SUPABASE_JWT_SECRET', '')
+    SUPABASE_JWKS_URL: str = os.getenv('SUPABASE_JWKS_URL', '')
+
+    # 'remote': validate every token with Supabase Auth (one HTTP call per request)
+    # 'local': verify the signature in-process, fall back to Supabase Auth only
+    # when the signing key is unknown
+    AUTH_VERIFY_MODE: str = os.getenv('AUTH_VERIFY_MODE', 'remote')
+    JWKS_REFRESH_SECONDS: int = os.getenv('JWKS_REFRESH_SECONDS', 600)
+    JWT_AUDIENCE: str = os.getenv('JWT_AUDIENCE', 'authenticated')
 
     REDIS_URL: str = os.getenv('REDIS_URL', 'redis://35.189.8.131:6379/1')
     MAIN_QUEUE: str = os.getenv('MAIN_QUEUE', 'queue:main')
+    # 'list': LPUSH onto MAIN_QUEUE (no acknowledgement)
+    # 'stream': XADD onto QUEUE_STREAM, consumed through a consumer group
+    QUEUE_BACKEND: str = os.getenv('QUEUE_BACKEND', 'list')
+    QUEUE_STREAM: str = os.getenv('QUEUE_STREAM', 'stream:main')
+    QUEUE_STREAM_MAXLEN: int = os.getenv('QUEUE_STREAM_MAXLEN', 100000)
+    QUEUE_CONSUMER_GROUP: str = os.getenv('QUEUE_CONSUMER_GROUP', 'workers')
+    # pending entries idle for longer are reclaimed by another consumer (0: never)
+    QUEUE_CLAIM_IDLE_MS: int = os.getenv('QUEUE_CLAIM_IDLE_MS', 60000)
+    # Job wire format (see app/core/dependencies/job_codec.py)
+    # 'legacy': plain JSON text; 'json' / 'msgpack': binary with a codec header
+    JOB_CODEC: str = os.getenv('JOB_CODEC', 'legacy')
+    # 'none', 'zlib' or 'zstd', applied to jobs of at least the threshold bytes
+    JOB_COMPRESSION: str = os.getenv('JOB_COMPRESSION', 'none')
+    JOB_COMPRESSION_THRESHOLD: int = os.getenv('JOB_COMPRESSION_THRESHOLD', 1024)
+    # Execution log lines are buffered and written in multi-row INSERTs
+    EXECUTION_LOG_BATCH_SIZE: int = os.getenv('EXECUTION_LOG_BATCH_SIZE', 500)
+    EXECUTION_LOG_FLUSH_INTERVAL: float = os.getenv(
+        'EXECUTION_LOG_FLUSH_INTERVAL', 0.5
+    )
+
+    # Live execution events: per-execution Redis stream (resume) + pub/sub
+    EXECUTION_EVENTS_MAXLEN: int = os.getenv('EXECUTION_EVENTS_MAXLEN', 1000)
+    EXECUTION_EVENTS_TTL_SECONDS: int = os.getenv(
+        'EXECUTION_EVENTS_TTL_SECONDS', 86400
+    )
+    EXECUTION_EVENTS_HEARTBEAT_SECONDS: int = os.getenv(
+        'EXECUTION_EVENTS_HEARTBEAT_SECONDS', 15
+    )
+
+    # python -m app.workers.workflow_worker
+    WORKER_CONCURRENCY: int = os.getenv('WORKER_CONCURRENCY', 32)
+    WORKER_MAX_JOBS: int = os.getenv('WORKER_MAX_JOBS', 64)
+    WORKER_POP_TIMEOUT: int = os.getenv('WORKER_POP_TIMEOUT', 1)
+    WORKER_SHUTDOWN_TIMEOUT: int = os.getenv('WORKER_SHUTDOWN_TIMEOUT', 30)
+
+    # Execution triggers go through the execution_outbox table; every API
+    # process runs a relay draining it to the queue (app/services/outbox_relay.py)
+    OUTBOX_RELAY_ENABLED: bool = os.getenv('OUTBOX_RELAY_ENABLED', True)
+    OUTBOX_BATCH_SIZE: int = os.getenv('OUTBOX_BATCH_SIZE', 500)
+    OUTBOX_POLL_INTERVAL: float = os.getenv('OUTBOX_POLL_INTERVAL', 0.5)
+    # a claimed row is claimed again if not completed within the lease
+    OUTBOX_LEASE_SECONDS: int = os.getenv('OUTBOX_LEASE_SECONDS', 30)
+    OUTBOX_MAX_ATTEMPTS: int = os.getenv('OUTBOX_MAX_ATTEMPTS', 10)
+    OUTBOX_RETRY_BASE_SECONDS: float = os.getenv('OUTBOX_RETRY_BASE_SECONDS', 1)
+    OUTBOX_RETRY_MAX_SECONDS: float = os.getenv('OUTBOX_RETRY_MAX_SECONDS', 300)
+
+    # File-upload trigger: files are stored as <UPLOAD_DIR>/<sha256><ext>
+    UPLOAD_DIR: str = os.getenv('UPLOAD_DIR', 'uploads')
+    # bytes hashed and written per worker-thread call while streaming
+    UPLOAD_CHUNK_SIZE: int = os.getenv('UPLOAD_CHUNK_SIZE', 1024 * 1024)
+    # node_definitions row of the file-upload trigger
+    UPLOAD_TRIGGER_NODE_DEFINITION_ID: str = os.getenv(
+        'UPLOAD_TRIGGER_NODE_DEFINITION_ID', '40000000-0000-0000-0000-000000000002'
+    )
+
+    # Node definition catalog cache; public rows are loaded at startup
+    NODE_DEFINITION_CACHE_SIZE: int = os.getenv('NODE_DEFINITION_CACHE_SIZE', 4096)
+    NODE_DEFINITION_CACHE_TTL_SECONDS: int = os.getenv(
+        'NODE_DEFINITION_CACHE_TTL_SECONDS', 3600
+    )
+    NODE_DEFINITION_PRELOAD: bool = os.getenv('NODE_DEFINITION_PRELOAD', True)
+
+    # Cache-Control of conditional GETs (ETag / If-None-Match). Responses are
+    # per user: 'private'. Executions change while running: always revalidate.
+    CACHE_CONTROL_WORKSPACE: str = os.getenv(
+        'CACHE_CONTROL_WORKSPACE', 'private, max-age=5, must-revalidate'
+    )
+    CACHE_CONTROL_SYSTEM: str = os.getenv(
+        'CACHE_CONTROL_SYSTEM', 'private, max-age=5, must-revalidate'
+    )
+    CACHE_CONTROL_EXECUTION: str = os.getenv(
+        'CACHE_CONTROL_EXECUTION', 'private, no-cache'
+    )
+    REDIS_MAX_CONNECTIONS: int = os.getenv('REDIS_MAX_CONNECTIONS', 50)
+    REDIS_HEALTH_CHECK_INTERVAL: int = os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30)
+    REDIS_RETRY_ATTEMPTS: int = os.getenv('REDIS_RETRY_ATTEMPTS', 3)
+
+    WORKFLOW_GRAPH_CACHE_SIZE: int = os.getenv('WORKFLOW_GRAPH_CACHE_SIZE', 256)
+    WORKFLOW_GRAPH_CACHE_TTL_SECONDS: int = os.getenv(
+        'WORKFLOW_GRAPH_CACHE_TTL_SECONDS', 3600
+    )
+
+    # Content-addressed workflow definitions (see WorkflowDefinitionStore)
+    WORKFLOW_DEFINITION_CACHE_SIZE: int = os.getenv(
+        'WORKFLOW_DEFINITION_CACHE_SIZE', 256
+    )
+    WORKFLOW_DEFINITION_CACHE_TTL_SECONDS: int = os.getenv(
+        'WORKFLOW_DEFINITION_CACHE_TTL_SECONDS', 3600
+    )
+    # 0 keeps the Redis copy until evicted
+    WORKFLOW_DEFINITION_REDIS_TTL_SECONDS: int = os.getenv(
+        'WORKFLOW_DEFINITION_REDIS_TTL_SECONDS', 604800
+    )
+    # True: activate jobs carry `workflow_hash` instead of the full workflow
+    # `payload`. Off by default until every queue consumer resolves hashes.
+    # (Trigger jobs always carry the hash; the outbox relay publishes them.)
+    WORKFLOW_JOBS_BY_REFERENCE: bool = os.getenv('WORKFLOW_JOBS_BY_REFERENCE', False)
+
+    # Authenticated user profiles; an empty USER_CACHE_REDIS_URL disables the
+    # shared Redis tier
+    USER_CACHE_MAXSIZE: int = os.getenv('USER_CACHE_MAXSIZE', 10000)
+    USER_CACHE_TTL_SECONDS: int = os.getenv('USER_CACHE_TTL_SECONDS', 300)
+    USER_CACHE_REDIS_URL: str = os.getenv('USER_CACHE_REDIS_URL', '')
+
+    # Workspace ownership checks; deletes in another worker become visible
+    # after at most the TTL
+    WORKSPACE_OWNERSHIP_CACHE_MAXSIZE: int = os.getenv(
+        'WORKSPACE_OWNERSHIP_CACHE_MAXSIZE', 10000
+    )
+    WORKSPACE_OWNERSHIP_CACHE_TTL_SECONDS: int = os.getenv(
+        'WORKSPACE_OWNERSHIP_CACHE_TTL_SECONDS', 60
+    )
 
     PAGE: int = 1
     PAGE_SIZE: int = 20
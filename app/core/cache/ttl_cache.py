@@ -0,0 +1,87 @@
+'''Bounded in-process cache with per-entry TTL and LRU eviction.'''
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    '''Thread-safe LRU cache whose entries expire `ttl` seconds after being set.
+
+    Usage:
+      cache = TTLCache(maxsize=1000, ttl=300)
+      cache.set(key, value)
+      value = cache.get(key)  # None on miss / expiry
+      cache.stats()           # {'hits': .., 'misses': .., ...}
+
+    Sync endpoints run in FastAPI's threadpool, so every operation takes a
+    lock; the critical sections are a few dict operations.
+    '''
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self._timer = timer
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
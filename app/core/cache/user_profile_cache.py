@@ -0,0 +1,100 @@
+'''Two-tier cache of `users` rows keyed by the auth subject (Supabase user id).
+
+Tier 1 is a per-process `TTLCache`. Tier 2 is optional: when
+`USER_CACHE_REDIS_URL` is set, entries are also written to Redis so every
+uvicorn worker can reuse a profile another worker already loaded.
+'''
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable, Optional
+
+import redis
+
+from app.core.cache.ttl_cache import TTLCache
+from app.schemas.user_schema import UserResponse
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'cache:user:'
+
+
+class UserProfileCache:
+    def __init__(self, config: Optional[Any] = None) -> None:
+        config = config or {}
+        self.ttl = int(config.get('USER_CACHE_TTL_SECONDS') or 300)
+        self.local = TTLCache(
+            maxsize=int(config.get('USER_CACHE_MAXSIZE') or 10000), ttl=self.ttl
+        )
+
+        redis_url = config.get('USER_CACHE_REDIS_URL')
+        self.redis: Optional[redis.Redis] = (
+            redis.Redis.from_url(redis_url, decode_responses=True)
+            if redis_url
+            else None
+        )
+        self.redis_hits = 0
+
+    def get(self, subject: str) -> Optional[UserResponse]:
+        profile = self.local.get(str(subject))
+        if profile is not None or self.redis is None:
+            return profile
+
+        try:
+            raw = self.redis.get(REDIS_KEY_PREFIX + str(subject))
+        except redis.RedisError as e:
+            # the shared tier is best effort, the database is the source of truth
+            logger.warning('User cache redis tier unavailable: %s', e)
+            return None
+
+        if raw is None:
+            return None
+
+        profile = UserResponse.model_validate_json(raw)
+        self.local.set(str(subject), profile)
+        self.redis_hits += 1
+        return profile
+
+    def set(self, subject: str, profile: UserResponse) -> None:
+        self.local.set(str(subject), profile)
+        if self.redis is None:
+            return
+
+        try:
+            self.redis.set(
+                REDIS_KEY_PREFIX + str(subject),
+                profile.model_dump_json(),
+                ex=self.ttl,
+            )
+        except redis.RedisError as e:
+            logger.warning('User cache redis tier unavailable: %s', e)
+
+    def invalidate(self, subject: str) -> None:
+        self.local.delete(str(subject))
+        if self.redis is None:
+            return
+
+        try:
+            self.redis.delete(REDIS_KEY_PREFIX + str(subject))
+        except redis.RedisError as e:
+            logger.warning('User cache redis tier unavailable: %s', e)
+
+    def invalidate_many(self, subjects: Iterable[str]) -> None:
+        subjects = [str(subject) for subject in subjects]
+        for subject in subjects:
+            self.local.delete(subject)
+        if self.redis is None or not subjects:
+            return
+
+        try:
+            # one round-trip per 1000 keys instead of one per key
+            for start in range(0, len(subjects), 1000):
+                self.redis.delete(
+                    *(REDIS_KEY_PREFIX + s for s in subjects[start : start + 1000])
+                )
+        except redis.RedisError as e:
+            logger.warning('User cache redis tier unavailable: %s', e)
+
+    def stats(self) -> dict:
+        return {**self.local.stats(), 'redis_hits': self.redis_hits}
@@ -0,0 +1,140 @@
+'''Content-addressed store of workflow definitions.
+
+A definition is identified by the sha256 of its canonical JSON
+(`workflow_content_hash`). Executions and queue jobs carry that hash instead
+of a full copy of the workflow JSON; readers resolve it through three tiers:
+
+1. a per-process `TTLCache` (definitions are immutable, so entries never go
+   stale),
+2. Redis, `workflow:def:<hash>`, written with `SET NX` so the queue
+   consumers can fetch a definition without a database connection,
+3. the `workflow_definitions` table, the durable copy.
+'''
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.dependencies.redis import RedisConnectionManager
+from app.core.dependencies.workflow_graph import workflow_content_hash
+from app.db.unit_of_work import after_commit
+from app.repositories.workflow_definition_repository import (
+    WorkflowDefinitionRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'workflow:def:'
+
+
+class WorkflowDefinitionStore:
+    def __init__(
+        self,
+        repository: WorkflowDefinitionRepository,
+        connection_manager: Optional[RedisConnectionManager] = None,
+        config: Optional[Any] = None,
+    ) -> None:
+        config = config or {}
+        self.repository = repository
+        self.connection_manager = connection_manager
+        self.redis_ttl = int(config.get('WORKFLOW_DEFINITION_REDIS_TTL_SECONDS') or 0)
+        self.local = TTLCache(
+            maxsize=int(config.get('WORKFLOW_DEFINITION_CACHE_SIZE') or 256),
+            ttl=int(config.get('WORKFLOW_DEFINITION_CACHE_TTL_SECONDS') or 3600),
+        )
+        # hashes known to have a `workflow_definitions` row. Not `local`:
+        # `publish` / `resolve` fill that one without touching the database
+        self.persisted = TTLCache(
+            maxsize=int(config.get('WORKFLOW_DEFINITION_CACHE_SIZE') or 256),
+            ttl=int(config.get('WORKFLOW_DEFINITION_CACHE_TTL_SECONDS') or 3600),
+        )
+
+    # -- database tier (sync, used from the services) --
+
+    def save(self, definition: dict) -> str:
+        '''Persist `definition` once and return its content hash.'''
+
+        content_hash = workflow_content_hash(definition)
+        if self.persisted.get(content_hash) is None:
+            size = len(json.dumps(definition, separators=(',', ':'), default=str))
+            self.repository.save(content_hash, definition, size)
+            # only once committed: a rolled-back request leaves no row
+            after_commit(
+                functools.partial(self._remember_persisted, content_hash, definition)
+            )
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[dict]:
+        definition = self.local.get(content_hash)
+        if definition is None:
+            definition = self.repository.find_by_hash(content_hash)
+            if definition is not None:
+                self._remember_persisted(content_hash, definition)
+        return definition
+
+    def _remember_persisted(self, content_hash: str, definition: dict) -> None:
+        self.local.set(content_hash, definition)
+        self.persisted.set(content_hash, True)
+
+    # -- Redis tier (async, used on the enqueue / consume paths) --
+
+    async def publish(
+        self, definition: dict, content_hash: Optional[str] = None
+    ) -> str:
+        '''Make `definition` fetchable from Redis by its hash and return the hash.
+
+        `SET NX` leaves an existing key (and its TTL) untouched, so publishing
+        the same workflow for every job costs one small round-trip, not a
+        re-upload of the JSON.
+        '''
+
+        content_hash = content_hash or workflow_content_hash(definition)
+        self.local.set(content_hash, definition)
+
+        redis = await self.connection_manager.get_client()
+        await redis.set(
+            REDIS_KEY_PREFIX + content_hash,
+            json.dumps(definition, separators=(',', ':'), default=str),
+            nx=True,
+            ex=self.redis_ttl or None,
+        )
+        return content_hash
+
+    async def resolve(self, content_hash: str) -> Optional[dict]:
+        '''Return the definition of `content_hash` from the nearest tier.'''
+
+        definition = self.local.get(content_hash)
+        if definition is not None:
+            return definition
+
+        if self.connection_manager is not None:
+            try:
+                redis = await self.connection_manager.get_client()
+                raw = await redis.get(REDIS_KEY_PREFIX + content_hash)
+            except RedisError as e:
+                logger.warning('Workflow definition redis tier unavailable: %s', e)
+                raw = None
+            if raw is not None:
+                definition = json.loads(raw)
+                self.local.set(content_hash, definition)
+                return definition
+
+        # expired from Redis (or never published): load from the database
+        # and publish again for the other consumers
+        definition = await asyncio.to_thread(self.get, content_hash)
+        if definition is not None and self.connection_manager is not None:
+            try:
+                await self.publish(definition, content_hash)
+            except RedisError as e:
+                logger.warning('Workflow definition redis tier unavailable: %s', e)
+        return definition
+
+    def stats(self) -> dict:
+        return self.local.stats()
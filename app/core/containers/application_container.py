@@ -13,6 +13,7 @@ class ApplicationContainer(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         modules=[
             'app.api.endpoints.auth',
+            'app.api.endpoints.health',
             'app.api.endpoints.user',
             'app.api.endpoints.workspace',
             'app.api.endpoints.system',
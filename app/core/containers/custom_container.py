@@ -1,12 +1,52 @@
 from dependency_injector import containers, providers
 
-from app.core.dependencies.redis import WorkflowClient
+from app.core.cache.ttl_cache import TTLCache
+from app.core.dependencies.execution_events import (
+    ExecutionEventHub,
+    ExecutionEventPublisher,
+)
+from app.core.dependencies.jwt_verifier import JwtVerifier
+from app.core.dependencies.redis import RedisConnectionManager, WorkflowClient
 
 
 class CustomContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
 
+    # One pool per process, started/stopped by `Application._lifespan`
+    redis_manager = providers.Singleton(
+        RedisConnectionManager,
+        config=config,
+    )
+
+    execution_event_publisher = providers.Singleton(
+        ExecutionEventPublisher,
+        connection_manager=redis_manager,
+        config=config,
+    )
+
+    # One pub/sub subscription per process, started by `Application._lifespan`
+    execution_event_hub = providers.Singleton(
+        ExecutionEventHub,
+        connection_manager=redis_manager,
+        config=config,
+    )
+
+    # Compiled workflow graphs keyed by (workflow id, content hash)
+    workflow_graph_cache = providers.Singleton(
+        TTLCache,
+        maxsize=config.WORKFLOW_GRAPH_CACHE_SIZE,
+        ttl=config.WORKFLOW_GRAPH_CACHE_TTL_SECONDS,
+    )
+
     workflow_client = providers.Factory(
         WorkflowClient,
         config=config,
+        connection_manager=redis_manager,
+        graph_cache=workflow_graph_cache,
+    )
+
+    # Singleton so the cached JWKS is shared by every request
+    jwt_verifier = providers.Singleton(
+        JwtVerifier,
+        config=config,
     )
@@ -22,4 +22,25 @@ class DatabaseContainer(containers.DeclarativeContainer):
         db_type='postgresql',
         configs=config,
         echo=False,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        statement_timeout_ms=config.DB_STATEMENT_TIMEOUT_MS,
+    )
+
+    # asyncpg-backed engine for `async def` endpoints and async repositories.
+    # The engine connects lazily, so building it is cheap until it is used.
+    async_postgres_db = providers.Singleton(
+        create_database,
+        db_type='postgresql+asyncpg',
+        configs=config,
+        echo=False,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        statement_timeout_ms=config.DB_STATEMENT_TIMEOUT_MS,
     )
@@ -1,11 +1,29 @@
 from dependency_injector import containers, providers
 
+from app.core.cache.user_profile_cache import UserProfileCache
 from app.repositories.auth_repository import AuthRepository
+from app.repositories.execution_log_repository import ExecutionLogRepository
+from app.repositories.execution_outbox_repository import (
+    ExecutionOutboxRepository,
+)
 from app.repositories.node_definition_repository import NodeDefinitionRepository
-from app.repositories.system_repository import SystemRepository
+from app.repositories.system_repository import (
+    AsyncSystemRepository,
+    SystemRepository,
+)
 from app.repositories.user_repository import UserRepository
-from app.repositories.workspace_repository import WorkspaceRepository
+from app.repositories.workspace_repository import (
+    AsyncWorkspaceRepository,
+    WorkspaceRepository,
+)
 from app.repositories.system_execution_repository import SystemExecutionRepository
+from app.repositories.workflow_definition_repository import (
+    WorkflowDefinitionRepository,
+)
+
+
+def _on_off(enabled) -> str:
+    return 'on' if enabled else 'off'
 
 
 class RepositoryContainer(containers.DeclarativeContainer):
@@ -18,6 +36,12 @@ class RepositoryContainer(containers.DeclarativeContainer):
         supabase=database.supabase_db,
     )
 
+    # Shared by every (per-request) UserRepository instance
+    user_profile_cache = providers.Singleton(
+        UserProfileCache,
+        config=config,
+    )
+
     # Repository expects a session_factory callable that yields SQLAlchemy Session.
     # When the configured database is PostgreSQL the factory returns a PostgresDatabase
     # which exposes `.session_factory`. We reference that attribute via `provided` so
@@ -25,6 +49,7 @@ class RepositoryContainer(containers.DeclarativeContainer):
     user_repository = providers.Factory(
         UserRepository,
         session_factory=database.postgres_db.provided.session_factory,
+        profile_cache=user_profile_cache,
     )
 
     workspace_repository = providers.Factory(
@@ -42,7 +67,43 @@ class RepositoryContainer(containers.DeclarativeContainer):
         session_factory=database.postgres_db.provided.session_factory,
     )
 
+    execution_log_repository = providers.Factory(
+        ExecutionLogRepository,
+        session_factory=database.postgres_db.provided.session_factory,
+    )
+
+    execution_outbox_repository = providers.Factory(
+        ExecutionOutboxRepository,
+        session_factory=database.postgres_db.provided.session_factory,
+    )
+
+    workflow_definition_repository = providers.Factory(
+        WorkflowDefinitionRepository,
+        session_factory=database.postgres_db.provided.session_factory,
+    )
+
     node_definition_repository = providers.Singleton(
         NodeDefinitionRepository,
         session_factory=database.postgres_db.provided.session_factory,
     )
+
+    # Async repositories share the AsyncPostgresDatabase session factory. They
+    # are None unless DB_ASYNC_ENABLED, so the asyncpg engine is only built
+    # (and its pool only opened) when the async read path is switched on.
+    async_workspace_repository = providers.Selector(
+        config.DB_ASYNC_ENABLED.as_(_on_off),
+        on=providers.Factory(
+            AsyncWorkspaceRepository,
+            session_factory=database.async_postgres_db.provided.session_factory,
+        ),
+        off=providers.Object(None),
+    )
+
+    async_system_repository = providers.Selector(
+        config.DB_ASYNC_ENABLED.as_(_on_off),
+        on=providers.Factory(
+            AsyncSystemRepository,
+            session_factory=database.async_postgres_db.provided.session_factory,
+        ),
+        off=providers.Object(None),
+    )
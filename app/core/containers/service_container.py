@@ -1,10 +1,15 @@
 from dependency_injector import containers, providers
 
+from app.core.cache.ttl_cache import TTLCache
+from app.core.cache.workflow_definition_store import WorkflowDefinitionStore
 from app.services.auth_service import AuthService
+from app.services.execution_log_writer import ExecutionLogWriter
 from app.services.node_definition_service import NodeDefinitionService
+from app.services.outbox_relay import OutboxRelay
 from app.services.system_service import SystemService
 from app.services.workspace_service import WorkspaceService
 from app.services.system_execution_service import SystemExecutionService
+from app.services.upload_trigger_service import UploadTriggerService
 
 
 class ServiceContainer(containers.DeclarativeContainer):
@@ -13,6 +18,45 @@ class ServiceContainer(containers.DeclarativeContainer):
     repositories = providers.DependenciesContainer()
     custom_containers = providers.DependenciesContainer()
 
+    # (user_id, workspace_id) -> bool, shared by the workspace and system services
+    workspace_ownership_cache = providers.Singleton(
+        TTLCache,
+        maxsize=config.WORKSPACE_OWNERSHIP_CACHE_MAXSIZE,
+        ttl=config.WORKSPACE_OWNERSHIP_CACHE_TTL_SECONDS,
+    )
+
+    # Definitions are immutable, so one process-wide cache is safe
+    workflow_definition_store = providers.Singleton(
+        WorkflowDefinitionStore,
+        repository=repositories.workflow_definition_repository,
+        connection_manager=custom_containers.redis_manager,
+        config=config,
+    )
+
+    # One buffer per process, started by its owner (e.g. the workflow worker)
+    execution_log_writer = providers.Singleton(
+        ExecutionLogWriter,
+        repository=repositories.execution_log_repository,
+        batch_size=config.EXECUTION_LOG_BATCH_SIZE,
+        flush_interval=config.EXECUTION_LOG_FLUSH_INTERVAL,
+    )
+
+    # One relay per process, started by `Application._lifespan`
+    outbox_relay = providers.Singleton(
+        OutboxRelay,
+        outbox_repo=repositories.execution_outbox_repository,
+        execution_repo=repositories.system_execution_repository,
+        workflow_client=custom_containers.workflow_client,
+        definition_store=workflow_definition_store,
+        event_publisher=custom_containers.execution_event_publisher,
+        batch_size=config.OUTBOX_BATCH_SIZE,
+        poll_interval=config.OUTBOX_POLL_INTERVAL,
+        lease_seconds=config.OUTBOX_LEASE_SECONDS,
+        max_attempts=config.OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds=config.OUTBOX_RETRY_BASE_SECONDS,
+        retry_max_seconds=config.OUTBOX_RETRY_MAX_SECONDS,
+    )
+
     auth_service = providers.Factory(
         AuthService,
         auth_repo=repositories.auth_repository,
@@ -22,22 +66,41 @@ class ServiceContainer(containers.DeclarativeContainer):
     workspace_service = providers.Factory(
         WorkspaceService,
         workspace_repo=repositories.workspace_repository,
+        ownership_cache=workspace_ownership_cache,
+        async_workspace_repo=repositories.async_workspace_repository,
     )
 
     system_service = providers.Factory(
         SystemService,
         system_repo=repositories.system_repository,
         workspace_repo=repositories.workspace_repository,
+        ownership_cache=workspace_ownership_cache,
+        async_system_repo=repositories.async_system_repository,
+        async_workspace_repo=repositories.async_workspace_repository,
     )
 
     system_execution_service = providers.Factory(
         SystemExecutionService,
         execution_repo=repositories.system_execution_repository,
         system_repo=repositories.system_repository,
-        workflow_client=custom_containers.workflow_client,
+        log_repo=repositories.execution_log_repository,
+        event_publisher=custom_containers.execution_event_publisher,
+        definition_store=workflow_definition_store,
+        outbox_relay=outbox_relay,
+    )
+
+    upload_trigger_service = providers.Factory(
+        UploadTriggerService,
+        execution_repo=repositories.system_execution_repository,
+        outbox_relay=outbox_relay,
+        upload_dir=config.UPLOAD_DIR,
+        chunk_size=config.UPLOAD_CHUNK_SIZE,
     )
 
+    # Process-wide catalog cache, preloaded by `Application._lifespan`
     node_definition_service = providers.Singleton(
         NodeDefinitionService,
         node_definition_repo=repositories.node_definition_repository,
+        cache_size=config.NODE_DEFINITION_CACHE_SIZE,
+        cache_ttl=config.NODE_DEFINITION_CACHE_TTL_SECONDS,
     )
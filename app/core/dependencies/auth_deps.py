@@ -1,5 +1,7 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+
+import jwt
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import (
     HTTPBearer,
     HTTPAuthorizationCredentials,
@@ -7,6 +9,7 @@ from fastapi.security import (
 from dependency_injector.wiring import inject, Provide
 
 from app.core.containers.application_container import ApplicationContainer
+from app.core.dependencies.jwt_verifier import JwtVerifier
 from app.db.databases.supabase import SupabaseDatabase
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserResponse
@@ -15,40 +18,57 @@ from app.schemas.user_schema import UserResponse
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-@inject
-def get_current_user(
-    # token: str = Depends(oauth2_scheme),
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    supabase_db: SupabaseDatabase = Depends(
-        Provide[ApplicationContainer.database.supabase_db]
-    ),
-    user_repo: UserRepository = Depends(
-        Provide[ApplicationContainer.repositories.user_repository]
-    ),
-) -> Optional[UserResponse]:
-    '''Dependency returns authenticated user from Supabase token.'''
-    try:
-        sb = supabase_db.get_client()
-        token = credentials.credentials if credentials else None
-        if not token:
+def _authenticate_token(
+    token: str, supabase_db: SupabaseDatabase, jwt_verifier: JwtVerifier
+) -> tuple[str, str]:
+    '''Return (subject, email) of a valid access token.
+
+    Local mode verifies the signature in-process and only asks Supabase Auth
+    when the signing key is unknown. Remote mode always asks Supabase Auth.
+    '''
+
+    if jwt_verifier.enabled:
+        try:
+            claims = jwt_verifier.verify(token)
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Not authenticated',
+                detail='Invalid authentication credentials',
             )
 
-        # 1. Authenticate token with Supabase Auth
-        auth_res = sb.auth.get_user(token)
-        if not auth_res or not auth_res.user:
+        if claims:
+            return claims['sub'], claims.get('email')
+
+    auth_res = supabase_db.get_client().auth.get_user(token)
+    if not auth_res or not auth_res.user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Invalid authentication credentials',
+        )
+
+    return auth_res.user.id, auth_res.user.email
+
+
+def authenticate_user(
+    token: Optional[str],
+    supabase_db: SupabaseDatabase,
+    user_repo: UserRepository,
+    jwt_verifier: JwtVerifier,
+) -> Optional[UserResponse]:
+    '''Return the profile of the user owning `token` (raises HTTPException 401).'''
+    try:
+        if not token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Invalid authentication credentials',
+                detail='Not authenticated',
             )
 
-        auth_user = auth_res.user
+        # 1. Authenticate token (locally or with Supabase Auth)
+        subject, email = _authenticate_token(token, supabase_db, jwt_verifier)
 
-        # 2. (Optional) Get additional profile from 'users' table
+        # 2. (Optional) Get additional profile from 'users' table (cached)
         try:
-            profile = user_repo.find_by_email(auth_user.email)
+            profile = user_repo.find_by_subject(subject, email)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,3 +84,44 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f'Could not validate credentials: {e}',
         )
+
+
+@inject
+def get_current_user(
+    # token: str = Depends(oauth2_scheme),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    supabase_db: SupabaseDatabase = Depends(
+        Provide[ApplicationContainer.database.supabase_db]
+    ),
+    user_repo: UserRepository = Depends(
+        Provide[ApplicationContainer.repositories.user_repository]
+    ),
+    jwt_verifier: JwtVerifier = Depends(
+        Provide[ApplicationContainer.custom_containers.jwt_verifier]
+    ),
+) -> Optional[UserResponse]:
+    '''Dependency returns authenticated user from Supabase token.'''
+    token = credentials.credentials if credentials else None
+    return authenticate_user(token, supabase_db, user_repo, jwt_verifier)
+
+
+@inject
+def get_stream_user(
+    access_token: Optional[str] = Query(None),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    supabase_db: SupabaseDatabase = Depends(
+        Provide[ApplicationContainer.database.supabase_db]
+    ),
+    user_repo: UserRepository = Depends(
+        Provide[ApplicationContainer.repositories.user_repository]
+    ),
+    jwt_verifier: JwtVerifier = Depends(
+        Provide[ApplicationContainer.custom_containers.jwt_verifier]
+    ),
+) -> Optional[UserResponse]:
+    '''Like `get_current_user`, also accepting an `access_token` query param.
+
+    Browser `EventSource` cannot set an Authorization header.
+    '''
+    token = credentials.credentials if credentials else access_token
+    return authenticate_user(token, supabase_db, user_repo, jwt_verifier)
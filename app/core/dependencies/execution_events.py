@@ -0,0 +1,240 @@
+"""
+Live execution events (status changes, log lines) over Redis.
+
+Every event is written once by `ExecutionEventPublisher`:
+- `XADD execution:events:<id>`: a short, capped history per execution, so a
+  client reconnecting with the last event id it saw only gets what it missed,
+- `PUBLISH execution:events:<id>`: the live fan-out.
+
+`ExecutionEventHub` holds one pattern subscription per process and hands
+each message to the local subscribers of that execution, so a thousand
+dashboards watching an execution cost one Redis subscription, not a
+thousand. It is started and stopped by `Application._lifespan`.
+
+Event shape: {"id": "<stream id>", "type": "status" | "log", "data": {...}}
+"""
+
+import asyncio
+import json
+import logging
+import re
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.core.dependencies.redis import RedisConnectionManager
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "execution:events:"
+
+# pushed to a subscriber queue that overflowed: replay from the stream
+_RESYNC = object()
+
+
+_EVENT_ID = re.compile(r"[0-9]+(-[0-9]+)?")
+_MAX_ID_PART = 2**64 - 1
+
+
+def _stream_id(event_id: str) -> Tuple[int, int]:
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def check_event_id(event_id: Optional[str]) -> None:
+    """Raise ValueError unless `event_id` is None or a Redis stream id.
+
+    Client-supplied resume ids (`Last-Event-ID`, `after`) must be checked
+    before subscribing: a bad one would otherwise fail mid-stream.
+    """
+    if event_id is None:
+        return
+    if not _EVENT_ID.fullmatch(event_id) or max(_stream_id(event_id)) > _MAX_ID_PART:
+        raise ValueError("Invalid event id.")
+
+
+class ExecutionEventPublisher:
+    def __init__(
+        self,
+        connection_manager: RedisConnectionManager,
+        config: Optional[Any] = None,
+    ):
+        config = config or {}
+        self.connection_manager = connection_manager
+        self.maxlen = int(config.get("EXECUTION_EVENTS_MAXLEN") or 1000)
+        self.ttl = int(config.get("EXECUTION_EVENTS_TTL_SECONDS") or 86400)
+
+    async def publish(self, execution_id: Any, event_type: str, data: Dict) -> str:
+        ids = await self.publish_many([(execution_id, event_type, data)])
+        return ids[0]
+
+    async def publish_many(self, events: List[Tuple[Any, str, Dict]]) -> List[str]:
+        """Record and broadcast many events in two pipelined round-trips."""
+        if not events:
+            return []
+        redis = await self.connection_manager.get_client()
+        encoded = [
+            (KEY_PREFIX + str(execution_id), event_type, json.dumps(data, default=str))
+            for execution_id, event_type, data in events
+        ]
+
+        # the stream assigns the ids clients resume from
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, event_type, data in encoded:
+                pipe.xadd(
+                    key,
+                    {"type": event_type, "data": data},
+                    maxlen=self.maxlen,
+                    approximate=True,
+                )
+            ids = await pipe.execute()
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for event_id, (key, event_type, data) in zip(ids, encoded):
+                pipe.expire(key, self.ttl)
+                pipe.publish(
+                    key,
+                    f'{{"id":"{event_id}","type":"{event_type}","data":{data}}}',
+                )
+            await pipe.execute()
+        return ids
+
+
+class ExecutionEventHub:
+    def __init__(
+        self,
+        connection_manager: RedisConnectionManager,
+        config: Optional[Any] = None,
+    ):
+        config = config or {}
+        self.connection_manager = connection_manager
+        self.queue_size = int(config.get("EXECUTION_EVENTS_QUEUE_SIZE") or 1000)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        # the listener polls with a timeout and exits on its own; cancelling
+        # a pub/sub read can leave redis-py waiting on the socket
+        self._stopping.set()
+        _, pending = await asyncio.wait([self._task], timeout=5)
+        for task in pending:
+            task.cancel()
+        self._task = None
+
+    async def _listen(self) -> None:
+        delay = 0.5
+        while not self._stopping.is_set():
+            pubsub = None
+            try:
+                redis = await self.connection_manager.get_client()
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(KEY_PREFIX + "*")
+                delay = 0.5
+                while not self._stopping.is_set():
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Execution event subscription lost: %s", e)
+                # subscribers missed events meanwhile: make them replay
+                for queues in self._subscribers.values():
+                    for queue in queues:
+                        self._offer(queue, _RESYNC)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    delay = min(delay * 2, 10)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        queues = self._subscribers.get(channel[len(KEY_PREFIX) :])
+        if not queues:
+            return
+        event = json.loads(data)
+        for queue in queues:
+            self._offer(queue, event)
+
+    def _offer(self, queue: asyncio.Queue, item: Any) -> None:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # slow consumer: drop what it has queued, it replays from the stream
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_RESYNC)
+
+    async def _replay(
+        self, execution_id: str, after: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        redis = await self.connection_manager.get_client()
+        entries = await redis.xrange(
+            KEY_PREFIX + execution_id, min=f"({after}" if after else "-"
+        )
+        return [
+            {"id": event_id, "type": fields["type"], "data": json.loads(fields["data"])}
+            for event_id, fields in entries
+        ]
+
+    async def subscribe(
+        self,
+        execution_id: Any,
+        last_event_id: Optional[str] = None,
+        heartbeat: Optional[float] = None,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield the events of an execution: the stored ones after
+        `last_event_id` (all stored ones when None), then live ones.
+
+        Yields None every `heartbeat` seconds without events, so callers can
+        keep the connection alive and notice disconnected clients.
+        """
+        execution_id = str(execution_id)
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        # register before replaying: nothing published in between is lost,
+        # duplicates are filtered by id below
+        self._subscribers[execution_id].add(queue)
+        try:
+            cursor = last_event_id
+            for event in await self._replay(execution_id, cursor):
+                cursor = event["id"]
+                yield event
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                events = (
+                    await self._replay(execution_id, cursor)
+                    if item is _RESYNC
+                    else [item]
+                )
+                for event in events:
+                    if cursor and _stream_id(event["id"]) <= _stream_id(cursor):
+                        continue
+                    cursor = event["id"]
+                    yield event
+        finally:
+            queues = self._subscribers.get(execution_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[execution_id]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "executions": len(self._subscribers),
+            "subscribers": sum(len(q) for q in self._subscribers.values()),
+        }
@@ -0,0 +1,61 @@
+"""
+Conditional GET helpers: ETags, If-None-Match and Cache-Control.
+
+ETags are derived from a row's version (id + `updated_at`, or the columns
+that change for rows without one), never from the serialized body, so an
+endpoint can answer `If-None-Match` from a version-only query:
+
+    if if_none_match:
+        etag = service.get_workspace_etag(workspace_id, user_id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, cache_control)
+    workspace = service.get_workspace(workspace_id, user_id)
+    set_cache_headers(response, version_etag(...), cache_control)
+
+ETags are weak (`W/"..."`): they identify the version of the resource, not
+the exact bytes of one serialization of it.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        "|".join("" if p is None else str(p) for p in parts).encode("utf-8"),
+        digest_size=12,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def version_etag(id: Any, updated_at: Any, created_at: Any = None) -> str:
+    """ETag of a row with `updated_at` (None until its first update)."""
+    return make_etag(id, updated_at or created_at)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    # the body depends on who asks: shared caches must not mix users
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
@@ -0,0 +1,188 @@
+"""
+Wire encoding of queue jobs.
+
+Every encoded message (except with the `legacy` codec) starts with a
+4 byte header so producers and consumers running different settings can
+share a queue:
+
+    b"WJ" | version (1 byte) | codec (high nibble) + compression (low nibble)
+
+- codec: 1 = JSON (orjson when installed, stdlib otherwise), 2 = msgpack
+- compression: 0 = none, 1 = zlib, 2 = zstd; only applied when the
+  serialized job is at least `JOB_COMPRESSION_THRESHOLD` bytes
+
+Messages without the header are plain JSON text, i.e. what the `legacy`
+codec (the default, understood by existing consumers) produces.
+
+orjson, msgpack and zstandard are optional: they are imported on first use
+and only required when selected.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Optional, Union
+
+MAGIC = b"WJ"
+VERSION = 1
+HEADER_SIZE = 4
+
+CODEC_JSON = 1
+CODEC_MSGPACK = 2
+CODECS = {"json": CODEC_JSON, "msgpack": CODEC_MSGPACK}
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSIONS = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+}
+
+
+class JobCodecError(ValueError):
+    pass
+
+
+def _import(module: str):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise JobCodecError(
+            f'"{module}" is required by the configured job codec: pip install {module}'
+        )
+
+
+def _json_dumps(job: Dict[str, Any]) -> bytes:
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(job, separators=(",", ":"), default=str).encode("utf-8")
+    return orjson.dumps(job, default=str)
+
+
+def _json_loads(data: bytes) -> Dict[str, Any]:
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+class JobCodec:
+    """Encode jobs for the queue and decode any supported message.
+
+    Usage:
+        codec = JobCodec.from_config(config)
+        message = codec.encode(job)  # str for legacy, bytes otherwise
+        job = codec.decode(message)  # accepts every codec/compression
+    """
+
+    def __init__(
+        self,
+        codec: str = "legacy",
+        compression: str = "none",
+        compression_threshold: int = 1024,
+        compression_level: Optional[int] = None,
+    ):
+        codec = (codec or "legacy").lower()
+        compression = (compression or "none").lower()
+        if codec != "legacy" and codec not in CODECS:
+            raise JobCodecError(
+                f'Unknown JOB_CODEC "{codec}". Supported: "legacy", "json", "msgpack"'
+            )
+        if compression not in COMPRESSIONS:
+            raise JobCodecError(
+                f'Unknown JOB_COMPRESSION "{compression}". '
+                'Supported: "none", "zlib", "zstd"'
+            )
+
+        self.codec = codec
+        self.compression = compression
+        self.compression_threshold = int(compression_threshold)
+        self.compression_level = compression_level
+        if codec == "msgpack":
+            _import("msgpack")
+        if compression == "zstd":
+            _import("zstandard")
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Any] = None) -> "JobCodec":
+        config = config or {}
+        level = config.get("JOB_COMPRESSION_LEVEL")
+        return cls(
+            codec=config.get("JOB_CODEC") or "legacy",
+            compression=config.get("JOB_COMPRESSION") or "none",
+            compression_threshold=int(config.get("JOB_COMPRESSION_THRESHOLD") or 1024),
+            compression_level=int(level) if level not in (None, "") else None,
+        )
+
+    @property
+    def binary(self) -> bool:
+        """True when messages are bytes that must not go through UTF-8 decoding."""
+        return self.codec != "legacy"
+
+    # ---------------- encode ----------------
+    def encode(self, job: Dict[str, Any]) -> Union[str, bytes]:
+        if self.codec == "legacy":
+            return json.dumps(job)
+
+        if self.codec == "msgpack":
+            body = _import("msgpack").packb(job, default=str, use_bin_type=True)
+        else:
+            body = _json_dumps(job)
+
+        compression = COMPRESSION_NONE
+        if self.compression != "none" and len(body) >= self.compression_threshold:
+            compression = COMPRESSIONS[self.compression]
+            body = self._compress(compression, body)
+
+        flags = (CODECS[self.codec] << 4) | compression
+        return MAGIC + bytes((VERSION, flags)) + body
+
+    def _compress(self, compression: int, body: bytes) -> bytes:
+        if compression == COMPRESSION_ZLIB:
+            level = -1 if self.compression_level is None else self.compression_level
+            return zlib.compress(body, level)
+
+        if self._zstd_compressor is None:
+            zstd = _import("zstandard")
+            self._zstd_compressor = zstd.ZstdCompressor(
+                level=3 if self.compression_level is None else self.compression_level
+            )
+        return self._zstd_compressor.compress(body)
+
+    # ---------------- decode ----------------
+    def decode(self, message: Union[str, bytes]) -> Dict[str, Any]:
+        if isinstance(message, str):
+            return json.loads(message)
+        if not message.startswith(MAGIC):
+            # plain JSON from a legacy producer read through a bytes client
+            return _json_loads(message)
+        if len(message) < HEADER_SIZE:
+            raise JobCodecError("Truncated job message")
+
+        version, flags = message[2], message[3]
+        if version != VERSION:
+            raise JobCodecError(f"Unsupported job message version {version}")
+
+        codec, compression = flags >> 4, flags & 0x0F
+        body = memoryview(message)[HEADER_SIZE:]
+
+        if compression == COMPRESSION_ZLIB:
+            body = zlib.decompress(body)
+        elif compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = _import("zstandard").ZstdDecompressor()
+            # frames written by ZstdCompressor.compress() carry their size
+            body = self._zstd_decompressor.decompress(body)
+        elif compression != COMPRESSION_NONE:
+            raise JobCodecError(f"Unknown job compression {compression}")
+
+        if codec == CODEC_JSON:
+            return _json_loads(bytes(body))
+        if codec == CODEC_MSGPACK:
+            return _import("msgpack").unpackb(bytes(body), raw=False)
+        raise JobCodecError(f"Unknown job codec {codec}")
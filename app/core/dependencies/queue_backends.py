@@ -0,0 +1,200 @@
+"""
+Job queue transports used by `WorkflowClient` and the workflow worker.
+
+- `ListQueueBackend`: the original `LPUSH`/`BRPOP` list (`MAIN_QUEUE`).
+  Fast and simple, but a job popped by a consumer that then crashes is lost.
+- `StreamQueueBackend`: Redis Streams with a consumer group. Entries stay
+  pending until acknowledged, idle pending entries are reclaimed by other
+  consumers (`XAUTOCLAIM`), and the stream is trimmed with `MAXLEN ~`.
+"""
+
+import logging
+import socket
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Union
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+Message = Union[str, bytes]
+
+# max values per LPUSH command / XADD pipeline chunk in bulk pushes
+PUSH_CHUNK_SIZE = 1000
+
+
+@dataclass
+class QueueMessage:
+    data: Message
+    # stream entry id, None for the list backend
+    message_id: Optional[Message] = None
+
+
+class ListQueueBackend:
+    name = "list"
+
+    def __init__(self, redis: aioredis.Redis, queue: str):
+        self.redis = redis
+        self.queue = queue
+
+    async def push(self, messages: List[Message]) -> int:
+        if not messages:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for start in range(0, len(messages), PUSH_CHUNK_SIZE):
+                pipe.lpush(self.queue, *messages[start : start + PUSH_CHUNK_SIZE])
+            await pipe.execute()
+        return len(messages)
+
+    async def pop(self, timeout: float = 1.0) -> Optional[QueueMessage]:
+        item = await self.redis.brpop([self.queue], timeout=timeout)
+        return QueueMessage(data=item[1]) if item else None
+
+    async def ack(self, message: QueueMessage) -> None:
+        # popping a list entry removes it, there is nothing to acknowledge
+        return None
+
+    async def pending(self) -> Dict[str, Any]:
+        return {"backend": self.name, "queued": await self.redis.llen(self.queue)}
+
+
+class StreamQueueBackend:
+    name = "stream"
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        stream: str,
+        group: str = "workers",
+        consumer: Optional[str] = None,
+        maxlen: int = 100000,
+        claim_idle_ms: int = 60000,
+        batch_size: int = 16,
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.maxlen = maxlen
+        self.claim_idle_ms = claim_idle_ms
+        self.batch_size = batch_size
+        self._group_ready = False
+        self._next_claim_at = 0.0
+        # XAUTOCLAIM cursor: each sweep continues where the last one stopped
+        self._claim_cursor = "0-0"
+        self._buffer: Deque[QueueMessage] = deque()
+
+    async def push(self, messages: List[Message]) -> int:
+        if not messages:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.xadd(
+                    self.stream,
+                    {"job": message},
+                    maxlen=self.maxlen,
+                    approximate=True,
+                )
+            await pipe.execute()
+        return len(messages)
+
+    async def ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.redis.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def pop(self, timeout: float = 1.0) -> Optional[QueueMessage]:
+        if self._buffer:
+            return self._buffer.popleft()
+
+        await self.ensure_group()
+
+        # Periodically take over entries another consumer read but never acked
+        now = time.monotonic()
+        if self.claim_idle_ms and now >= self._next_claim_at:
+            claimed = await self.redis.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                min_idle_time=self.claim_idle_ms,
+                start_id=self._claim_cursor,
+                count=self.batch_size,
+            )
+            cursor = claimed[0]
+            self._claim_cursor = (
+                cursor.decode() if isinstance(cursor, bytes) else cursor
+            )
+            # mid-PEL: keep sweeping on the next pops; wrapped: wait again
+            if self._claim_cursor == "0-0":
+                self._next_claim_at = now + self.claim_idle_ms / 1000
+            self._extend(claimed[1])
+            if self._buffer:
+                logger.info("Reclaimed %d pending stream entries", len(self._buffer))
+                return self._buffer.popleft()
+
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=int(timeout * 1000),
+        )
+        for _, entries in response or []:
+            self._extend(entries)
+        return self._buffer.popleft() if self._buffer else None
+
+    def _extend(self, entries: List[Any]) -> None:
+        for message_id, fields in entries:
+            if not fields:
+                continue
+            data = fields.get("job", fields.get(b"job"))
+            self._buffer.append(QueueMessage(data=data, message_id=message_id))
+
+    async def ack(self, message: QueueMessage) -> None:
+        if message.message_id is not None:
+            await self.redis.xack(self.stream, self.group, message.message_id)
+
+    async def pending(self) -> Dict[str, Any]:
+        await self.ensure_group()
+        summary = await self.redis.xpending(self.stream, self.group)
+        return {
+            "backend": self.name,
+            "length": await self.redis.xlen(self.stream),
+            "pending": summary.get("pending", 0),
+            "consumers": summary.get("consumers", []),
+        }
+
+
+def create_queue_backend(redis: aioredis.Redis, config: Optional[Any] = None):
+    """Return the backend selected by `QUEUE_BACKEND` ('list' or 'stream')."""
+    config = config or {}
+    backend = (config.get("QUEUE_BACKEND") or "list").lower()
+
+    if backend == "list":
+        return ListQueueBackend(redis, config.get("MAIN_QUEUE") or "queue:main")
+
+    if backend == "stream":
+        # 0 disables reclaiming: not a missing value
+        claim_idle_ms = config.get("QUEUE_CLAIM_IDLE_MS")
+        return StreamQueueBackend(
+            redis,
+            config.get("QUEUE_STREAM") or "stream:main",
+            group=config.get("QUEUE_CONSUMER_GROUP") or "workers",
+            maxlen=int(config.get("QUEUE_STREAM_MAXLEN") or 100000),
+            claim_idle_ms=(
+                60000 if claim_idle_ms in (None, "") else int(claim_idle_ms)
+            ),
+        )
+
+    raise ValueError(f'Unknown QUEUE_BACKEND "{backend}". Supported: "list", "stream"')
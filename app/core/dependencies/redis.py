@@ -19,6 +19,19 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.dependencies.job_codec import JobCodec
+from app.core.dependencies.queue_backends import create_queue_backend
+from app.core.dependencies.workflow_graph import (
+    CompiledWorkflow,
+    compile_workflow,
+    workflow_content_hash,
+)
 
 # ---------------- CONFIG ----------------
 # REDIS_DSN = os.getenv("REDIS_DSN", "redis://35.189.8.131:6379/1")
@@ -31,6 +44,107 @@ logging.basicConfig(
 )
 
 
+# ---------------- Connection pool ----------------
+class RedisConnectionManager:
+    """Application-lifetime Redis connection pool.
+
+    `Application._lifespan` calls `start()` on startup and `stop()` on
+    shutdown; every `WorkflowClient` borrows connections from the same pool
+    instead of opening (and PING-ing) a new client per trigger.
+
+    Connections are health-checked (`PING` before use when idle for more than
+    `REDIS_HEALTH_CHECK_INTERVAL` seconds) and commands failing with a
+    connection/timeout error are retried with exponential backoff.
+    """
+
+    def __init__(self, config: Optional[Any] = None):
+        config = config or {}
+        self.dsn = config.get("REDIS_URL")
+        self.max_connections = int(config.get("REDIS_MAX_CONNECTIONS") or 50)
+        self.health_check_interval = int(
+            config.get("REDIS_HEALTH_CHECK_INTERVAL") or 30
+        )
+        self.retry_attempts = int(config.get("REDIS_RETRY_ATTEMPTS") or 3)
+        self.pool: Optional[aioredis.ConnectionPool] = None
+        self.client: Optional[aioredis.Redis] = None
+        # bytes in/out, for binary job encodings (see job_codec); created lazily
+        self.raw_pool: Optional[aioredis.ConnectionPool] = None
+        self.raw_client: Optional[aioredis.Redis] = None
+
+    def _make_pool(self, decode_responses: bool) -> aioredis.ConnectionPool:
+        return aioredis.ConnectionPool.from_url(
+            self.dsn,
+            encoding="utf-8",
+            decode_responses=decode_responses,
+            max_connections=self.max_connections,
+            health_check_interval=self.health_check_interval,
+            socket_keepalive=True,
+            retry=Retry(
+                ExponentialBackoff(cap=2.0, base=0.05), self.retry_attempts
+            ),
+            retry_on_error=[RedisConnectionError, RedisTimeoutError],
+        )
+
+    async def start(self) -> None:
+        if self.client is not None:
+            return
+        if not self.dsn:
+            raise ValueError("Redis DSN not provided.")
+
+        self.pool = self._make_pool(decode_responses=True)
+        self.client = aioredis.Redis(connection_pool=self.pool)
+
+        # Don't fail application startup when Redis is down: the ping is
+        # already retried with backoff and the pool reconnects on first use
+        # once Redis is reachable again.
+        try:
+            await self.client.ping()
+            logger.info("Connected to Redis: %s", self.dsn)
+        except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+            logger.error("Redis not reachable at startup: %s", e)
+
+    async def stop(self) -> None:
+        for client, pool in (
+            (self.client, self.pool),
+            (self.raw_client, self.raw_pool),
+        ):
+            if client is not None:
+                await client.aclose()
+            if pool is not None:
+                await pool.disconnect()
+        self.client = None
+        self.pool = None
+        self.raw_client = None
+        self.raw_pool = None
+
+    async def get_client(self) -> aioredis.Redis:
+        if self.client is None:
+            await self.start()
+        return self.client
+
+    async def get_raw_client(self) -> aioredis.Redis:
+        """Client returning `bytes` replies (`decode_responses=False`)."""
+        if self.raw_client is None:
+            if not self.dsn:
+                raise ValueError("Redis DSN not provided.")
+            self.raw_pool = self._make_pool(decode_responses=False)
+            self.raw_client = aioredis.Redis(connection_pool=self.raw_pool)
+        return self.raw_client
+
+    async def health(self) -> Dict[str, Any]:
+        status: Dict[str, Any] = {"started": self.client is not None}
+        if self.client is None:
+            return status
+        try:
+            status["ping"] = bool(await self.client.ping())
+        except Exception as e:
+            status.update(ping=False, error=str(e))
+        status["max_connections"] = self.max_connections
+        status["in_use_connections"] = len(self.pool._in_use_connections)
+        status["available_connections"] = len(self.pool._available_connections)
+        return status
+
+
 # ---------------- Workflow Client (OOP) ----------------
 class WorkflowClient:
     """Object-oriented wrapper for Redis workflow trigger utilities.
@@ -43,20 +157,48 @@ class WorkflowClient:
                     await client.close()
     """
 
-    def __init__(self, config: Optional[Any] = None):
+    def __init__(
+        self,
+        config: Optional[Any] = None,
+        connection_manager: Optional[RedisConnectionManager] = None,
+        graph_cache: Optional[TTLCache] = None,
+    ):
+        self.config = config or {}
         self.dsn = config.get("REDIS_URL") if config else None
         self.main_queue = config.get("MAIN_QUEUE") if config else None
+        self.connection_manager = connection_manager
+        # list (LPUSH/BRPOP) or Redis Streams, chosen by QUEUE_BACKEND on connect
+        self.queue = None
+        self.graph_cache = graph_cache
+        # legacy JSON text by default; binary codecs need a bytes client
+        self.codec = JobCodec.from_config(self.config)
         self.redis: Optional[aioredis.Redis] = None
         self.workflow_def: Dict[str, Any] = {}
-        self.node_by_name: Dict[str, Dict[str, Any]] = {}
-        self.connections_map: Dict[str, List[str]] = {}
+        self.graph: Optional[CompiledWorkflow] = None
         self.shutdown = False
 
+    @property
+    def node_by_name(self) -> Dict[str, Dict[str, Any]]:
+        return self.graph.node_by_name if self.graph else {}
+
+    @property
+    def connections_map(self) -> Dict[str, List[str]]:
+        return self.graph.connections_map if self.graph else {}
+
     async def connect(self) -> None:
+        if self.connection_manager is not None:
+            # borrow the shared pool: no new client, no PING round-trip
+            if self.codec.binary:
+                self.redis = await self.connection_manager.get_raw_client()
+            else:
+                self.redis = await self.connection_manager.get_client()
+            self.queue = create_queue_backend(self.redis, self.config)
+            return
+
         if not self.dsn:
             raise ValueError("Redis DSN not provided.")
         self.redis = aioredis.from_url(
-            self.dsn, encoding="utf-8", decode_responses=True
+            self.dsn, encoding="utf-8", decode_responses=not self.codec.binary
         )
         try:
             await self.redis.ping()
@@ -64,33 +206,43 @@ class WorkflowClient:
         except Exception as e:
             logger.error("Failed connect to Redis: %s", e)
             raise
+        self.queue = create_queue_backend(self.redis, self.config)
 
     async def close(self) -> None:
+        if self.connection_manager is not None:
+            # the pool belongs to the application, it is closed on shutdown
+            self.redis = None
+            return
+
         if self.redis:
             await self.redis.aclose()
 
-    def load_workflow(self, wf: dict | None = None) -> None:
+    def load_workflow(
+        self, wf: dict | None = None, content_hash: Optional[str] = None
+    ) -> None:
+        """Load a workflow definition, reusing its compiled graph when cached.
+
+        The cache key is `(workflow id, content hash)`, so an edited workflow
+        with the same id is compiled again instead of served stale. Pass the
+        hash when it is known (`system_json_hash`): hashing serializes the
+        whole definition, on every trigger.
+        """
         self.workflow_def = wf
-        nodes = wf.get("nodes", [])
-        self.node_by_name = {n["name"]: n for n in nodes}
-        conn_map: Dict[str, List[str]] = {}
-        for c in wf.get("connections", []):
-            main = c.get("main", [])
-            for group in main:
-                for edge in group:
-                    src = edge.get("sourceNode")
-                    tgt = edge.get("targetNode")
-                    if src and tgt:
-                        conn_map.setdefault(src, []).append(tgt)
-        self.connections_map = conn_map
-        logger.info("Loaded workflow '%s' (%d nodes)", wf.get("name"), len(nodes))
+        content_hash = content_hash or workflow_content_hash(wf)
+        key = (wf.get("id"), content_hash)
+
+        graph = self.graph_cache.get(key) if self.graph_cache is not None else None
+        if graph is None:
+            graph = compile_workflow(wf, content_hash)
+            if self.graph_cache is not None:
+                self.graph_cache.set(key, graph)
+            logger.info(
+                "Compiled workflow '%s' (%d nodes)", wf.get("name"), len(graph.nodes)
+            )
+        self.graph = graph
 
     def find_trigger_node(self) -> Optional[Dict[str, Any]]:
-        for _, node in self.node_by_name.items():
-            ntype = (node.get("type") or "").lower()
-            if ntype == "trigger":
-                return node
-        return None
+        return self.graph.first_of_type("trigger") if self.graph else None
 
     def make_job(
         self,
@@ -109,6 +261,8 @@ class WorkflowClient:
             "exec_id": exec_id,
             "created_at": int(time.time()),
             "workflow_id": self.workflow_def.get("id"),
+            # content hash, resolvable through WorkflowDefinitionStore
+            "workflow_hash": self.graph.content_hash if self.graph else None,
             "is_trigger_job": True,
         }
         return job
@@ -121,7 +275,7 @@ class WorkflowClient:
                 "Redis connection not established. Call connect() first."
             )
         job = self.make_job(instance_id, node_name, payload)
-        await self.redis.lpush(self.main_queue, json.dumps(job))
+        await self.queue.push([self.codec.encode(job)])
         logger.info(
             "Enqueued job: instance=%s node=%s job_id=%s",
             instance_id,
@@ -129,21 +283,54 @@ class WorkflowClient:
             job["job_id"],
         )
 
-    async def trigger_node_manual(self) -> None:
-        """Trigger the first node with type 'trigger' in the loaded workflow."""
+    async def enqueue_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """Push many prepared jobs (see `make_trigger_job`) in one round-trip.
+
+        Jobs are encoded up front with the configured `JobCodec` and sent in
+        a single non-transactional pipeline: multi-value `LPUSH` chunks for
+        the list backend, `XADD`s for the stream backend. Returns the number
+        of jobs pushed.
+        """
+        if not self.redis:
+            raise RuntimeError(
+                "Redis connection not established. Call connect() first."
+            )
+        if not jobs:
+            return 0
+
+        pushed = await self.queue.push([self.codec.encode(job) for job in jobs])
+        logger.info("Enqueued %d jobs (%s)", pushed, self.queue.name)
+        return pushed
+
+    def make_trigger_job(
+        self, execution_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Build the manual trigger job of the loaded workflow (None if no trigger).
+
+        `execution_id` (a `system_execution` row) lets consumers attach logs
+        and status changes to the execution.
+        """
         node = self.find_trigger_node()
         if not node:
-            logger.error("No trigger node found in workflow")
-            return
-        node_name = node["name"]
-        instance_id = str(uuid.uuid4())
+            return None
         payload = {
             "trigger": "manual",
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
         if node.get("parameters"):
             payload.update(node["parameters"])
-        await self.enqueue_job(instance_id, node_name, payload)
+        job = self.make_job(str(uuid.uuid4()), node["name"], payload)
+        if execution_id is not None:
+            job["execution_id"] = execution_id
+        return job
+
+    async def trigger_node_manual(self, execution_id: Optional[str] = None) -> None:
+        """Trigger the first node with type 'trigger' in the loaded workflow."""
+        job = self.make_trigger_job(execution_id)
+        if not job:
+            logger.error("No trigger node found in workflow")
+            return
+        await self.enqueue_jobs([job])
 
 
 # ---------------- Main ----------------
@@ -4,10 +4,7 @@ from fastapi import Depends, HTTPException, status
 from dependency_injector.wiring import inject, Provide
 
 from app.core.containers.application_container import ApplicationContainer
-from app.schemas.node_definition_schema import (
-    FileUploadTriggerNode,
-    NodeDefinitionResponse,
-)
+from app.schemas.node_definition_schema import FileUploadTriggerNode
 from app.services.node_definition_service import NodeDefinitionService
 
 
@@ -16,12 +13,15 @@ def get_trigger_config(
     node_def_svc: NodeDefinitionService = Depends(
         Provide[ApplicationContainer.services.node_definition_service]
     ),
+    node_definition_id: str = Depends(
+        Provide[ApplicationContainer.config.UPLOAD_TRIGGER_NODE_DEFINITION_ID]
+    ),
 ) -> Optional[FileUploadTriggerNode]:
     try:
-        upload_trigger_def = node_def_svc.get_node_definition(
-            "40000000-0000-0000-0000-000000000002"
-        )
-        return upload_trigger_def
+        # served from the node definition cache, no query per upload
+        return node_def_svc.get_upload_trigger(node_definition_id)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,138 @@
+"""
+Compiled representation of a workflow JSON graph.
+
+`compile_workflow` turns the raw `{"nodes": [...], "connections": [...]}`
+definition into integer-indexed adjacency lists with a precomputed
+topological order and a node-type index, so triggering a workflow doesn't
+rebuild dicts and scan every node each time. Compiled graphs are immutable
+and cached by `(workflow id, content hash)` in `WorkflowClient`.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def workflow_content_hash(wf: Dict[str, Any]) -> str:
+    """sha256 of the canonical JSON form of a workflow definition."""
+    canonical = json.dumps(wf, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompiledWorkflow:
+    """Read-only, index-based view of a workflow graph.
+
+    Nodes are addressed by their position in `nodes`; `successors[i]` and
+    `predecessors[i]` hold the indices of the nodes connected to node `i`.
+    """
+
+    __slots__ = (
+        "workflow_id",
+        "name",
+        "content_hash",
+        "nodes",
+        "node_names",
+        "node_index",
+        "node_by_name",
+        "successors",
+        "predecessors",
+        "topological_order",
+        "has_cycle",
+        "type_index",
+        "_connections_map",
+    )
+
+    def __init__(
+        self,
+        workflow_id: Optional[str],
+        name: Optional[str],
+        content_hash: str,
+        nodes: Tuple[Dict[str, Any], ...],
+        successors: Tuple[Tuple[int, ...], ...],
+    ):
+        self.workflow_id = workflow_id
+        self.name = name
+        self.content_hash = content_hash
+        self.nodes = nodes
+        self.node_names = tuple(n["name"] for n in nodes)
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+        self.node_by_name = {name: nodes[i] for name, i in self.node_index.items()}
+        self.successors = successors
+
+        predecessors: List[List[int]] = [[] for _ in nodes]
+        for src, targets in enumerate(successors):
+            for tgt in targets:
+                predecessors[tgt].append(src)
+        self.predecessors = tuple(tuple(p) for p in predecessors)
+
+        self.topological_order, self.has_cycle = self._toposort()
+
+        type_index: Dict[str, List[int]] = {}
+        for i, node in enumerate(nodes):
+            type_index.setdefault((node.get("type") or "").lower(), []).append(i)
+        self.type_index = {t: tuple(ix) for t, ix in type_index.items()}
+        self._connections_map: Optional[Dict[str, List[str]]] = None
+
+    def _toposort(self) -> Tuple[Tuple[int, ...], bool]:
+        """Kahn's algorithm; nodes on a cycle are left out of the order."""
+        indegree = [len(p) for p in self.predecessors]
+        ready = [i for i, d in enumerate(indegree) if d == 0]
+        order: List[int] = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for tgt in self.successors[i]:
+                indegree[tgt] -= 1
+                if indegree[tgt] == 0:
+                    ready.append(tgt)
+        return tuple(order), len(order) < len(self.nodes)
+
+    def node(self, name: str) -> Optional[Dict[str, Any]]:
+        i = self.node_index.get(name)
+        return self.nodes[i] if i is not None else None
+
+    def first_of_type(self, node_type: str) -> Optional[Dict[str, Any]]:
+        indices = self.type_index.get(node_type.lower())
+        return self.nodes[indices[0]] if indices else None
+
+    @property
+    def connections_map(self) -> Dict[str, List[str]]:
+        """`{source name: [target names]}`, the shape used before compilation."""
+        if self._connections_map is None:
+            self._connections_map = {
+                self.node_names[src]: [self.node_names[t] for t in targets]
+                for src, targets in enumerate(self.successors)
+                if targets
+            }
+        return self._connections_map
+
+
+def compile_workflow(
+    wf: Dict[str, Any], content_hash: Optional[str] = None
+) -> CompiledWorkflow:
+    nodes = tuple(wf.get("nodes", []))
+    # duplicate names resolve to the last node, as the name lookup always did
+    index = {n["name"]: i for i, n in enumerate(nodes)}
+
+    successors: List[List[int]] = [[] for _ in nodes]
+    for c in wf.get("connections", []):
+        for group in c.get("main", []):
+            for edge in group:
+                src = index.get(edge.get("sourceNode"))
+                tgt = index.get(edge.get("targetNode"))
+                if src is not None and tgt is not None:
+                    successors[src].append(tgt)
+
+    compiled = CompiledWorkflow(
+        workflow_id=wf.get("id"),
+        name=wf.get("name"),
+        content_hash=content_hash or workflow_content_hash(wf),
+        nodes=nodes,
+        successors=tuple(tuple(s) for s in successors),
+    )
+    if compiled.has_cycle:
+        logger.warning("Workflow '%s' contains a cycle", compiled.name)
+    return compiled
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db.pool_metrics import InstrumentedAsyncAdaptedQueuePool, PoolMetrics
+
+
+class AsyncPostgresDatabase:
+    '''asyncio counterpart of `PostgresDatabase` backed by asyncpg.
+
+    Usage:
+      pg = AsyncPostgresDatabase('postgresql+asyncpg://...')
+      async with pg.session_factory() as session:
+          await session.execute(...)
+
+    Endpoints using it can be `async def` end-to-end instead of occupying one
+    of the threads of FastAPI's threadpool for the duration of each query.
+    '''
+
+    def __init__(
+        self, database_uri: str, statement_timeout_ms: int = 0, **engine_kwargs: Any
+    ) -> None:
+        self.database_uri = database_uri
+        self.pool_metrics = PoolMetrics()
+
+        engine_kwargs.setdefault('poolclass', InstrumentedAsyncAdaptedQueuePool)
+        if statement_timeout_ms:
+            connect_args = engine_kwargs.setdefault('connect_args', {})
+            connect_args['server_settings'] = {
+                'statement_timeout': str(int(statement_timeout_ms))
+            }
+
+        self.engine: AsyncEngine = create_async_engine(
+            self.database_uri, **engine_kwargs
+        )
+        self.engine.sync_engine.pool.metrics = self.pool_metrics
+        # expire_on_commit=False: objects are read after the session closes and
+        # lazy refreshes are not possible outside of an awaitable context
+        self._session_local = async_sessionmaker(
+            bind=self.engine, autoflush=False, expire_on_commit=False
+        )
+
+    @asynccontextmanager
+    async def session_factory(self) -> AsyncGenerator[AsyncSession, None]:
+        '''Async context manager yielding an AsyncSession, committing on success.'''
+
+        session: AsyncSession = self._session_local()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    def pool_status(self) -> dict:
+        return self.pool_metrics.snapshot(self.engine.sync_engine.pool)
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
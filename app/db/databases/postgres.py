@@ -7,19 +7,38 @@ from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics
+from app.db.unit_of_work import UnitOfWork, current_unit_of_work
+
 
 class PostgresDatabase:
     '''Lightweight PostgreSQL wrapper exposing engine and session factory.
 
     Usage:
-      pg = PostgresDatabase(dsn)
+      pg = PostgresDatabase(dsn, pool_size=10, statement_timeout_ms=5000)
       with pg.session_factory() as session:
           session.query(...)
+      pg.pool_status()  # checked out / overflow / checkout wait histogram
+
+    Within a request unit of work (`app.db.unit_of_work`) `session_factory`
+    yields the request's shared session and leaves the commit to the unit.
     '''
 
-    def __init__(self, database_uri: str, **engine_kwargs: Any) -> None:
+    def __init__(
+        self, database_uri: str, statement_timeout_ms: int = 0, **engine_kwargs: Any
+    ) -> None:
         self.database_uri = database_uri
+        self.pool_metrics = PoolMetrics()
+
+        engine_kwargs.setdefault('poolclass', InstrumentedQueuePool)
+        if statement_timeout_ms:
+            connect_args = engine_kwargs.setdefault('connect_args', {})
+            connect_args['options'] = (
+                f'-c statement_timeout={int(statement_timeout_ms)}'
+            )
+
         self.engine: Engine = create_engine(self.database_uri, **engine_kwargs)
+        self.engine.pool.metrics = self.pool_metrics
         # default sessionmaker configuration - can be adjusted when needed
         self._session_local = sessionmaker(
             bind=self.engine, autocommit=False, autoflush=False
@@ -31,8 +50,16 @@ class PostgresDatabase:
 
         Repositories in this project expect a callable returning a context manager
         producing a Session (see `app.repositories.base_repository.BaseRepository`).
+        Repositories flush, never commit: the commit is done here, or once per
+        request by the unit of work.
         '''
 
+        unit = current_unit_of_work(self)
+        if unit is not None:
+            with unit.scope() as session:
+                yield session
+            return
+
         session: Session = self._session_local()
         try:
             yield session
@@ -42,3 +69,9 @@ class PostgresDatabase:
             raise
         finally:
             session.close()
+
+    def unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(self, self._session_local)
+
+    def pool_status(self) -> dict:
+        return self.pool_metrics.snapshot(self.engine.pool)
@@ -1,7 +1,7 @@
 '''Database factory producing Supabase or PostgreSQL database helpers.
 
-This module exposes `create_database()` which returns either an instance of
-the `SupabaseDatabase` or a `PostgresDatabase`
+This module exposes `create_database()` which returns an instance of
+the `SupabaseDatabase`, a `PostgresDatabase` or an `AsyncPostgresDatabase`
 
 Selection order:
  - explicit `db_type` argument
@@ -14,6 +14,7 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
+from app.db.databases.async_postgres import AsyncPostgresDatabase
 from app.db.databases.postgres import PostgresDatabase
 from app.db.databases.supabase import SupabaseDatabase
 
@@ -25,6 +26,8 @@ def create_database(
 
     - For `supabase`: returns an instance of `app.db.databases.supabase.SupabaseDatabase`.
     - For `postgresql`: returns an instance of `app.db.databases.postgres.PostgresDatabase`.
+    - For `postgresql+asyncpg`: returns an instance of
+      `app.db.databases.async_postgres.AsyncPostgresDatabase`.
 
     Additional keyword arguments are passed to the underlying constructors
     (e.g. SQLAlchemy engine kwargs).
@@ -54,6 +57,17 @@ def create_database(
 
         return PostgresDatabase(database_uri, **kwargs)
 
+    if db_type in ('postgresql+asyncpg', 'async_postgres', 'asyncpg'):
+        database_uri = configs['ASYNC_DATABASE_URI'] if configs else None
+
+        if not database_uri:
+            raise RuntimeError(
+                'ASYNC_DATABASE_URI not found for async PostgreSQL. Provide configs.ASYNC_DATABASE_URI'
+            )
+
+        return AsyncPostgresDatabase(database_uri, **kwargs)
+
     raise ValueError(
-        f'Unknown db_type "{db_type}". Supported: "supabase", "postgresql"'
+        f'Unknown db_type "{db_type}". '
+        'Supported: "supabase", "postgresql", "postgresql+asyncpg"'
     )
@@ -0,0 +1,107 @@
+'''Connection pool telemetry.
+
+`InstrumentedQueuePool` / `InstrumentedAsyncAdaptedQueuePool` time every
+connection checkout and count checkout timeouts into a `PoolMetrics`
+instance. `PoolMetrics.snapshot()` combines those counters with the live
+pool state (size, checked out, overflow) for the health endpoint.
+'''
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# upper bounds (ms) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def observe_wait(self, wait_ms: float) -> None:
+        index = bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def snapshot(self, pool: Optional[Pool] = None) -> dict:
+        with self._lock:
+            labels = [f'le_{b}ms' for b in WAIT_BUCKETS_MS] + ['le_inf']
+            data = {
+                'checkouts': self.checkouts,
+                'checkout_timeouts': self.checkout_timeouts,
+                'wait_ms_avg': (
+                    self.wait_ms_total / self.checkouts if self.checkouts else 0.0
+                ),
+                'wait_ms_max': self.wait_ms_max,
+                # cumulative, Prometheus style
+                'wait_ms_histogram': dict(
+                    zip(
+                        labels,
+                        [
+                            sum(self._bucket_counts[: i + 1])
+                            for i in range(len(self._bucket_counts))
+                        ],
+                    )
+                ),
+            }
+
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    'pool_size': pool.size(),
+                    'checked_out': pool.checkedout(),
+                    'checked_in': pool.checkedin(),
+                    'overflow': pool.overflow(),
+                    'max_overflow': pool._max_overflow,
+                }
+            )
+        return data
+
+
+class _InstrumentedPoolMixin:
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+
+        if self.metrics is not None:
+            self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,254 @@
+'''Request-scoped unit of work: one session and one transaction per request.
+
+Without it every repository call opens its own session, checks a connection
+out of the pool and commits. With `UnitOfWorkMiddleware` installed, the
+`PostgresDatabase.session_factory` blocks of one request share a session:
+
+  request -> repo A (flush) -> repo B (flush) -> ... -> response starts
+          -> one COMMIT (2xx/3xx) or ROLLBACK (4xx/5xx) -> connection back
+
+Each `session_factory` block still behaves like a short-lived session for
+the repository: pending changes are flushed when it exits and the identity
+map is cleared, so a repository never sees rows another one left behind.
+An exception inside a block rolls the whole request back; if the response
+would still have been successful it is replaced by a 500, so a client is
+never told that discarded writes succeeded.
+
+Routes that hold a request open for long before answering (large uploads)
+opt out with `dependencies=[Depends(without_unit_of_work)]`; their
+repository calls then use their own sessions again.
+'''
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Generator, Optional
+
+import anyio
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional['UnitOfWork']] = ContextVar(
+    'unit_of_work', default=None
+)
+
+
+class UnitOfWork:
+    def __init__(self, database: Any, session_maker: Callable[[], Session]) -> None:
+        self.database = database
+        self._session_maker = session_maker
+        self._session: Optional[Session] = None
+        self._depth = 0
+        self._after_commit: list[Callable[[], None]] = []
+        self._after_commit_async: list[Callable[[], Awaitable[None]]] = []
+        # False once finished (or opted out): blocks fall back to own sessions
+        self.active = True
+        self.rollback_only = False
+
+    @property
+    def used(self) -> bool:
+        return self._session is not None
+
+    @contextmanager
+    def scope(self) -> Generator[Session, None, None]:
+        '''One `session_factory` block inside the unit of work.'''
+
+        if self._session is None:
+            # created (and the connection checked out) on first use only
+            self._session = self._session_maker()
+        session = self._session
+        self._depth += 1
+        try:
+            yield session
+            if self._depth == 1:
+                session.flush()
+        except Exception:
+            self.rollback_only = True
+            session.rollback()
+            raise
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                session.expunge_all()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
+
+    def after_commit_async(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self._after_commit_async.append(callback)
+
+    def commit(self) -> None:
+        if self._session is not None:
+            self._session.commit()
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @property
+    def has_after_commit(self) -> bool:
+        return bool(self._after_commit)
+
+    def run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception('After-commit callback failed')
+
+    async def run_after_commit_async(self) -> None:
+        callbacks, self._after_commit_async = self._after_commit_async, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception('After-commit callback failed')
+
+
+def current_unit_of_work(database: Any = None) -> Optional[UnitOfWork]:
+    '''The active unit of work of this request (of `database`, if given).'''
+    unit = _current.get()
+    if unit is None or not unit.active:
+        return None
+    if database is not None and unit.database is not database:
+        return None
+    return unit
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    '''Run `callback` once the request's transaction is committed.
+
+    Outside a unit of work the caller's own session has already committed,
+    so the callback runs right away. Within one it runs in the worker thread
+    of the commit (it may block, but must be thread-safe). It is dropped if
+    the request rolls back.
+    '''
+    unit = current_unit_of_work()
+    if unit is None:
+        callback()
+    else:
+        unit.after_commit(callback)
+
+
+async def after_commit_async(callback: Callable[[], Awaitable[None]]) -> None:
+    '''`after_commit` for coroutines; within a unit of work they are awaited
+    on the event loop after the commit.
+    '''
+    unit = current_unit_of_work()
+    if unit is None:
+        await callback()
+    else:
+        unit.after_commit_async(callback)
+
+
+async def without_unit_of_work() -> None:
+    '''Route dependency: repository calls of this request use own sessions.'''
+    unit = _current.get()
+    if unit is not None and not unit.used:
+        unit.active = False
+
+
+class UnitOfWorkMiddleware:
+    '''ASGI middleware opening a unit of work for every HTTP request.
+
+    `database` is a callable returning the `PostgresDatabase` (the container
+    provider), resolved per request so provider overrides apply. The commit
+    happens before the response status is sent, in a worker thread.
+    '''
+
+    def __init__(self, app: Any, database: Callable[[], Any]) -> None:
+        self.app = app
+        self.database = database
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        unit = self.database().unit_of_work()
+        token = _current.set(unit)
+        finished = False
+        replaced = False
+
+        async def send_wrapper(message) -> None:
+            nonlocal finished, replaced
+            if message['type'] == 'http.response.start' and not finished:
+                finished = True
+                if not await self._finish(unit, message['status']):
+                    replaced = True
+                    await send(
+                        {
+                            'type': 'http.response.start',
+                            'status': 500,
+                            'headers': [(b'content-type', b'application/json')],
+                        }
+                    )
+                    await send(
+                        {
+                            'type': 'http.response.body',
+                            'body': b'{"detail":"Internal Server Error"}',
+                        }
+                    )
+                    return
+            if not replaced:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not finished:
+                # no response was started (unhandled exception): roll back
+                unit.active = False
+                if unit.used:
+                    await anyio.to_thread.run_sync(_rollback_and_close, unit)
+            _current.reset(token)
+
+    async def _finish(self, unit: UnitOfWork, status_code: int) -> bool:
+        '''Commit or roll back; False when a successful response must become 500.'''
+
+        unit.active = False
+        success = status_code < 400
+        if not unit.used:
+            if success:
+                if unit.has_after_commit:
+                    await anyio.to_thread.run_sync(unit.run_after_commit)
+                await unit.run_after_commit_async()
+            return True
+
+        if not success or unit.rollback_only:
+            await anyio.to_thread.run_sync(_rollback_and_close, unit)
+            if success:
+                logger.error('Request rolled back after a failed database call')
+            return not success
+
+        try:
+            await anyio.to_thread.run_sync(_commit_and_close, unit)
+        except Exception:
+            logger.exception('Request transaction failed to commit')
+            await anyio.to_thread.run_sync(_rollback_and_close, unit)
+            return False
+        await unit.run_after_commit_async()
+        return True
+
+
+def _commit_and_close(unit: UnitOfWork) -> None:
+    unit.commit()
+    unit.close()
+    # same thread hop as the commit: callbacks may block (cache, Redis)
+    unit.run_after_commit()
+
+
+def _rollback_and_close(unit: UnitOfWork) -> None:
+    try:
+        unit.rollback()
+    finally:
+        unit.close()
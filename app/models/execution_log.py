@@ -0,0 +1,35 @@
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import BigInteger, Column, DateTime, Field, func, Index, JSON, SQLModel
+
+
+class ExecutionLog(SQLModel, table=True):
+    '''One log line of a system execution, append-only.
+
+    `seq` numbers the lines of one execution 1, 2, 3, ... and is the position
+    clients resume from (`GET /executions/{id}/logs?after=<seq>`). It is
+    allocated by `ExecutionLogRepository.insert_many`, in commit order; the
+    global `id` is not: concurrent writers commit ids out of order.
+    '''
+
+    __tablename__ = 'execution_logs'
+    __table_args__ = (
+        Index('ix_execution_logs_execution_seq', 'execution_id', 'seq', unique=True),
+    )
+
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger, primary_key=True, autoincrement=True),
+    )
+    execution_id: UUID = Field(foreign_key='system_execution.id')
+    seq: int = Field(sa_column=Column(BigInteger, nullable=False))
+    node_name: Optional[str] = Field(default=None, nullable=True)
+    level: str = Field(default='info')
+    message: str = Field(default='')
+    data: Optional[dict] = Field(default=None, sa_column=Column(JSON, nullable=True))
+
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), default=func.now())
+    )
@@ -0,0 +1,37 @@
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import BigInteger, Column, DateTime, Field, func, Index, JSON, SQLModel
+
+
+class ExecutionOutbox(SQLModel, table=True):
+    '''Pending queue work for an execution (transactional outbox).
+
+    Rows are inserted in the same transaction as the status change that
+    requires them and deleted by `OutboxRelay` once the job is in Redis, so
+    a crash between the commit and the enqueue can't lose the job.
+    `available_at` is both the retry schedule and the relay's lease.
+    '''
+
+    __tablename__ = 'execution_outbox'
+    __table_args__ = (Index('ix_execution_outbox_available_at', 'available_at'),)
+
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger, primary_key=True, autoincrement=True),
+    )
+    execution_id: UUID = Field(foreign_key='system_execution.id')
+    kind: str = Field(default='trigger')
+    # merged into the payload of the trigger job (e.g. an uploaded file)
+    payload: Optional[dict] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None, nullable=True)
+
+    available_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), default=func.now(), nullable=False),
+    )
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), default=func.now())
+    )
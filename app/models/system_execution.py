@@ -2,11 +2,36 @@ from uuid import UUID
 from typing import Optional
 from datetime import datetime
 
-from sqlmodel import Field, SQLModel, Column, JSON, DateTime, func, Index
+from sqlmodel import BigInteger, Field, SQLModel, Column, JSON, DateTime, func, Index
 
 from app.models.base_model import BaseModel
 
 
+class StatusesExcept:
+    '''A status filter matching every status but `excluded`, NULL included.'''
+
+    __slots__ = ('excluded',)
+
+    def __init__(self, *excluded: str) -> None:
+        self.excluded = excluded
+
+    def __contains__(self, status: object) -> bool:
+        return status not in self.excluded
+
+
+class ExecutionStatus:
+    ACTIVE = 'active'
+    RUNNING = 'running'
+    STOPPED = 'stopped'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    # status is a free string: anything not running may be started
+    STARTABLE = StatusesExcept(RUNNING)
+    STOPPABLE = (RUNNING,)
+    FINISHED = (STOPPED, COMPLETED, FAILED)
+
+
 class SystemExecution(BaseModel, table=True):
     __tablename__ = 'system_execution'
     __table_args__ = (Index('ix_system_execution', 'id', unique=True),)
@@ -19,12 +44,22 @@ class SystemExecution(BaseModel, table=True):
         description='System configuration in JSON format',
     )
 
+    # workflow_definitions.hash; set instead of system_json for new executions
+    system_json_hash: Optional[str] = Field(
+        default=None, nullable=True, index=True, max_length=64
+    )
+
     logs: Optional[list[dict]] = Field(
         default_factory=list,
         sa_column=Column(JSON, nullable=True),
         description='Execution logs in JSON format',
     )
 
+    # last ExecutionLog.seq handed out for this execution
+    log_seq: int = Field(
+        default=0, sa_column=Column(BigInteger, nullable=False, server_default='0')
+    )
+
     status: Optional[str] = Field(
         default='', nullable=True, description='Current status of the execution'
     )
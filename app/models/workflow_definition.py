@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Column, DateTime, Field, func, JSON, SQLModel
+
+
+class WorkflowDefinition(SQLModel, table=True):
+    '''Content-addressed workflow JSON: one row per distinct definition.
+
+    The primary key is the sha256 of the canonical JSON (see
+    `workflow_content_hash`), so identical definitions are stored once and
+    rows are never updated.
+    '''
+
+    __tablename__ = 'workflow_definitions'
+
+    hash: str = Field(primary_key=True, max_length=64)
+    workflow_id: Optional[str] = Field(default=None, nullable=True, index=True)
+    definition: dict = Field(sa_column=Column(JSON, nullable=False))
+    size_bytes: Optional[int] = Field(default=None, nullable=True)
+
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), default=func.now())
+    )
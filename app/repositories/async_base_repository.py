@@ -0,0 +1,66 @@
+from contextlib import AbstractAsyncContextManager
+from typing import Callable, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.base_model import BaseModel
+
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class AsyncBaseRepository:
+    '''Async variant of `BaseRepository` for `AsyncPostgresDatabase` sessions.'''
+
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]],
+        model: Type[T],
+    ) -> None:
+        self.session_factory = session_factory
+        self.model = model
+
+    async def create(self, create_request: T):
+        async with self.session_factory() as session:
+            # exclude_none=True to avoid overwriting default values in the database
+            model_db = self.model(**create_request.model_dump(exclude_none=True))
+
+            session.add(model_db)
+            await session.flush()
+            await session.refresh(model_db)
+
+            return model_db
+
+    async def find_all(self):
+        async with self.session_factory() as session:
+            result = await session.scalars(select(self.model))
+            return list(result.all())
+
+    async def find_by_id(self, model_id: UUID):
+        async with self.session_factory() as session:
+            return await session.get(self.model, model_id)
+
+    async def update(self, model_id: UUID, update_request: T):
+        async with self.session_factory() as session:
+            model_db = await session.get(self.model, model_id)
+            if not model_db:
+                return None
+
+            model_data = update_request.model_dump(exclude_unset=True)
+            model_db.sqlmodel_update(model_data)
+            session.add(model_db)
+            await session.flush()
+            await session.refresh(model_db)
+
+            return model_db
+
+    async def delete(self, model_id: UUID):
+        async with self.session_factory() as session:
+            model_db = await session.get(self.model, model_id)
+            if not model_db:
+                return None
+
+            await session.delete(model_db)
+
+            return model_db
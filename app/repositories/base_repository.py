@@ -1,13 +1,23 @@
 from contextlib import AbstractContextManager
-from typing import Callable, Type, TypeVar
+from typing import Callable, Iterable, Optional, Type, TypeVar
 from uuid import UUID
 
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 from app.models.base_model import BaseModel
 
 
 T = TypeVar('T', bound=BaseModel)
 
+# ids per `IN (...)` of the bulk statements: keeps statements (and sqlite's
+# bound parameter count) bounded, all chunks share one transaction
+BULK_CHUNK_SIZE = 5000
+
+
+def _chunks(ids: list[UUID], size: int = BULK_CHUNK_SIZE) -> Iterable[list[UUID]]:
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
 
 class BaseRepository:
     def __init__(
@@ -20,29 +30,38 @@ class BaseRepository:
 
     def create(self, create_request: T):
         with self.session_factory() as session:
-            # exclude_none=True to avoid overwriting default values in the database
-            request = self.model(**create_request.model_dump(exclude_none=True))
-            model_db = self.model.model_validate(request)
+            # the one validation of the new row (table models don't validate
+            # on __init__); exclude_none=True to avoid overwriting default
+            # values in the database
+            model_db = self.model.model_validate(
+                create_request.model_dump(exclude_none=True)
+            )
 
             session.add(model_db)
-            session.commit()
+            # flush, not commit: `session_factory` (or the request's unit of
+            # work) commits once when the block ends
+            session.flush()
             session.refresh(model_db)
 
-            # Return a validated pydantic/sqlmodel model for consistency with
-            # `find_by_id` which returns a validated model. This ensures
-            # callers receive a serializable object (not a DB-managed instance
-            # that may be expired after the session closes).
-            return self.model.model_validate(model_db)
+            # Detach the refreshed instance rather than copying it: it keeps
+            # its loaded values and stays readable after the session closes,
+            # consistent with `find_by_id`.
+            session.expunge(model_db)
+            return model_db
 
     def find_all(self):
         with self.session_factory() as session:
             models = session.query(self.model).all()
-            return [self.model.model_validate(m) for m in models]
+            session.expunge_all()
+            return models
 
     def find_by_id(self, model_id: UUID):
         with self.session_factory() as session:
             model = session.get(self.model, model_id)
-            return self.model.model_validate(model) if model else None
+            if model is not None:
+                # detached before the commit expires it: no validated copy
+                session.expunge(model)
+            return model
 
     def update(self, model_id: UUID, update_request: T):
         with self.session_factory() as session:
@@ -53,9 +72,11 @@ class BaseRepository:
             model_data = update_request.model_dump(exclude_unset=True)
             model_db.sqlmodel_update(model_data)
             session.add(model_db)
-            session.commit()
+            session.flush()
             session.refresh(model_db)
 
+            # detached like `create`: not expired by the commit
+            session.expunge(model_db)
             return model_db
 
     def delete(self, model_id: UUID):
@@ -65,10 +86,127 @@ class BaseRepository:
                 return None
 
             session.delete(model_db)
-            session.commit()
+            session.flush()
+
+            return model_db
 
+    # Single-statement writes: `UPDATE/DELETE ... RETURNING` instead of
+    # get + mutate + commit + refresh. They run as SQL, without loading the
+    # rows into the session first; there are no ORM cascades on our models.
+
+    def update_returning(self, model_id: UUID, update_request: T) -> Optional[T]:
+        '''`update` in one round-trip; returns the updated row or None.'''
+
+        values = self._update_values(update_request)
+        if not values:
+            return self.find_by_id(model_id)
+
+        with self.session_factory() as session:
+            model_db = session.scalars(
+                update(self.model)
+                .where(self.model.id == model_id)
+                .values(**values)
+                .returning(self.model)
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+            session.expunge_all()
             return model_db
 
+    def delete_returning(self, model_id: UUID) -> Optional[T]:
+        '''`delete` in one round-trip; returns the deleted row or None.'''
+
+        with self.session_factory() as session:
+            model_db = session.scalars(
+                delete(self.model)
+                .where(self.model.id == model_id)
+                .returning(self.model)
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+            session.expunge_all()
+            return model_db
+
+    def bulk_create(self, create_requests: Iterable[T]) -> list[T]:
+        '''Insert many rows with multi-row `INSERT ... RETURNING` statements.
+
+        Rows are returned in the order of `create_requests`.
+        '''
+
+        rows = [
+            # validated like `create`; exclude_none=True keeps database defaults
+            self.model.model_validate(
+                create_request.model_dump(exclude_none=True)
+            ).model_dump(exclude_none=True)
+            for create_request in create_requests
+        ]
+        if not rows:
+            return []
+
+        with self.session_factory() as session:
+            # batched into multi-row VALUES by SQLAlchemy's insertmanyvalues
+            models = list(
+                session.scalars(
+                    insert(self.model).returning(
+                        self.model, sort_by_parameter_order=True
+                    ),
+                    rows,
+                )
+            )
+            session.expunge_all()
+            return models
+
+    def bulk_update(self, model_ids: Iterable[UUID], update_request: T) -> list[T]:
+        '''Apply the same update to every id; returns the updated rows.'''
+
+        model_ids = list(dict.fromkeys(model_ids))
+        values = self._update_values(update_request)
+        if not model_ids:
+            return []
+
+        with self.session_factory() as session:
+            models = []
+            for chunk in _chunks(model_ids):
+                if values:
+                    statement = (
+                        update(self.model)
+                        .where(self.model.id.in_(chunk))
+                        .values(**values)
+                        .returning(self.model)
+                        .execution_options(synchronize_session=False)
+                    )
+                else:
+                    statement = select(self.model).where(self.model.id.in_(chunk))
+                models.extend(session.scalars(statement))
+            session.expunge_all()
+            return models
+
+    def bulk_delete(self, model_ids: Iterable[UUID]) -> list[T]:
+        '''Delete every id; returns the deleted rows.'''
+
+        model_ids = list(dict.fromkeys(model_ids))
+        if not model_ids:
+            return []
+
+        with self.session_factory() as session:
+            models = []
+            for chunk in _chunks(model_ids):
+                models.extend(
+                    session.scalars(
+                        delete(self.model)
+                        .where(self.model.id.in_(chunk))
+                        .returning(self.model)
+                        .execution_options(synchronize_session=False)
+                    )
+                )
+            session.expunge_all()
+            return models
+
+    @staticmethod
+    def _update_values(update_request: T) -> dict:
+        # the primary key is never rewritten, whatever the request carries
+        values = update_request.model_dump(exclude_unset=True)
+        values.pop('id', None)
+        return values
+
     def close_scoped_session(self):
         with self.session_factory() as session:
             return session.close()
@@ -0,0 +1,105 @@
+import logging
+from collections import defaultdict
+from contextlib import AbstractContextManager
+from typing import Callable, Iterator
+from uuid import UUID
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+
+from app.models.execution_log import ExecutionLog
+from app.models.system_execution import SystemExecution
+from app.schemas.system_execution_schema import ExecutionLogResponse
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionLogRepository:
+    '''Append-only access to `execution_logs`.
+
+    Rows are never updated, and lines are addressed by `(execution_id, seq)`
+    rather than a UUID, so the generic `BaseRepository` doesn't apply.
+    '''
+
+    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
+        self.session_factory = session_factory
+
+    def insert_many(self, rows: list[dict]) -> int:
+        '''Insert log lines with batched multi-row INSERTs, in one transaction.
+
+        Each line gets the next `seq` of its execution from the counter on
+        the execution row (`UPDATE ... SET log_seq = log_seq + n RETURNING`).
+        The row lock that takes holds until commit, so writers of the same
+        execution commit their lines in seq order and a reader resuming from
+        `seq > after` never skips a line that commits later. Lines of
+        executions that no longer exist are dropped.
+        '''
+
+        if not rows:
+            return 0
+        by_execution: dict[UUID, list[dict]] = defaultdict(list)
+        for row in rows:
+            by_execution[row['execution_id']].append(row)
+
+        numbered = []
+        with self.session_factory() as session:
+            # one lock order for every writer: no deadlocks between batches
+            for execution_id in sorted(by_execution, key=str):
+                lines = by_execution[execution_id]
+                last = session.scalar(
+                    update(SystemExecution)
+                    .where(SystemExecution.id == execution_id)
+                    .values(log_seq=SystemExecution.log_seq + len(lines))
+                    .returning(SystemExecution.log_seq)
+                    .execution_options(synchronize_session=False)
+                )
+                if last is None:
+                    logger.warning(
+                        'Dropped %d log lines of unknown execution %s',
+                        len(lines),
+                        execution_id,
+                    )
+                    continue
+                first = last - len(lines) + 1
+                numbered.extend(
+                    {**line, 'seq': first + i} for i, line in enumerate(lines)
+                )
+
+            if numbered:
+                # a list of parameter sets runs as "insertmanyvalues" batches:
+                # INSERT ... VALUES (...), (...), ... instead of one row per
+                # statement
+                session.execute(insert(ExecutionLog), numbered)
+        return len(numbered)
+
+    def find_after(
+        self, execution_id: UUID, after: int = 0, limit: int = 500
+    ) -> tuple[list[ExecutionLogResponse], bool]:
+        '''Return up to `limit` lines with seq > `after`, and whether more exist.'''
+
+        with self.session_factory() as session:
+            rows = session.scalars(
+                select(ExecutionLog)
+                .where(ExecutionLog.execution_id == execution_id)
+                .where(ExecutionLog.seq > after)
+                .order_by(ExecutionLog.seq)
+                .limit(limit + 1)
+            ).all()
+            logs = [ExecutionLogResponse.model_validate(r) for r in rows[:limit]]
+            return logs, len(rows) > limit
+
+    def iter_after(
+        self, execution_id: UUID, after: int = 0, batch_size: int = 1000
+    ) -> Iterator[ExecutionLogResponse]:
+        '''Yield every line with seq > `after`, fetching `batch_size` rows at a time.'''
+
+        with self.session_factory() as session:
+            statement = (
+                select(ExecutionLog)
+                .where(ExecutionLog.execution_id == execution_id)
+                .where(ExecutionLog.seq > after)
+                .order_by(ExecutionLog.seq)
+                .execution_options(yield_per=batch_size)
+            )
+            for row in session.scalars(statement):
+                yield ExecutionLogResponse.model_validate(row)
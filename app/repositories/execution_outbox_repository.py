@@ -0,0 +1,85 @@
+from contextlib import AbstractContextManager
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+
+from app.models.execution_outbox import ExecutionOutbox
+
+
+class ExecutionOutboxRepository:
+    '''Claim / complete / retry access to `execution_outbox`.
+
+    Rows are inserted by `SystemExecutionRepository.transition_status_many`
+    inside the status change transaction, not here.
+    '''
+
+    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
+        self.session_factory = session_factory
+
+    def claim_batch(self, limit: int, lease_seconds: float) -> list[dict]:
+        '''Lease up to `limit` due rows and return them.
+
+        `FOR UPDATE SKIP LOCKED` lets several relays (one per API process)
+        claim disjoint batches; pushing `available_at` past the lease keeps
+        a claimed row from being sent twice while it is in flight, and makes
+        it due again if the relay dies before completing it.
+        '''
+
+        now = datetime.now(timezone.utc)
+        with self.session_factory() as session:
+            due = (
+                select(ExecutionOutbox.id)
+                .where(ExecutionOutbox.available_at <= now)
+                .order_by(ExecutionOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            rows = session.execute(
+                update(ExecutionOutbox)
+                .where(ExecutionOutbox.id.in_(due))
+                .values(
+                    available_at=now + timedelta(seconds=lease_seconds),
+                    attempts=ExecutionOutbox.attempts + 1,
+                )
+                .returning(
+                    ExecutionOutbox.id,
+                    ExecutionOutbox.execution_id,
+                    ExecutionOutbox.kind,
+                    ExecutionOutbox.payload,
+                    ExecutionOutbox.attempts,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return [row._asdict() for row in rows]
+
+    def complete(self, outbox_ids: list[int]) -> int:
+        if not outbox_ids:
+            return 0
+        with self.session_factory() as session:
+            result = session.execute(
+                delete(ExecutionOutbox)
+                .where(ExecutionOutbox.id.in_(outbox_ids))
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount
+
+    def retry_later(
+        self, outbox_ids: list[int], delay_seconds: float, error: str
+    ) -> int:
+        if not outbox_ids:
+            return 0
+        with self.session_factory() as session:
+            result = session.execute(
+                update(ExecutionOutbox)
+                .where(ExecutionOutbox.id.in_(outbox_ids))
+                .values(
+                    available_at=datetime.now(timezone.utc)
+                    + timedelta(seconds=delay_seconds),
+                    last_error=error[:1000],
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount
@@ -1,7 +1,8 @@
+from uuid import UUID
 from contextlib import AbstractContextManager
 from typing import Callable
 
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.models.node_definition import NodeDefinition
 from app.repositories.base_repository import BaseRepository
@@ -10,3 +11,25 @@ from app.repositories.base_repository import BaseRepository
 class NodeDefinitionRepository(BaseRepository):
     def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
         super().__init__(session_factory, NodeDefinition)
+
+    def find_public(self) -> list[NodeDefinition]:
+        '''Every public node definition (the shared catalog), in one query.'''
+        with self.session_factory() as session:
+            definitions = session.scalars(
+                select(NodeDefinition).where(NodeDefinition.is_public.is_(True))
+            )
+            definitions = list(definitions)
+            # detached rather than copied: cached by NodeDefinitionService
+            session.expunge_all()
+            return definitions
+
+    def find_by_ids(self, node_definition_ids: list[UUID]) -> list[NodeDefinition]:
+        with self.session_factory() as session:
+            definitions = session.scalars(
+                select(NodeDefinition).where(
+                    NodeDefinition.id.in_(node_definition_ids)
+                )
+            )
+            definitions = list(definitions)
+            session.expunge_all()
+            return definitions
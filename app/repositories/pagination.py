@@ -0,0 +1,189 @@
+'''Pagination helpers shared by the repositories.'''
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, and_, func, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+
+def fetch_page(
+    query: Query,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    with_total: bool = True,
+) -> tuple[list[Any], Optional[int], bool]:
+    '''Run `query` for one page and return (items, total, has_more).
+
+    with_total=True: the total comes from `COUNT(*) OVER ()` on the page query
+    itself, so the page and the total cost one statement instead of a
+    `SELECT count(*)` subquery plus the page query. A second statement is only
+    needed when the page is empty past the first page.
+
+    with_total=False: fast path for infinite scroll. No count at all; one
+    extra row is fetched to tell whether there is a next page. `total` is None.
+    '''
+
+    if not with_total:
+        page_query = query.offset(offset)
+        if limit is not None:
+            page_query = page_query.limit(limit + 1)
+
+        items = page_query.all()
+        has_more = limit is not None and len(items) > limit
+        return (items[:limit] if has_more else items), None, has_more
+
+    page_query = query.add_columns(func.count().over().label('total')).offset(offset)
+    if limit is not None:
+        page_query = page_query.limit(limit)
+
+    rows = page_query.all()
+    if rows:
+        total = rows[0].total
+        items = [row[0] for row in rows]
+    else:
+        # the window total travels with the rows; offset past the end -> count
+        total = query.order_by(None).count() if offset else 0
+        items = []
+
+    return items, total, offset + len(items) < total
+
+
+async def fetch_page_async(
+    session: AsyncSession,
+    statement: Select,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    with_total: bool = True,
+) -> tuple[list[Any], Optional[int], bool]:
+    '''`fetch_page` for an `AsyncSession` and a `select()` of one entity.'''
+
+    if not with_total:
+        page_statement = statement.offset(offset)
+        if limit is not None:
+            page_statement = page_statement.limit(limit + 1)
+
+        items = list(await session.scalars(page_statement))
+        has_more = limit is not None and len(items) > limit
+        return (items[:limit] if has_more else items), None, has_more
+
+    page_statement = statement.add_columns(
+        func.count().over().label('total')
+    ).offset(offset)
+    if limit is not None:
+        page_statement = page_statement.limit(limit)
+
+    rows = (await session.execute(page_statement)).all()
+    if rows:
+        total = rows[0].total
+        items = [row[0] for row in rows]
+    else:
+        total = (
+            await session.scalar(
+                select(func.count()).select_from(statement.order_by(None).subquery())
+            )
+            if offset
+            else 0
+        )
+        items = []
+
+    return items, total, offset + len(items) < total
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(data: dict) -> str:
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursorError('Malformed cursor.')
+
+    if not isinstance(data, dict) or not {'f', 'd', 'v', 'id'} <= data.keys():
+        raise InvalidCursorError('Malformed cursor.')
+    return data
+
+
+class KeysetOrder:
+    '''Deterministic `(sort column, id)` ordering usable for keyset pagination.
+
+    Usage:
+      keyset = KeysetOrder(Workspace, 'created_at', descending=True)
+      query = query.order_by(*keyset.order_by())
+      if cursor:
+          query = query.filter(keyset.after(cursor))
+      next_cursor = keyset.cursor_for(items[-1])
+
+    The cursor is an opaque token encoding the sort field, the direction and
+    the `(sort value, id)` of the last row returned, so the next page starts
+    with an index range scan instead of scanning and discarding OFFSET rows.
+
+    Nullable sort columns (`created_at`) sort NULLs last ascending and first
+    descending, PostgreSQL's own btree order, and the cursor condition
+    covers them: a `(col, id) > (...)` row comparison alone would drop them.
+    '''
+
+    def __init__(self, model: Any, sort_field: str, descending: bool = False):
+        self.sort_field = sort_field
+        self.descending = descending
+        self.sort_column = getattr(model, sort_field)
+        self.id_column = model.id
+        self.nullable = bool(model.__table__.c[sort_field].nullable)
+
+    def order_by(self) -> tuple:
+        if self.descending:
+            sort, by_id = self.sort_column.desc(), self.id_column.desc()
+            return (sort.nulls_first() if self.nullable else sort), by_id
+        sort, by_id = self.sort_column.asc(), self.id_column.asc()
+        return (sort.nulls_last() if self.nullable else sort), by_id
+
+    def after(self, cursor: str):
+        data = decode_cursor(cursor)
+        if data['f'] != self.sort_field or bool(data['d']) != self.descending:
+            raise InvalidCursorError('Cursor does not match the requested sorting.')
+
+        value = data['v']
+        if data.get('t') == 'dt':
+            value = datetime.fromisoformat(value)
+        last_id = literal(UUID(data['id']), self.id_column.type)
+
+        if value is None:
+            # inside the NULL block: the rest of it, then (descending) the
+            # non-NULL rows that follow it
+            if self.descending:
+                return or_(
+                    and_(self.sort_column.is_(None), self.id_column < last_id),
+                    self.sort_column.is_not(None),
+                )
+            return and_(self.sort_column.is_(None), self.id_column > last_id)
+
+        key = tuple_(self.sort_column, self.id_column)
+        bound = tuple_(literal(value, self.sort_column.type), last_id)
+        if self.descending:
+            return key < bound
+        if self.nullable:
+            # ascending, NULLs come last: still ahead of any non-NULL cursor
+            return or_(key > bound, self.sort_column.is_(None))
+        return key > bound
+
+    def cursor_for(self, item: Any) -> str:
+        value = getattr(item, self.sort_field)
+        data = {'f': self.sort_field, 'd': int(self.descending), 'id': str(item.id)}
+        if isinstance(value, datetime):
+            data.update(v=value.isoformat(), t='dt')
+        else:
+            data['v'] = value
+        return encode_cursor(data)
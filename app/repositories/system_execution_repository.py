@@ -1,11 +1,14 @@
 from uuid import UUID
 from contextlib import AbstractContextManager
-from typing import Callable
+from typing import Callable, Optional, Union
 
-from sqlmodel import Session
+from sqlalchemy import func, insert, or_, update
+from sqlmodel import Session, select
 
-from app.models.system_execution import SystemExecution
+from app.models.execution_outbox import ExecutionOutbox
+from app.models.system_execution import StatusesExcept, SystemExecution
 from app.repositories.base_repository import BaseRepository
+from app.schemas.base_schema import from_row
 from app.schemas.system_execution_schema import SystemExecutionResponse
 
 
@@ -24,5 +27,134 @@ class SystemExecutionRepository(BaseRepository):
                 return []
 
             return [
-                SystemExecutionResponse.model_validate(exec_) for exec_ in executions
+                from_row(SystemExecutionResponse, exec_) for exec_ in executions
             ]
+
+    def exists(self, execution_id: UUID) -> bool:
+        with self.session_factory() as session:
+            found = session.scalar(
+                select(SystemExecution.id).where(SystemExecution.id == execution_id)
+            )
+            return found is not None
+
+    def find_version(self, execution_id: UUID):
+        """The columns that change over an execution's life, or None.
+
+        `system_execution` has no `updated_at`: status changes (and the
+        timestamps set with them) are what a reader needs to revalidate.
+        """
+        with self.session_factory() as session:
+            return session.execute(
+                select(
+                    SystemExecution.status,
+                    SystemExecution.started_at,
+                    SystemExecution.stopped_at,
+                    SystemExecution.system_json_hash,
+                ).where(SystemExecution.id == execution_id)
+            ).first()
+
+    def find_by_ids(self, execution_ids: list[UUID]) -> list[SystemExecutionResponse]:
+        with self.session_factory() as session:
+            executions = session.scalars(
+                select(SystemExecution).where(SystemExecution.id.in_(execution_ids))
+            )
+            return [from_row(SystemExecutionResponse, e) for e in executions]
+
+    def find_existing_ids(self, execution_ids: list[UUID]) -> set[UUID]:
+        with self.session_factory() as session:
+            return set(
+                session.scalars(
+                    select(SystemExecution.id).where(
+                        SystemExecution.id.in_(execution_ids)
+                    )
+                )
+            )
+
+    def transition_status(
+        self,
+        execution_id: UUID,
+        from_statuses: Union[tuple[str, ...], StatusesExcept],
+        to_status: str,
+        set_started: bool = False,
+        set_stopped: bool = False,
+        outbox_kind: Optional[str] = None,
+        outbox_payload: Optional[dict] = None,
+    ) -> Optional[SystemExecutionResponse]:
+        """Compare-and-set the status of one execution in a single statement.
+
+        `UPDATE ... WHERE id = :id AND status IN (:from) RETURNING *`: returns
+        the updated execution, or None when it doesn't exist or its status
+        is not one of `from_statuses` (e.g. a concurrent duplicate start).
+        """
+        updated = self.transition_status_many(
+            [execution_id],
+            from_statuses,
+            to_status,
+            set_started,
+            set_stopped,
+            outbox_kind,
+            outbox_payload,
+        )
+        return updated[0] if updated else None
+
+    def transition_status_many(
+        self,
+        execution_ids: list[UUID],
+        from_statuses: Union[tuple[str, ...], StatusesExcept],
+        to_status: str,
+        set_started: bool = False,
+        set_stopped: bool = False,
+        outbox_kind: Optional[str] = None,
+        outbox_payload: Optional[dict] = None,
+    ) -> list[SystemExecutionResponse]:
+        """`transition_status` for many executions; returns the updated ones.
+
+        With `outbox_kind`, an `execution_outbox` row is written for every
+        updated execution in the same transaction: the status change and the
+        pending queue work commit (or roll back) together. `outbox_payload`
+        is added to the payload of the resulting jobs.
+        """
+        values = {'status': to_status}
+        if set_started:
+            values['started_at'] = func.now()
+            values['stopped_at'] = None
+        if set_stopped:
+            values['stopped_at'] = func.now()
+
+        with self.session_factory() as session:
+            executions = session.scalars(
+                update(SystemExecution)
+                .where(SystemExecution.id.in_(execution_ids))
+                .where(_status_in(from_statuses))
+                .values(**values)
+                .returning(SystemExecution)
+                .execution_options(synchronize_session=False)
+            )
+            updated = [from_row(SystemExecutionResponse, e) for e in executions]
+            if outbox_kind and updated:
+                session.execute(
+                    insert(ExecutionOutbox),
+                    [
+                        {
+                            'execution_id': e.id,
+                            'kind': outbox_kind,
+                            'payload': outbox_payload,
+                        }
+                        for e in updated
+                    ],
+                )
+            return updated
+
+
+def _status_in(statuses: Union[tuple[str, ...], StatusesExcept]):
+    if isinstance(statuses, StatusesExcept):
+        # NOT IN alone would skip NULL (never ran) statuses
+        return or_(
+            SystemExecution.status.is_(None),
+            SystemExecution.status.not_in(statuses.excluded),
+        )
+    condition = SystemExecution.status.in_(statuses)
+    if '' in statuses:
+        # the column is nullable: NULL counts as "never ran" too
+        condition = or_(condition, SystemExecution.status.is_(None))
+    return condition
@@ -1,24 +1,150 @@
 from uuid import UUID
-from contextlib import AbstractContextManager
-from typing import Callable
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import Callable, Iterator
 
-from sqlmodel import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import Session, select
 
 from app.models.system import System
+from app.models.workspace import Workspace
+from app.repositories.async_base_repository import AsyncBaseRepository
 from app.repositories.base_repository import BaseRepository
-from app.schemas.system_schema import SystemResponse
+from app.repositories.pagination import KeysetOrder, fetch_page, fetch_page_async
+from app.schemas.base_schema import from_row
+from app.schemas.system_schema import SystemListResponse, SystemResponse
 
 
 class SystemRepository(BaseRepository):
     def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
         super().__init__(session_factory, System)
 
-    def find_all_by_workspace_id(self, workspace_id: UUID) -> list[SystemResponse]:
+    def find_by_id_for_user(
+        self, workspace_id: UUID, system_id: UUID, user_id: UUID
+    ) -> SystemResponse | None:
+        """Return the system only if it belongs to a workspace owned by `user_id`.
+
+        Ownership is a predicate of the same statement (system joined to its
+        workspace), so the lookup and the authorization check cost one query.
+        """
+        with self.session_factory() as session:
+            system = session.scalars(
+                select(System)
+                .join(Workspace, Workspace.id == System.workspace_id)
+                .where(
+                    System.id == system_id,
+                    System.workspace_id == workspace_id,
+                    Workspace.user_id == user_id,
+                )
+            ).first()
+            return from_row(SystemResponse, system) if system else None
+
+    def find_version_for_user(self, workspace_id: UUID, system_id: UUID, user_id: UUID):
+        """`(updated_at, created_at)` of a system owned by `user_id`, or None."""
+        with self.session_factory() as session:
+            return session.execute(
+                select(System.updated_at, System.created_at)
+                .join(Workspace, Workspace.id == System.workspace_id)
+                .where(
+                    System.id == system_id,
+                    System.workspace_id == workspace_id,
+                    Workspace.user_id == user_id,
+                )
+            ).first()
+
+    def find_all_by_workspace_id(
+        self,
+        workspace_id: UUID,
+        offset: int = 0,
+        limit: int | None = None,
+        with_total: bool = True,
+        cursor: str | None = None,
+    ) -> SystemListResponse:
+        """Return one page of the systems of a workspace, oldest first.
+
+        Args:
+                        workspace_id: id of the workspace
+                        offset: number of items to skip (ignored with a cursor)
+                        limit: maximum number of items to return (None means no limit)
+                        with_total: count all matching rows in the page query
+                        cursor: `next_cursor` of the previous page
+        """
+        keyset = KeysetOrder(System, 'created_at')
+        if cursor:
+            offset, with_total = 0, False
+
+        with self.session_factory() as session:
+            query = _workspace_query(
+                session.query(System), keyset, workspace_id, cursor
+            )
+            systems, total, has_more = fetch_page(
+                query, offset=offset, limit=limit, with_total=with_total
+            )
+            return _list_response(keyset, systems, total, has_more)
+
+    def iter_by_workspace_id(
+        self, workspace_id: UUID, batch_size: int = 500
+    ) -> Iterator[SystemResponse]:
+        """Yield every system of a workspace through a server-side cursor.
+
+        `yield_per` streams rows from the database in batches of `batch_size`,
+        so memory stays flat however many systems the workspace has. The
+        session stays open until the iterator is exhausted or closed.
+        """
+        keyset = KeysetOrder(System, 'created_at')
+
         with self.session_factory() as session:
-            systems = (
-                session.query(System).filter(System.workspace_id == workspace_id).all()
+            statement = (
+                select(System)
+                .where(System.workspace_id == workspace_id)
+                .order_by(*keyset.order_by())
+                .execution_options(yield_per=batch_size)
             )
-            if not systems:
-                return []
+            for system in session.scalars(statement):
+                yield from_row(SystemResponse, system)
+
+
+class AsyncSystemRepository(AsyncBaseRepository):
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]],
+    ):
+        super().__init__(session_factory, System)
+
+    async def find_all_by_workspace_id(
+        self,
+        workspace_id: UUID,
+        offset: int = 0,
+        limit: int | None = None,
+        with_total: bool = True,
+        cursor: str | None = None,
+    ) -> SystemListResponse:
+        """Same query and page as `SystemRepository.find_all_by_workspace_id`."""
+        keyset = KeysetOrder(System, 'created_at')
+        if cursor:
+            offset, with_total = 0, False
+
+        async with self.session_factory() as session:
+            statement = _workspace_query(select(System), keyset, workspace_id, cursor)
+            systems, total, has_more = await fetch_page_async(
+                session, statement, offset=offset, limit=limit, with_total=with_total
+            )
+            return _list_response(keyset, systems, total, has_more)
+
+
+def _workspace_query(query, keyset, workspace_id, cursor):
+    # `query` is a sync Query or a select(): both support filter/order_by
+    query = query.filter(System.workspace_id == workspace_id).order_by(
+        *keyset.order_by()
+    )
+    if cursor:
+        query = query.filter(keyset.after(cursor))
+    return query
+
 
-            return [SystemResponse.model_validate(sys) for sys in systems]
+def _list_response(keyset, systems, total, has_more) -> SystemListResponse:
+    return SystemListResponse(
+        systems=[from_row(SystemResponse, sys) for sys in systems],
+        total=total,
+        has_more=has_more,
+        next_cursor=keyset.cursor_for(systems[-1]) if has_more and systems else None,
+    )
@@ -1,19 +1,105 @@
+import functools
 from contextlib import AbstractContextManager
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
+from uuid import UUID
 
 from sqlmodel import Session, select
 
+from app.core.cache.user_profile_cache import UserProfileCache
+from app.db.unit_of_work import after_commit
 from app.models.user import User
 from app.repositories.base_repository import BaseRepository
 from app.schemas.user_schema import UserResponse
 
 
 class UserRepository(BaseRepository):
-    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractContextManager[Session]],
+        profile_cache: Optional[UserProfileCache] = None,
+    ):
         super().__init__(session_factory, User)
+        self._profile_cache = profile_cache
 
     def find_by_email(self, email) -> Optional[UserResponse]:
         with self.session_factory() as session:
             statement = select(User).where(User.email == email)
             res = session.scalars(statement).first()
             return UserResponse.model_validate(res) if res else None
+
+    def find_by_subject(self, subject: str, email: str) -> Optional[UserResponse]:
+        '''Return the profile of an authenticated user, served from cache.
+
+        `users.id` is the Supabase auth user id (see `AuthService.sign_up`),
+        so the token subject is the cache key. Misses fall back to
+        `find_by_email` and only found profiles are cached.
+        '''
+
+        if self._profile_cache is None:
+            return self.find_by_email(email)
+
+        profile = self._profile_cache.get(subject)
+        if profile is not None:
+            return profile
+
+        profile = self.find_by_email(email)
+        if profile is not None:
+            self._profile_cache.set(subject, profile)
+        return profile
+
+    # Writes invalidate the cached profile of the affected user once they are
+    # committed: earlier, a concurrent read could cache the old row again.
+    def create(self, create_request: User):
+        created = super().create(create_request)
+        self._invalidate(created.id if created else create_request.id)
+        return created
+
+    def update(self, model_id: UUID, update_request: User):
+        updated = super().update(model_id, update_request)
+        self._invalidate(model_id)
+        return updated
+
+    def delete(self, model_id: UUID):
+        deleted = super().delete(model_id)
+        self._invalidate(model_id)
+        return deleted
+
+    def update_returning(self, model_id: UUID, update_request: User):
+        updated = super().update_returning(model_id, update_request)
+        self._invalidate(model_id)
+        return updated
+
+    def delete_returning(self, model_id: UUID):
+        deleted = super().delete_returning(model_id)
+        self._invalidate(model_id)
+        return deleted
+
+    def bulk_create(self, create_requests: Iterable[User]):
+        created = super().bulk_create(create_requests)
+        self._invalidate_many(user.id for user in created)
+        return created
+
+    def bulk_update(self, model_ids: Iterable[UUID], update_request: User):
+        model_ids = list(model_ids)
+        updated = super().bulk_update(model_ids, update_request)
+        self._invalidate_many(model_ids)
+        return updated
+
+    def bulk_delete(self, model_ids: Iterable[UUID]):
+        model_ids = list(model_ids)
+        deleted = super().bulk_delete(model_ids)
+        self._invalidate_many(model_ids)
+        return deleted
+
+    def _invalidate(self, user_id: Optional[UUID]) -> None:
+        if self._profile_cache is not None and user_id is not None:
+            after_commit(
+                functools.partial(self._profile_cache.invalidate, str(user_id))
+            )
+
+    def _invalidate_many(self, user_ids: Iterable[UUID]) -> None:
+        if self._profile_cache is not None:
+            subjects = [str(user_id) for user_id in user_ids]
+            after_commit(
+                functools.partial(self._profile_cache.invalidate_many, subjects)
+            )
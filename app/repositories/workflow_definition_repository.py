@@ -0,0 +1,47 @@
+from contextlib import AbstractContextManager
+from typing import Callable, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.models.workflow_definition import WorkflowDefinition
+
+
+class WorkflowDefinitionRepository:
+    '''Insert-once / read-many access to `workflow_definitions`.
+
+    Rows are immutable and keyed by content hash, so there is no update and
+    the generic `BaseRepository` (UUID primary keys) doesn't apply.
+    '''
+
+    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
+        self.session_factory = session_factory
+
+    def find_by_hash(self, content_hash: str) -> Optional[dict]:
+        with self.session_factory() as session:
+            row = session.get(WorkflowDefinition, content_hash)
+            return row.definition if row else None
+
+    def save(self, content_hash: str, definition: dict, size_bytes: int) -> bool:
+        '''Store a definition unless the hash exists. Returns True when inserted.'''
+
+        with self.session_factory() as session:
+            if session.get(WorkflowDefinition, content_hash) is not None:
+                return False
+
+            try:
+                # a savepoint: the conflict must not abort the caller's
+                # transaction (the request's unit of work)
+                with session.begin_nested():
+                    session.add(
+                        WorkflowDefinition(
+                            hash=content_hash,
+                            workflow_id=definition.get('id'),
+                            definition=definition,
+                            size_bytes=size_bytes,
+                        )
+                    )
+            except IntegrityError:
+                # stored concurrently by another request: same content, same row
+                return False
+            return True
@@ -1,46 +1,76 @@
 from uuid import UUID
-from contextlib import AbstractContextManager
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
 from typing import Callable
 
-from sqlmodel import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import Session, select
 
 from app.models.workspace import Workspace
+from app.repositories.async_base_repository import AsyncBaseRepository
 from app.repositories.base_repository import BaseRepository
+from app.repositories.pagination import KeysetOrder, fetch_page, fetch_page_async
+from app.schemas.base_schema import from_row
 from app.schemas.workspace_schema import WorkspaceListResponse, WorkspaceResponse
 
 
+# Columns a listing can be sorted by. `created_at` is nullable: KeysetOrder
+# places and pages over NULLs explicitly.
+SORTABLE_FIELDS = ('created_at', 'name', 'status', 'systems_count')
+DEFAULT_SORTING = 'created_at'
+
+
 class WorkspaceRepository(BaseRepository):
     def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
         super().__init__(session_factory, Workspace)
 
+    def find_owner_id(self, workspace_id: UUID) -> UUID | None:
+        """Return the `user_id` owning the workspace, None if it does not exist."""
+        with self.session_factory() as session:
+            return session.scalar(
+                select(Workspace.user_id).where(Workspace.id == workspace_id)
+            )
+
+    def find_version(self, workspace_id: UUID):
+        """Return `(user_id, updated_at, created_at)` of a workspace, or None.
+
+        Enough to authorize and answer a conditional GET without loading
+        and serializing the whole row.
+        """
+        with self.session_factory() as session:
+            return session.execute(
+                select(
+                    Workspace.user_id, Workspace.updated_at, Workspace.created_at
+                ).where(Workspace.id == workspace_id)
+            ).first()
+
     def find_all_by_user_id(
-        self, user_id: UUID, offset: int = 0, limit: int | None = None
-    ) -> tuple[list[WorkspaceResponse], int]:
-        """Return a tuple (workspaces, total) for the given user.
+        self,
+        user_id: UUID,
+        offset: int = 0,
+        limit: int | None = None,
+        with_total: bool = True,
+        cursor: str | None = None,
+    ) -> WorkspaceListResponse:
+        """Return the workspaces of the given user, newest first.
 
         Args:
                         user_id: id of the user who owns the workspaces
-                        offset: number of items to skip
+                        offset: number of items to skip (ignored with a cursor)
                         limit: maximum number of items to return (None means no limit)
+                        with_total: count all matching rows in the page query
+                                        (False skips the count, total is None)
+                        cursor: `next_cursor` of the previous page
 
         Returns:
-                        (list[WorkspaceResponse], total_count)
+                        WorkspaceListResponse
         """
-        with self.session_factory() as session:
-            base_query = session.query(Workspace).filter(Workspace.user_id == user_id)
-
-            total = base_query.count()
-
-            query = base_query.offset(offset)
-            if limit is not None:
-                query = query.limit(limit)
-
-            workspaces = query.all()
-
-            if not workspaces:
-                return [], total
-
-            return [WorkspaceResponse.model_validate(ws) for ws in workspaces], total
+        return self.search_by_criteria(
+            user_id,
+            offset=offset,
+            limit=limit,
+            with_total=with_total,
+            cursor=cursor,
+        )
 
     def search_by_criteria(
         self,
@@ -51,50 +81,127 @@ class WorkspaceRepository(BaseRepository):
         order: str | None = None,
         offset: int = 0,
         limit: int | None = None,
+        with_total: bool = True,
+        cursor: str | None = None,
     ) -> WorkspaceListResponse:
         """Search workspaces by criteria for the given user.
 
+        Results are ordered by `(sorting, id)`; unknown sort fields fall back
+        to `created_at`. With a cursor the page starts right after the row the
+        cursor points to and no total is computed.
+
         Args:
                         user_id: id of the user who owns the workspaces
                         name: name filter (partial match)
                         status: status filter (exact match)
                         sorting: field to sort by (e.g., 'name', 'created_at')
                         order: 'asc' or 'desc'
-                        offset: number of items to skip
+                        offset: number of items to skip (ignored with a cursor)
                         limit: maximum number of items to return (None means no limit)
+                        with_total: count all matching rows in the page query
+                                        (False skips the count, total is None)
+                        cursor: `next_cursor` of the previous page
 
         Returns:
-                        (list[WorkspaceResponse], total_count)
+                        WorkspaceListResponse
         """
-        with self.session_factory() as session:
-            base_query = session.query(Workspace).filter(Workspace.user_id == user_id)
-
-            if name:
-                base_query = base_query.filter(Workspace.name.ilike(f"%{name}%"))
-            if status:
-                base_query = base_query.filter(Workspace.status == status)
+        keyset = _keyset(sorting, order)
+        if cursor:
+            # the window total would only count the rows after the cursor
+            offset, with_total = 0, False
 
-            total = base_query.count()
-
-            if sorting:
-                sort_column = getattr(Workspace, sorting, None)
-                if sort_column is not None:
-                    if order == 'desc':
-                        sort_column = sort_column.desc()
-                    else:
-                        sort_column = sort_column.asc()
-                    base_query = base_query.order_by(sort_column)
+        with self.session_factory() as session:
+            query = _search_query(
+                session.query(Workspace), keyset, user_id, name, status, cursor
+            )
+            workspaces, total, has_more = fetch_page(
+                query, offset=offset, limit=limit, with_total=with_total
+            )
+            return _list_response(keyset, workspaces, total, has_more)
 
-            query = base_query.offset(offset)
-            if limit is not None:
-                query = query.limit(limit)
 
-            workspaces = query.all()
+class AsyncWorkspaceRepository(AsyncBaseRepository):
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]],
+    ):
+        super().__init__(session_factory, Workspace)
 
-            if not workspaces:
-                return WorkspaceListResponse(workspaces=[], total=total)
+    async def find_owner_id(self, workspace_id: UUID) -> UUID | None:
+        async with self.session_factory() as session:
+            return await session.scalar(
+                select(Workspace.user_id).where(Workspace.id == workspace_id)
+            )
 
-            return WorkspaceListResponse(
-                workspaces=[WorkspaceResponse.model_validate(ws) for ws in workspaces],
-                total=total,
+    async def find_all_by_user_id(
+        self,
+        user_id: UUID,
+        offset: int = 0,
+        limit: int | None = None,
+        with_total: bool = True,
+        cursor: str | None = None,
+    ) -> WorkspaceListResponse:
+        return await self.search_by_criteria(
+            user_id,
+            offset=offset,
+            limit=limit,
+            with_total=with_total,
+            cursor=cursor,
+        )
+
+    async def search_by_criteria(
+        self,
+        user_id: UUID,
+        name: str | None = None,
+        status: str | None = None,
+        sorting: str | None = None,
+        order: str | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+        with_total: bool = True,
+        cursor: str | None = None,
+    ) -> WorkspaceListResponse:
+        """Same query and page as `WorkspaceRepository.search_by_criteria`."""
+        keyset = _keyset(sorting, order)
+        if cursor:
+            offset, with_total = 0, False
+
+        async with self.session_factory() as session:
+            statement = _search_query(
+                select(Workspace), keyset, user_id, name, status, cursor
+            )
+            workspaces, total, has_more = await fetch_page_async(
+                session, statement, offset=offset, limit=limit, with_total=with_total
             )
+            return _list_response(keyset, workspaces, total, has_more)
+
+
+def _keyset(sorting: str | None, order: str | None) -> KeysetOrder:
+    if sorting not in SORTABLE_FIELDS:
+        sorting = DEFAULT_SORTING
+        order = order or 'desc'
+    return KeysetOrder(Workspace, sorting, descending=order == 'desc')
+
+
+def _search_query(query, keyset, user_id, name, status, cursor):
+    # `query` is a sync Query or a select(): both support filter/order_by
+    query = query.filter(Workspace.user_id == user_id)
+    if name:
+        query = query.filter(Workspace.name.ilike(f"%{name}%"))
+    if status:
+        query = query.filter(Workspace.status == status)
+    query = query.order_by(*keyset.order_by())
+    if cursor:
+        query = query.filter(keyset.after(cursor))
+    return query
+
+
+def _list_response(keyset, workspaces, total, has_more) -> WorkspaceListResponse:
+    return WorkspaceListResponse(
+        workspaces=[from_row(WorkspaceResponse, ws) for ws in workspaces],
+        total=total,
+        has_more=has_more,
+        next_cursor=(
+            keyset.cursor_for(workspaces[-1]) if has_more and workspaces else None
+        ),
+    )
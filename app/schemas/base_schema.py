@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
 
+S = TypeVar("S", bound=BaseModel)
+
 
 class ModelBaseInfo(BaseModel):
     """Common fields shared by response schemas.
@@ -21,3 +23,21 @@ class ModelBaseInfo(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+def from_row(schema: type[S], row: Any) -> S:
+    """Build `schema` from a trusted ORM row without validating it again.
+
+    Values read from our own typed columns are already the right Python
+    types; `model_validate(row)` re-checks every field, which costs more
+    than the query itself on list endpoints. Only for flat schemas whose
+    fields are attributes of the row (no aliases, no nested models);
+    missing attributes take the schema defaults.
+    """
+    return schema.model_construct(
+        **{
+            name: getattr(row, name)
+            for name in schema.model_fields
+            if hasattr(row, name)
+        }
+    )
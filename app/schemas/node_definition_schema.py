@@ -10,8 +10,9 @@ class BaseNodeDefinition(BaseModel):
     name: str
     description: str | None
     is_public: bool
-    input_type: str | None
-    output_type: str | None
+    # not columns of node_definitions: optional so rows validate
+    input_type: str | None = None
+    output_type: str | None = None
     created_by: UUID
 
     # Pydantic configuration to work with ORM models
@@ -21,8 +22,10 @@ class BaseNodeDefinition(BaseModel):
 
 
 class FileUploadTriggerParameters(BaseModel):
+    # MIME types ('image/png', 'image/*') or extensions ('.csv'); empty: any
     acceptedFileTypes: List[str]
     maxSizeMB: int
+    storageType: Literal["local", "cloud"] = "local"
 
 
 class FileUploadTriggeroOutputSchema(BaseModel):
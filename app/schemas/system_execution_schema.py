@@ -18,6 +18,7 @@ class CreateSystemExecutionRequest(BaseModel):
 class SystemExecutionResponse(ModelBaseInfo):
     system_id: UUID
     system_json: Optional[dict] = Field(default_factory=dict)
+    system_json_hash: Optional[str] = None
     logs: Optional[list[dict]] = Field(default_factory=list)
     status: Optional[str] = ''
     started_at: Optional[datetime] = None
@@ -30,3 +31,44 @@ class SystemExecutionResponse(ModelBaseInfo):
 class SystemExecutionListResponse(BaseModel):
     executions: list[SystemExecutionResponse]
     total: int
+
+
+class BatchStartExecutionRequest(BaseModel):
+    execution_ids: list[UUID] = Field(..., min_length=1, max_length=10000)
+
+
+class BatchStartExecutionResponse(BaseModel):
+    started: list[UUID]
+    not_found: list[UUID]
+    already_running: list[UUID] = Field(default_factory=list)
+
+
+class ExecutionLogResponse(BaseModel):
+    seq: int
+    execution_id: UUID
+    node_name: Optional[str] = None
+    level: str = 'info'
+    message: str = ''
+    data: Optional[dict] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ExecutionLogListResponse(BaseModel):
+    logs: list[ExecutionLogResponse]
+    # pass as `after` to fetch the lines written since this page
+    next_after: int
+    has_more: bool
+
+
+class UploadTriggerResponse(BaseModel):
+    execution_id: UUID
+    # FileUploadTriggeroOutputSchema fields, as passed to the trigger job
+    filePath: str
+    fileName: str
+    fileType: str
+    sizeBytes: int
+    sha256: str
+    storageType: str
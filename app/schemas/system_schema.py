@@ -28,4 +28,10 @@ class SystemResponse(ModelBaseInfo, BaseSystem): ...
 
 class SystemListResponse(BaseModel):
     systems: list[SystemResponse]
-    total: int
+    # None when the total is not computed (cursor pages)
+    total: int | None
+    has_more: bool | None = None
+    page: int | None = None
+    per_page: int | None = None
+    # Opaque token to pass as `cursor` to get the next page
+    next_cursor: str | None = None
@@ -28,6 +28,11 @@ class SearchWorkspaceRequest(BaseModel):
     status: str | None = Field(default=None)
     sorting: str | None = Field(default=None)  # e.g., 'name', 'created_at'
     order: str | None = Field(default=None)  # 'asc' or 'desc'
+    # False skips counting all matches (infinite scroll), `total` is then None
+    include_total: bool = Field(default=True)
+    per_page: int | None = Field(default=None, ge=1)
+    # `next_cursor` of the previous response
+    cursor: str | None = Field(default=None)
 
 
 class WorkspaceResponse(ModelBaseInfo, BaseWorkspace): ...
@@ -35,7 +40,11 @@ class WorkspaceResponse(ModelBaseInfo, BaseWorkspace): ...
 
 class WorkspaceListResponse(BaseModel):
     workspaces: list[WorkspaceResponse]
-    total: int
+    # None when the client asked to skip the count (include_total=False)
+    total: int | None
+    has_more: bool | None = None
     # Paging info (optional) - included when requests use paging
     page: int | None = None
     per_page: int | None = None
+    # Opaque token to pass as `cursor` to get the next page
+    next_cursor: str | None = None
@@ -0,0 +1,127 @@
+'''Buffered, batched writer of execution log lines.
+
+`append()` only adds a row to an in-memory buffer; a background task writes
+the buffer with one multi-row INSERT when it reaches `batch_size` rows or
+every `flush_interval` seconds, whichever comes first. Producers never wait
+on the database.
+
+Usage:
+  writer = ExecutionLogWriter(repository)
+  await writer.start()
+  writer.append(execution_id, 'Node finished', node_name='HTTP')
+  await writer.stop()  # flushes what is left
+'''
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+from app.repositories.execution_log_repository import ExecutionLogRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionLogWriter:
+    def __init__(
+        self,
+        repository: ExecutionLogRepository,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_buffer: int = 50000,
+    ) -> None:
+        self.repository = repository
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        self.max_buffer = int(max_buffer)
+        self._buffer: deque[dict] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    def append(
+        self,
+        execution_id: UUID,
+        message: str,
+        level: str = 'info',
+        node_name: Optional[str] = None,
+        data: Optional[dict[str, Any]] = None,
+    ) -> None:
+        if len(self._buffer) >= self.max_buffer:
+            # the database is not keeping up: shed the oldest lines rather
+            # than grow without bound
+            self._buffer.popleft()
+            self.dropped += 1
+
+        self._buffer.append(
+            {
+                'execution_id': execution_id,
+                'message': message,
+                'level': level,
+                'node_name': node_name,
+                'data': data,
+                'created_at': datetime.now(timezone.utc),
+            }
+        )
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._buffer:
+                if not await self.flush():
+                    break
+
+    async def flush(self) -> bool:
+        '''Write up to `batch_size` buffered lines. Returns False on failure.'''
+
+        async with self._flush_lock:
+            if not self._buffer:
+                return True
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(self.batch_size, len(self._buffer)))
+            ]
+            try:
+                # sync repository: keep the event loop free during the INSERT
+                written = await asyncio.to_thread(self.repository.insert_many, batch)
+            except Exception:
+                logger.exception('Failed to write %d execution log lines', len(batch))
+                # retried on the next flush, ahead of newer lines
+                self._buffer.extendleft(reversed(batch))
+                return False
+
+            # lines of executions deleted meanwhile are not written
+            self.written += written
+            return True
+
+    def stats(self) -> dict:
+        return {
+            'buffered': len(self._buffer),
+            'written': self.written,
+            'dropped': self.dropped,
+        }
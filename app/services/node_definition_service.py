@@ -1,35 +1,172 @@
+'''Catalog of node definitions, cached in process by id and by type.
+
+Node definitions change rarely and are read on every workflow resolution,
+so the public catalog is loaded with a single query at startup
+(`preload()`, called by `Application._lifespan`) and served from memory:
+
+  svc.get_node_definition(id)        # one definition
+  svc.get_node_definitions(ids)      # many, one query for the misses only
+  svc.get_by_type('trigger')         # public definitions of a type
+  svc.get_upload_trigger(id)         # parsed FileUploadTriggerNode
+
+Entries expire after `cache_ttl` seconds; a type miss reloads the whole
+public catalog (still one query). Whatever changes a definition must call
+`invalidate(id)` (or `invalidate()` for everything).
+'''
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional, Union
 from uuid import UUID
+
 from fastapi import HTTPException
-from supabase_auth import Optional
 
+from app.core.cache.ttl_cache import TTLCache
+from app.models.node_definition import NodeDefinition
 from app.repositories.node_definition_repository import NodeDefinitionRepository
-from app.schemas.node_definition_schema import (
-    FileUploadTriggerNode,
-    NodeDefinitionResponse,
-)
+from app.schemas.node_definition_schema import FileUploadTriggerNode
+
+logger = logging.getLogger(__name__)
+
+
+def _as_uuid(node_definition_id: Union[UUID, str]) -> UUID:
+    return (
+        node_definition_id
+        if isinstance(node_definition_id, UUID)
+        else UUID(str(node_definition_id))
+    )
 
 
 class NodeDefinitionService:
-    def __init__(self, node_definition_repo: NodeDefinitionRepository):
+    def __init__(
+        self,
+        node_definition_repo: NodeDefinitionRepository,
+        cache_size: int = 4096,
+        cache_ttl: float = 3600,
+    ):
         self._node_definition_repo = node_definition_repo
-        self._cache: Optional[FileUploadTriggerNode] = None
+        self._by_id = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # type -> public definitions of that type ([] for unknown types)
+        self._by_type = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # id -> FileUploadTriggerNode, parsed once instead of per request
+        self._upload_triggers = TTLCache(maxsize=256, ttl=cache_ttl)
+        self.preloads = 0
+
+    def preload(self) -> int:
+        '''Load every public node definition; returns how many were cached.'''
+
+        definitions = self._node_definition_repo.find_public()
+        by_type: dict[str, list[NodeDefinition]] = {}
+        for definition in definitions:
+            self._by_id.set(definition.id, definition)
+            by_type.setdefault(definition.type, []).append(definition)
+        for node_type, group in by_type.items():
+            self._by_type.set(node_type, group)
+
+        self.preloads += 1
+        logger.info(
+            'Cached %d public node definitions (%d types)',
+            len(definitions),
+            len(by_type),
+        )
+        return len(definitions)
 
-    def get_node_definition(self, node_definition_id: UUID) -> FileUploadTriggerNode:
+    def get_node_definition(
+        self, node_definition_id: Union[UUID, str]
+    ) -> NodeDefinition:
         try:
-            if self._cache:
-                print("Returning cached NodeDefinition with ID:", node_definition_id)
-                return self._cache
-
-            print("Querying database for NodeDefinition with ID:", node_definition_id)
-            found_node_definition = self._node_definition_repo.find_by_id(
-                node_definition_id
-            )
-            if not found_node_definition:
+            node_definition_id = _as_uuid(node_definition_id)
+            found = self._by_id.get(node_definition_id)
+            if found is not None:
+                return found
+
+            found = self._node_definition_repo.find_by_id(node_definition_id)
+            if not found:
                 raise HTTPException(status_code=404, detail='NodeDefinition not found.')
 
-            self._cache = FileUploadTriggerNode(**found_node_definition.model_dump())
-            return self._cache
+            self._by_id.set(node_definition_id, found)
+            return found
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
+
+    def get_node_definitions(
+        self, node_definition_ids: Iterable[Union[UUID, str]]
+    ) -> dict[UUID, NodeDefinition]:
+        '''Definitions by id; unknown ids are left out.'''
+        try:
+            found: dict[UUID, NodeDefinition] = {}
+            missing: list[UUID] = []
+            for node_definition_id in map(_as_uuid, node_definition_ids):
+                definition = self._by_id.get(node_definition_id)
+                if definition is not None:
+                    found[node_definition_id] = definition
+                elif node_definition_id not in missing:
+                    missing.append(node_definition_id)
+
+            if missing:
+                for definition in self._node_definition_repo.find_by_ids(missing):
+                    self._by_id.set(definition.id, definition)
+                    found[definition.id] = definition
+            return found
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def get_by_type(self, node_type: str) -> list[NodeDefinition]:
+        '''Public definitions of `node_type` (empty when there are none).'''
+        try:
+            group = self._by_type.get(node_type)
+            if group is None:
+                self.preload()
+                group = self._by_type.get(node_type)
+                if group is None:
+                    # remember unknown types too: no reload per lookup
+                    group = []
+                    self._by_type.set(node_type, group)
+            return group
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def get_upload_trigger(
+        self, node_definition_id: Union[UUID, str]
+    ) -> FileUploadTriggerNode:
+        node_definition_id = _as_uuid(node_definition_id)
+        trigger = self._upload_triggers.get(node_definition_id)
+        if trigger is None:
+            definition = self.get_node_definition(node_definition_id)
+            trigger = FileUploadTriggerNode(**definition.model_dump())
+            self._upload_triggers.set(node_definition_id, trigger)
+        return trigger
+
+    def invalidate(self, node_definition_id: Optional[Union[UUID, str]] = None) -> None:
+        '''Forget one definition (and its type group), or everything.'''
+
+        if node_definition_id is None:
+            self._by_id.clear()
+            self._by_type.clear()
+            self._upload_triggers.clear()
+            return
+
+        node_definition_id = _as_uuid(node_definition_id)
+        cached = self._by_id.get(node_definition_id)
+        self._by_id.delete(node_definition_id)
+        self._upload_triggers.delete(node_definition_id)
+        if cached is not None:
+            self._by_type.delete(cached.type)
+        else:
+            # the type is unknown: no group can be trusted to be current
+            self._by_type.clear()
+
+    def stats(self) -> dict:
+        return {
+            'by_id': self._by_id.stats(),
+            'by_type': self._by_type.stats(),
+            'upload_triggers': self._upload_triggers.stats(),
+            'preloads': self.preloads,
+        }
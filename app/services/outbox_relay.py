@@ -0,0 +1,291 @@
+'''Relay from the `execution_outbox` table to the Redis job queue.
+
+`SystemExecutionService.start` / `start_many` flip executions to `running`
+and write their outbox rows in one transaction; this relay turns the rows
+into trigger jobs:
+
+  claim a batch (FOR UPDATE SKIP LOCKED + lease)
+  -> build every trigger job -> one pipelined enqueue -> delete the rows
+
+A failed enqueue (Redis down, ...) leaves the rows in the table with an
+exponential backoff; a process dying mid-batch lets the lease expire, and
+the rows are claimed again. Delivery is therefore at-least-once. Rows that
+can never succeed (no trigger node, `OUTBOX_MAX_ATTEMPTS` reached) mark the
+execution `failed` instead of leaving it `running` forever.
+
+One relay runs in every API process, started by `Application._lifespan`;
+`notify()` wakes it right after a commit so triggers don't wait for the
+poll interval.
+'''
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Optional
+from uuid import UUID
+
+from app.core.cache.workflow_definition_store import WorkflowDefinitionStore
+from app.core.dependencies.execution_events import ExecutionEventPublisher
+from app.core.dependencies.redis import WorkflowClient
+from app.db.unit_of_work import after_commit
+from app.models.system_execution import ExecutionStatus
+from app.repositories.execution_outbox_repository import ExecutionOutboxRepository
+from app.repositories.system_execution_repository import SystemExecutionRepository
+from app.schemas.system_execution_schema import SystemExecutionResponse
+
+logger = logging.getLogger(__name__)
+
+KIND_TRIGGER = 'trigger'
+
+
+async def publish_status_events(
+    executions: list[SystemExecutionResponse],
+    event_publisher: Optional[ExecutionEventPublisher],
+) -> None:
+    '''Tell live subscribers (SSE / WebSocket) about new execution statuses.'''
+    if event_publisher is None or not executions:
+        return
+    try:
+        await event_publisher.publish_many(
+            [(e.id, 'status', {'status': e.status}) for e in executions]
+        )
+    except Exception as e:
+        # events are a convenience for dashboards, never fail the trigger
+        logger.warning('Failed to publish execution status events: %s', e)
+
+
+async def publish_definitions(
+    jobs: list[dict],
+    executions: list[SystemExecutionResponse],
+    definition_store: Optional[WorkflowDefinitionStore],
+) -> None:
+    '''Make the definitions referenced by the jobs' `workflow_hash` resolvable
+    from Redis; `executions[i]` carries the definition of `jobs[i]`.
+    '''
+    if definition_store is None:
+        return
+    published = set()
+    for job, execution in zip(jobs, executions):
+        content_hash = job.get('workflow_hash')
+        if content_hash and content_hash not in published and execution.system_json:
+            await definition_store.publish(execution.system_json, content_hash)
+            published.add(content_hash)
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        outbox_repo: ExecutionOutboxRepository,
+        execution_repo: SystemExecutionRepository,
+        workflow_client: WorkflowClient,
+        definition_store: Optional[WorkflowDefinitionStore] = None,
+        event_publisher: Optional[ExecutionEventPublisher] = None,
+        batch_size: int = 500,
+        poll_interval: float = 0.5,
+        lease_seconds: float = 30,
+        max_attempts: int = 10,
+        retry_base_seconds: float = 1,
+        retry_max_seconds: float = 300,
+    ) -> None:
+        self.outbox_repo = outbox_repo
+        self.execution_repo = execution_repo
+        self.workflow_client = workflow_client
+        self.definition_store = definition_store
+        self.event_publisher = event_publisher
+        self.batch_size = int(batch_size)
+        self.poll_interval = float(poll_interval)
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = int(max_attempts)
+        self.retry_base_seconds = float(retry_base_seconds)
+        self.retry_max_seconds = float(retry_max_seconds)
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def notify(self) -> None:
+        '''Drain now instead of at the next poll.
+
+        Within a request unit of work the wakeup waits for the commit: the
+        relay would not see the rows before it.
+        '''
+        after_commit(self._wake)
+
+    def _wake(self) -> None:
+        # called from worker threads (sync services, the request's commit)
+        if self._loop is None:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # rows of an interrupted batch are claimed again once their lease ends
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except Exception:
+                logger.exception('Execution outbox relay failed')
+                claimed = 0
+
+            # a full batch means more is probably waiting: don't sleep
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        '''Claim and relay one batch; returns the number of rows claimed.'''
+
+        rows = await asyncio.to_thread(
+            self.outbox_repo.claim_batch, self.batch_size, self.lease_seconds
+        )
+        if not rows:
+            return 0
+
+        executions = {
+            e.id: e
+            for e in await asyncio.to_thread(
+                self.execution_repo.find_by_ids,
+                list({row['execution_id'] for row in rows}),
+            )
+        }
+
+        done, failed, pending = [], [], []
+        for row in rows:
+            execution = executions.get(row['execution_id'])
+            if row['kind'] != KIND_TRIGGER:
+                logger.error('Unknown execution outbox kind %r', row['kind'])
+                failed.append(row)
+            elif execution is None or execution.status != ExecutionStatus.RUNNING:
+                # deleted or stopped before it was sent: nothing to trigger
+                done.append(row)
+            else:
+                pending.append(row)
+
+        jobs, triggered, sent = [], [], []
+        for row in pending:
+            execution = executions[row['execution_id']]
+            try:
+                job = await self._make_job(execution, row['payload'])
+            except Exception as e:
+                # e.g. the definition could not be resolved right now
+                logger.warning('Cannot build the job of %s: %s', execution.id, e)
+                failed.extend(await self._retry_later([row], str(e)))
+                continue
+            if job is None:
+                logger.error('Execution %s has no trigger node', execution.id)
+                failed.append(row)
+            else:
+                jobs.append(job)
+                triggered.append(row)
+
+        if jobs:
+            try:
+                await self._enqueue(
+                    jobs, [executions[row['execution_id']] for row in triggered]
+                )
+                sent = triggered
+                done.extend(sent)
+                self.sent += len(jobs)
+            except Exception as e:
+                logger.warning('Failed to enqueue %d trigger jobs: %s', len(jobs), e)
+                failed.extend(await self._retry_later(triggered, str(e)))
+
+        await asyncio.to_thread(self.outbox_repo.complete, [row['id'] for row in done])
+        await self._fail(failed)
+        await publish_status_events(
+            [executions[row['execution_id']] for row in sent],
+            self.event_publisher,
+        )
+        return len(rows)
+
+    async def _make_job(
+        self, execution: SystemExecutionResponse, payload: Optional[dict] = None
+    ) -> Optional[dict]:
+        system_json = execution.system_json
+        if not system_json and execution.system_json_hash:
+            system_json = await self.definition_store.resolve(
+                execution.system_json_hash
+            )
+            execution.system_json = system_json
+        if not system_json:
+            return None
+
+        self.workflow_client.load_workflow(system_json, execution.system_json_hash)
+        job = self.workflow_client.make_trigger_job(str(execution.id))
+        if job is not None and payload:
+            job['payload'].update(payload)
+        return job
+
+    async def _enqueue(
+        self, jobs: list[dict], executions: list[SystemExecutionResponse]
+    ) -> None:
+        # trigger jobs always reference their definition by `workflow_hash`,
+        # also when it only exists inline in `system_json`: publish it first
+        await publish_definitions(jobs, executions, self.definition_store)
+        # borrows a connection from the application-lifetime pool
+        await self.workflow_client.connect()
+        try:
+            await self.workflow_client.enqueue_jobs(jobs)
+        finally:
+            await self.workflow_client.close()
+
+    async def _retry_later(self, rows: list[dict], error: str) -> list[dict]:
+        '''Back the rows off exponentially; returns those out of attempts.'''
+
+        exhausted = [row for row in rows if row['attempts'] >= self.max_attempts]
+        by_delay: dict[float, list[int]] = defaultdict(list)
+        for row in rows:
+            if row['attempts'] < self.max_attempts:
+                delay = min(
+                    self.retry_base_seconds * 2 ** (row['attempts'] - 1),
+                    self.retry_max_seconds,
+                )
+                by_delay[delay].append(row['id'])
+
+        for delay, ids in by_delay.items():
+            await asyncio.to_thread(self.outbox_repo.retry_later, ids, delay, error)
+            self.retried += len(ids)
+        return exhausted
+
+    async def _fail(self, rows: list[dict]) -> None:
+        '''Give up on the rows: their executions go from running to failed.'''
+
+        if not rows:
+            return
+        execution_ids: list[UUID] = list({row['execution_id'] for row in rows})
+        logger.error('Giving up triggering %d executions', len(execution_ids))
+        failed = await asyncio.to_thread(
+            self.execution_repo.transition_status_many,
+            execution_ids,
+            (ExecutionStatus.RUNNING,),
+            ExecutionStatus.FAILED,
+            set_stopped=True,
+        )
+        await asyncio.to_thread(self.outbox_repo.complete, [row['id'] for row in rows])
+        self.failed += len(rows)
+        await publish_status_events(failed, self.event_publisher)
+
+    def stats(self) -> dict:
+        return {
+            'sent': self.sent,
+            'retried': self.retried,
+            'failed': self.failed,
+        }
@@ -1,32 +1,28 @@
+import asyncio
+import functools
+import logging
+from typing import Iterator, Optional
 from uuid import UUID
-from fastapi import HTTPException, status, BackgroundTasks
+from fastapi import HTTPException, status
 
-from app.core.dependencies.redis import WorkflowClient
-from app.models.system_execution import SystemExecution
+from app.core.cache.workflow_definition_store import WorkflowDefinitionStore
+from app.core.dependencies.execution_events import ExecutionEventPublisher
+from app.core.dependencies.http_cache import make_etag
+from app.db.unit_of_work import after_commit_async
+from app.models.system_execution import ExecutionStatus, SystemExecution
+from app.repositories.execution_log_repository import ExecutionLogRepository
 from app.repositories.system_execution_repository import SystemExecutionRepository
 from app.repositories.system_repository import SystemRepository
+from app.services.outbox_relay import KIND_TRIGGER, OutboxRelay, publish_status_events
+from app.schemas.base_schema import from_row
 from app.schemas.system_execution_schema import (
+    BatchStartExecutionResponse,
     CreateSystemExecutionRequest,
+    ExecutionLogListResponse,
     SystemExecutionResponse,
 )
 
-
-async def trigger_workflow_in_background(
-    execution: SystemExecutionResponse,
-    workflow_client=WorkflowClient,
-) -> bool:
-    print("Starting workflow in background task...")
-    try:
-        await workflow_client.connect()
-        workflow_client.load_workflow(execution.system_json)
-        # run one-off trigger
-        await workflow_client.trigger_node_manual()
-        # close redis
-        await workflow_client.close()
-        return True
-    except Exception as e:
-        print(f"Error triggering workflow: {e}")
-        return False
+logger = logging.getLogger(__name__)
 
 
 class SystemExecutionService:
@@ -34,11 +30,31 @@ class SystemExecutionService:
         self,
         execution_repo: SystemExecutionRepository,
         system_repo: SystemRepository,
-        workflow_client=WorkflowClient,
+        definition_store: Optional[WorkflowDefinitionStore] = None,
+        log_repo: Optional[ExecutionLogRepository] = None,
+        event_publisher: Optional[ExecutionEventPublisher] = None,
+        outbox_relay: Optional[OutboxRelay] = None,
     ):
         self._execution_repo = execution_repo
         self._system_repo = system_repo
-        self._workflow_client = workflow_client
+        self._log_repo = log_repo
+        self._event_publisher = event_publisher
+        self._definition_store = definition_store
+        self._outbox_relay = outbox_relay
+
+    def _to_response(self, execution) -> SystemExecutionResponse:
+        """Build the response, resolving `system_json` from its content hash."""
+        if not isinstance(execution, SystemExecutionResponse):
+            execution = from_row(SystemExecutionResponse, execution)
+        if (
+            not execution.system_json
+            and execution.system_json_hash
+            and self._definition_store is not None
+        ):
+            execution.system_json = self._definition_store.get(
+                execution.system_json_hash
+            )
+        return execution
 
     def create_execution(
         self, payload: CreateSystemExecutionRequest
@@ -49,9 +65,17 @@ class SystemExecutionService:
             if not found_system:
                 raise HTTPException(status_code=404, detail='System not found.')
 
+            # the workflow JSON is stored once per distinct content and
+            # referenced by hash instead of copied into every execution row
+            system_json, system_json_hash = payload.system_json, None
+            if system_json and self._definition_store is not None:
+                system_json_hash = self._definition_store.save(system_json)
+                system_json = None
+
             execution = SystemExecution(
                 system_id=payload.system_id,
-                system_json=payload.system_json,
+                system_json=system_json,
+                system_json_hash=system_json_hash,
                 logs=None,
                 status=payload.status,
                 started_at=None,
@@ -65,7 +89,7 @@ class SystemExecutionService:
                     detail='Create execution failed.',
                 )
 
-            return SystemExecutionResponse(**saved.model_dump())
+            return self._to_response(saved)
         except HTTPException:
             raise
         except Exception as e:
@@ -77,41 +101,175 @@ class SystemExecutionService:
             if not found:
                 raise HTTPException(status_code=404, detail='Execution not found.')
 
-            return SystemExecutionResponse(**found.model_dump())
+            return self._to_response(found)
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-    async def start(
-        self, execution_id: UUID, background_tasks: BackgroundTasks
-    ) -> dict:
+    def get_execution_etag(self, execution_id: UUID) -> str:
+        """ETag of the execution from a version-only query."""
         try:
-            execution = self._execution_repo.find_by_id(execution_id)
-            if not execution:
+            found = self._execution_repo.find_version(execution_id)
+            if not found:
                 raise HTTPException(status_code=404, detail='Execution not found.')
 
-            # if execution.status == 'running':
-            #     raise HTTPException(
-            #         status_code=400, detail='Execution is already running.'
-            #     )
+            return make_etag(execution_id, *found)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-            # Update status to 'running'
-            execution.status = 'running'
-            self._execution_repo.update(execution.id, execution)
+    @staticmethod
+    def execution_etag(execution: SystemExecutionResponse) -> str:
+        # the columns of `SystemExecutionRepository.find_version`, same order
+        return make_etag(
+            execution.id,
+            execution.status,
+            execution.started_at,
+            execution.stopped_at,
+            execution.system_json_hash,
+        )
 
-            # `model_dump()` returns a dict; `model_validate` expects the data
-            # as a single positional argument in pydantic v2, not keyword args.
-            execution = SystemExecutionResponse(**execution.model_dump())
+    def ensure_exists(self, execution_id: UUID) -> None:
+        try:
+            if not self._execution_repo.exists(execution_id):
+                raise HTTPException(status_code=404, detail='Execution not found.')
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-            background_tasks.add_task(
-                trigger_workflow_in_background,
-                execution,
-                self._workflow_client,
+    def get_logs(
+        self, execution_id: UUID, after: int = 0, limit: int = 500
+    ) -> ExecutionLogListResponse:
+        """Return the log lines written after sequence number `after`."""
+        try:
+            if not self._execution_repo.exists(execution_id):
+                raise HTTPException(status_code=404, detail='Execution not found.')
+
+            logs, has_more = self._log_repo.find_after(execution_id, after, limit)
+            return ExecutionLogListResponse(
+                logs=logs,
+                next_after=logs[-1].seq if logs else after,
+                has_more=has_more,
             )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def stream_logs(self, execution_id: UUID, after: int = 0) -> Iterator[str]:
+        """Return an iterator of NDJSON lines, one per log line after `after`."""
+        try:
+            if not self._execution_repo.exists(execution_id):
+                raise HTTPException(status_code=404, detail='Execution not found.')
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return (
+            log.model_dump_json() + '\n'
+            for log in self._log_repo.iter_after(execution_id, after)
+        )
 
+    async def start(self, execution_id: UUID) -> dict:
+        try:
+            # one conditional UPDATE: a concurrent duplicate start finds the
+            # execution already running and is rejected without enqueueing.
+            # The trigger job is written to the outbox in the same transaction
+            # and sent to Redis by the relay. Blocking database calls run in
+            # worker threads, never on the event loop.
+            execution = await asyncio.to_thread(
+                self._execution_repo.transition_status,
+                execution_id,
+                ExecutionStatus.STARTABLE,
+                ExecutionStatus.RUNNING,
+                set_started=True,
+                outbox_kind=KIND_TRIGGER,
+            )
+            if not execution:
+                await asyncio.to_thread(
+                    self._raise_transition_failed, execution_id, 'already running'
+                )
+
+            self._notify_relay()
             return {"message": "Execution started."}
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
+
+    async def stop(self, execution_id: UUID) -> SystemExecutionResponse:
+        try:
+            execution = await asyncio.to_thread(
+                self._execution_repo.transition_status,
+                execution_id,
+                ExecutionStatus.STOPPABLE,
+                ExecutionStatus.STOPPED,
+                set_stopped=True,
+            )
+            if not execution:
+                await asyncio.to_thread(
+                    self._raise_transition_failed, execution_id, 'not running'
+                )
+
+            # subscribers must not see a stop that is rolled back
+            await after_commit_async(
+                functools.partial(
+                    publish_status_events, [execution], self._event_publisher
+                )
+            )
+            # may load system_json from the definition store (Redis, database)
+            return await asyncio.to_thread(self._to_response, execution)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def _notify_relay(self) -> None:
+        # the relay also polls: this only saves the wait for the next poll
+        if self._outbox_relay is not None:
+            self._outbox_relay.notify()
+
+    def _raise_transition_failed(self, execution_id: UUID, reason: str) -> None:
+        # the failure path only: tell "missing" from "wrong status"
+        if not self._execution_repo.exists(execution_id):
+            raise HTTPException(status_code=404, detail='Execution not found.')
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f'Execution is {reason}.'
+        )
+
+    def start_many(self, execution_ids: list[UUID]) -> BatchStartExecutionResponse:
+        """Start many executions: one conditional UPDATE and outbox INSERT.
+
+        Blocking: call it from a sync route (FastAPI's threadpool) or a thread.
+        """
+        try:
+            # dict.fromkeys keeps the request order and drops duplicates
+            execution_ids = list(dict.fromkeys(execution_ids))
+            executions = self._execution_repo.transition_status_many(
+                execution_ids,
+                ExecutionStatus.STARTABLE,
+                ExecutionStatus.RUNNING,
+                set_started=True,
+                outbox_kind=KIND_TRIGGER,
+            )
+            started_ids = {execution.id for execution in executions}
+            if executions:
+                self._notify_relay()
+
+            rejected = [i for i in execution_ids if i not in started_ids]
+            existing = (
+                self._execution_repo.find_existing_ids(rejected) if rejected else set()
+            )
+            return BatchStartExecutionResponse(
+                started=[i for i in execution_ids if i in started_ids],
+                not_found=[i for i in rejected if i not in existing],
+                already_running=[i for i in rejected if i in existing],
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
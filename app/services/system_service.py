@@ -1,9 +1,20 @@
+import asyncio
+from typing import Iterator
 from uuid import UUID
 from fastapi import HTTPException, status
 
+from app.core.cache.ttl_cache import TTLCache
+from app.core.dependencies.http_cache import version_etag
 from app.models.system import System
-from app.repositories.system_repository import SystemRepository
-from app.repositories.workspace_repository import WorkspaceRepository
+from app.repositories.system_repository import (
+    AsyncSystemRepository,
+    SystemRepository,
+)
+from app.repositories.workspace_repository import (
+    AsyncWorkspaceRepository,
+    WorkspaceRepository,
+)
+from app.schemas.base_schema import from_row
 from app.schemas.system_schema import (
     CreateSystemRequest,
     SystemResponse,
@@ -13,28 +24,81 @@ from app.schemas.system_schema import (
 
 class SystemService:
     def __init__(
-        self, system_repo: SystemRepository, workspace_repo: WorkspaceRepository
+        self,
+        system_repo: SystemRepository,
+        workspace_repo: WorkspaceRepository,
+        ownership_cache: TTLCache | None = None,
+        async_system_repo: AsyncSystemRepository | None = None,
+        async_workspace_repo: AsyncWorkspaceRepository | None = None,
     ):
         self._system_repo = system_repo
         self._workspace_repo = workspace_repo
+        self._ownership_cache = ownership_cache
+        # set when DB_ASYNC_ENABLED: list reads without a threadpool thread
+        self._async_system_repo = async_system_repo
+        self._async_workspace_repo = async_workspace_repo
+
+    def _authorize_workspace(self, workspace_id: UUID, user_id: UUID) -> None:
+        '''Raise unless `user_id` owns the workspace.
+
+        Answers are cached per (user_id, workspace_id) for a short TTL; a miss
+        costs one `SELECT user_id` instead of loading the whole workspace.
+        Unknown workspaces are never cached.
+        '''
+        key = (user_id, workspace_id)
+        owned = self._cached_ownership(key)
+
+        if owned is None:
+            owned = self._check_owner(
+                key, self._workspace_repo.find_owner_id(workspace_id)
+            )
+
+        if not owned:
+            raise HTTPException(
+                status_code=403, detail='Not authorized to access this workspace.'
+            )
+
+    async def _authorize_workspace_async(
+        self, workspace_id: UUID, user_id: UUID
+    ) -> None:
+        '''`_authorize_workspace` through the async workspace repository.'''
+        key = (user_id, workspace_id)
+        owned = self._cached_ownership(key)
+
+        if owned is None:
+            owned = self._check_owner(
+                key, await self._async_workspace_repo.find_owner_id(workspace_id)
+            )
+
+        if not owned:
+            raise HTTPException(
+                status_code=403, detail='Not authorized to access this workspace.'
+            )
+
+    def _cached_ownership(self, key: tuple[UUID, UUID]) -> bool | None:
+        if self._ownership_cache is None:
+            return None
+        return self._ownership_cache.get(key)
+
+    def _check_owner(self, key: tuple[UUID, UUID], owner_id: UUID | None) -> bool:
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail='Workspace not found.')
+
+        owned = owner_id == key[0]
+        if self._ownership_cache is not None:
+            self._ownership_cache.set(key, owned)
+        return owned
 
     def create_system(
         self, payload: CreateSystemRequest, user_id: UUID
     ) -> SystemResponse:
         try:
-            found_workspace = self._workspace_repo.find_by_id(payload.workspace_id)
-            if not found_workspace:
-                raise HTTPException(status_code=404, detail='Workspace not found.')
-
-            if found_workspace.user_id != user_id:
-                raise HTTPException(
-                    status_code=403, detail='Not authorized to access this workspace.'
-                )
+            self._authorize_workspace(payload.workspace_id, user_id)
 
             system = System(
                 name=payload.name,
                 description=payload.description,
-                workspace_id=found_workspace.id,
+                workspace_id=payload.workspace_id,
             )
 
             saved_system = self._system_repo.create(system)
@@ -44,7 +108,7 @@ class SystemService:
                     detail='Create system failed.',
                 )
 
-            return SystemResponse(**saved_system.model_dump())
+            return from_row(SystemResponse, saved_system)
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -52,49 +116,127 @@ class SystemService:
         self, workspace_id: UUID, system_id: UUID, user_id: UUID
     ) -> SystemResponse:
         try:
-            found_workspace = self._workspace_repo.find_by_id(workspace_id)
-            if not found_workspace:
-                raise HTTPException(status_code=404, detail='Workspace not found.')
+            # one statement: system joined to its workspace, owner as predicate
+            found_system = self._system_repo.find_by_id_for_user(
+                workspace_id, system_id, user_id
+            )
+            if not found_system:
+                raise HTTPException(status_code=404, detail='System not found.')
 
-            if found_workspace.user_id != user_id:
-                raise HTTPException(
-                    status_code=403, detail='Not authorized to access this workspace.'
-                )
+            return found_system
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-            found_system = self._system_repo.find_by_id(system_id)
-            if not found_system:
+    def get_system_etag(
+        self, workspace_id: UUID, system_id: UUID, user_id: UUID
+    ) -> str:
+        """ETag of the system from a version-only query (same errors as get)."""
+        try:
+            found = self._system_repo.find_version_for_user(
+                workspace_id, system_id, user_id
+            )
+            if not found:
                 raise HTTPException(status_code=404, detail='System not found.')
 
-            if found_system.workspace_id != found_workspace.id:
-                raise HTTPException(
-                    status_code=404, detail='System not found in this workspace.'
-                )
+            return version_etag(system_id, *found)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-            return SystemResponse(**found_system.model_dump())
+    def get_all_systems(
+        self,
+        workspace_id: UUID,
+        user_id: UUID,
+        page: int | None = None,
+        per_page: int | None = None,
+        cursor: str | None = None,
+    ) -> SystemListResponse:
+        '''List the systems of a workspace; all of them unless `per_page` is set.'''
+        try:
+            if page is not None and page < 1:
+                raise HTTPException(status_code=400, detail='Page must be >= 1')
+            if per_page is not None and per_page < 1:
+                raise HTTPException(status_code=400, detail='per_page must be >= 1')
+
+            self._authorize_workspace(workspace_id, user_id)
+
+            offset = (page - 1) * per_page if page and per_page else 0
+
+            systems = self._system_repo.find_all_by_workspace_id(
+                workspace_id, offset=offset, limit=per_page, cursor=cursor
+            )
+            if per_page is not None:
+                systems.page = None if cursor else (page or 1)
+                systems.per_page = per_page
+
+            return systems
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-    def get_all_systems(self, workspace_id: UUID, user_id: UUID) -> SystemListResponse:
+    async def get_all_systems_async(
+        self,
+        workspace_id: UUID,
+        user_id: UUID,
+        page: int | None = None,
+        per_page: int | None = None,
+        cursor: str | None = None,
+    ) -> SystemListResponse:
+        '''`get_all_systems` for `async def` routes.
+
+        Runs on the event loop with the async repositories; without them
+        (DB_ASYNC_ENABLED off) the sync path runs in a worker thread.
+        '''
+        if self._async_system_repo is None or self._async_workspace_repo is None:
+            return await asyncio.to_thread(
+                self.get_all_systems, workspace_id, user_id, page, per_page, cursor
+            )
+
         try:
-            found_workspace = self._workspace_repo.find_by_id(workspace_id)
-            if not found_workspace:
-                raise HTTPException(status_code=404, detail='Workspace not found.')
+            if page is not None and page < 1:
+                raise HTTPException(status_code=400, detail='Page must be >= 1')
+            if per_page is not None and per_page < 1:
+                raise HTTPException(status_code=400, detail='per_page must be >= 1')
 
-            if found_workspace.user_id != user_id:
-                raise HTTPException(
-                    status_code=403, detail='Not authorized to access this workspace.'
-                )
+            await self._authorize_workspace_async(workspace_id, user_id)
+
+            offset = (page - 1) * per_page if page and per_page else 0
+
+            systems = await self._async_system_repo.find_all_by_workspace_id(
+                workspace_id, offset=offset, limit=per_page, cursor=cursor
+            )
+            if per_page is not None:
+                systems.page = None if cursor else (page or 1)
+                systems.per_page = per_page
 
-            systems = self._system_repo.find_all_by_workspace_id(workspace_id)
+            return systems
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-            return SystemListResponse(systems=systems, total=len(systems))
+    def stream_systems(self, workspace_id: UUID, user_id: UUID) -> Iterator[str]:
+        '''Return an iterator of NDJSON lines, one per system of the workspace.
+
+        Authorization is checked before the iterator is returned so failures
+        still surface as regular HTTP errors rather than a truncated stream.
+        '''
+        try:
+            self._authorize_workspace(workspace_id, user_id)
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+        return (
+            system.model_dump_json() + '\n'
+            for system in self._system_repo.iter_by_workspace_id(workspace_id)
+        )
+
     # def update_system(
     #     self, system_id: uuid.UUID, payload: UpdateSystemRequest
     # ) -> UpdateSystemResponse:
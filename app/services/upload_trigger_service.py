@@ -0,0 +1,224 @@
+'''Receive a file for a file-upload trigger and start the execution with it.
+
+The request body is consumed as it arrives and never held in memory as a
+whole: chunks are gathered into `chunk_size` slices, and each slice is
+hashed (sha256) and appended to a temporary file in a worker thread, so the
+event loop keeps serving other requests. Limits of the trigger node
+(`maxSizeMB`, `acceptedFileTypes`) are checked from the headers before the
+first byte is read, and the size again while streaming for requests
+without (or lying about) Content-Length. Database calls run in worker
+threads too.
+
+Stored files are content-addressed, `<UPLOAD_DIR>/<sha256><ext>`, so
+uploading the same file twice keeps one copy. The file reference reaches
+the trigger job through the execution outbox, in the transaction that
+marks the execution running.
+'''
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from fnmatch import fnmatch
+from mimetypes import guess_type
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.models.system_execution import ExecutionStatus
+from app.repositories.system_execution_repository import SystemExecutionRepository
+from app.schemas.node_definition_schema import FileUploadTriggerNode
+from app.schemas.system_execution_schema import UploadTriggerResponse
+from app.services.outbox_relay import KIND_TRIGGER, OutboxRelay
+
+logger = logging.getLogger(__name__)
+
+
+def is_accepted_type(
+    accepted: list[str], file_name: str, content_type: Optional[str]
+) -> bool:
+    '''Match the file against MIME patterns ('image/*') or extensions ('.csv').'''
+    if not accepted:
+        return True
+    extension = Path(file_name).suffix.lower()
+    for pattern in accepted:
+        pattern = pattern.strip().lower()
+        if '/' in pattern:
+            if content_type and fnmatch(content_type, pattern):
+                return True
+        elif extension and extension == '.' + pattern.lstrip('.'):
+            return True
+    return False
+
+
+def _write(file, hasher, data: bytearray) -> None:
+    # hashlib and file writes release the GIL: runs in a worker thread
+    hasher.update(data)
+    file.write(data)
+
+
+class UploadTriggerService:
+    def __init__(
+        self,
+        execution_repo: SystemExecutionRepository,
+        outbox_relay: Optional[OutboxRelay] = None,
+        upload_dir: str = 'uploads',
+        chunk_size: int = 1024 * 1024,
+    ):
+        self._execution_repo = execution_repo
+        self._outbox_relay = outbox_relay
+        self._upload_dir = Path(upload_dir)
+        self._chunk_size = int(chunk_size)
+
+    def check_request(
+        self,
+        trigger: FileUploadTriggerNode,
+        file_name: Optional[str],
+        content_type: Optional[str],
+        content_length: Optional[int],
+    ) -> tuple[str, str]:
+        '''Validate the upload from its headers; returns (file name, MIME type).'''
+
+        parameters = trigger.parameters
+        if parameters.storageType != 'local':
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail=f'Storage type "{parameters.storageType}" is not supported.',
+            )
+
+        # never trust a client path: keep the last component only
+        file_name = os.path.basename((file_name or '').replace('\\', '/'))
+        if not file_name:
+            raise HTTPException(
+                status_code=400, detail='The X-File-Name header is required.'
+            )
+
+        content_type = (content_type or '').split(';')[0].strip().lower()
+        if not content_type or content_type == 'application/octet-stream':
+            content_type = guess_type(file_name)[0] or 'application/octet-stream'
+        if not is_accepted_type(parameters.acceptedFileTypes, file_name, content_type):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail='File type not accepted by the upload trigger.',
+            )
+
+        if content_length is not None and content_length > self._max_bytes(trigger):
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f'File exceeds {parameters.maxSizeMB} MB.',
+            )
+        return file_name, content_type
+
+    @staticmethod
+    def _max_bytes(trigger: FileUploadTriggerNode) -> int:
+        return trigger.parameters.maxSizeMB * 1024 * 1024
+
+    async def upload(
+        self,
+        execution_id: UUID,
+        trigger: FileUploadTriggerNode,
+        chunks: AsyncIterator[bytes],
+        file_name: Optional[str],
+        content_type: Optional[str] = None,
+        content_length: Optional[int] = None,
+    ) -> UploadTriggerResponse:
+        try:
+            file_name, content_type = self.check_request(
+                trigger, file_name, content_type, content_length
+            )
+
+            # reject before receiving the body, not after a 1 GB upload
+            # blocking database calls: worker threads, never the event loop
+            found = await asyncio.to_thread(
+                self._execution_repo.find_by_id, execution_id
+            )
+            if not found:
+                raise HTTPException(status_code=404, detail='Execution not found.')
+            if (found.status or '') not in ExecutionStatus.STARTABLE:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail='Execution is already running.',
+                )
+
+            extension = Path(file_name).suffix.lower()
+            if not extension[1:].isalnum() or len(extension) > 16:
+                extension = ''
+            path, size, sha256 = await self._store(
+                chunks, extension, self._max_bytes(trigger)
+            )
+            logger.info('Stored upload %s (%d bytes) as %s', file_name, size, path)
+
+            file = {
+                'trigger': 'file_upload',
+                'filePath': str(path),
+                'fileName': file_name,
+                'fileType': content_type,
+                'sizeBytes': size,
+                'sha256': sha256,
+                'storageType': trigger.parameters.storageType,
+            }
+            started = await asyncio.to_thread(
+                self._execution_repo.transition_status,
+                execution_id,
+                ExecutionStatus.STARTABLE,
+                ExecutionStatus.RUNNING,
+                set_started=True,
+                outbox_kind=KIND_TRIGGER,
+                outbox_payload=file,
+            )
+            if not started:
+                # started concurrently while the body was streaming; the
+                # stored file is content-addressed and may be shared: keep it
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail='Execution is already running.',
+                )
+            if self._outbox_relay is not None:
+                self._outbox_relay.notify()
+
+            return UploadTriggerResponse(execution_id=execution_id, **file)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def _store(
+        self, chunks: AsyncIterator[bytes], extension: str, max_bytes: int
+    ) -> tuple[Path, int, str]:
+        '''Stream `chunks` to disk; returns (path, size, sha256 hex digest).'''
+
+        await asyncio.to_thread(self._upload_dir.mkdir, parents=True, exist_ok=True)
+        tmp_path = self._upload_dir / f'.{uuid.uuid4().hex}.part'
+        hasher = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        try:
+            with open(tmp_path, 'wb') as file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f'File exceeds {max_bytes // (1024 * 1024)} MB.',
+                        )
+                    buffer += chunk
+                    if len(buffer) >= self._chunk_size:
+                        # hand the slice over instead of copying it
+                        data, buffer = buffer, bytearray()
+                        await asyncio.to_thread(_write, file, hasher, data)
+                if buffer:
+                    await asyncio.to_thread(_write, file, hasher, buffer)
+
+            sha256 = hasher.hexdigest()
+            path = self._upload_dir / f'{sha256}{extension}'
+            # atomic: readers never see a partially written file
+            await asyncio.to_thread(os.replace, tmp_path, path)
+            return path, size, sha256
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
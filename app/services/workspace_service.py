@@ -1,8 +1,17 @@
+import asyncio
+import functools
 from uuid import UUID
 from fastapi import HTTPException, status
 
+from app.core.cache.ttl_cache import TTLCache
+from app.core.dependencies.http_cache import version_etag
+from app.db.unit_of_work import after_commit
 from app.models.workspace import Workspace
-from app.repositories.workspace_repository import WorkspaceRepository
+from app.repositories.workspace_repository import (
+    AsyncWorkspaceRepository,
+    WorkspaceRepository,
+)
+from app.schemas.base_schema import from_row
 from app.schemas.workspace_schema import (
     CreateWorkspaceRequest,
     WorkspaceResponse,
@@ -12,8 +21,16 @@ from app.schemas.workspace_schema import (
 
 
 class WorkspaceService:
-    def __init__(self, workspace_repo: WorkspaceRepository):
+    def __init__(
+        self,
+        workspace_repo: WorkspaceRepository,
+        ownership_cache: TTLCache | None = None,
+        async_workspace_repo: AsyncWorkspaceRepository | None = None,
+    ):
         self._workspace_repo = workspace_repo
+        self._ownership_cache = ownership_cache
+        # set when DB_ASYNC_ENABLED: list reads without a threadpool thread
+        self._async_workspace_repo = async_workspace_repo
 
     def create_workspace(
         self, payload: CreateWorkspaceRequest, user_id: UUID
@@ -30,7 +47,7 @@ class WorkspaceService:
                     detail='Create workspace failed.',
                 )
 
-            return WorkspaceResponse(**saved_workspace.model_dump())
+            return from_row(WorkspaceResponse, saved_workspace)
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -45,14 +62,38 @@ class WorkspaceService:
                     status_code=403, detail='Not authorized to access this workspace.'
                 )
 
-            return WorkspaceResponse(**found_workspace.model_dump())
+            return from_row(WorkspaceResponse, found_workspace)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def get_workspace_etag(self, workspace_id: UUID, user_id: UUID) -> str:
+        """ETag of the workspace from a version-only query (same errors as get)."""
+        try:
+            found = self._workspace_repo.find_version(workspace_id)
+            if not found:
+                raise HTTPException(status_code=404, detail='Workspace not found.')
+
+            owner_id, updated_at, created_at = found
+            if owner_id != user_id:
+                raise HTTPException(
+                    status_code=403, detail='Not authorized to access this workspace.'
+                )
+
+            return version_etag(workspace_id, updated_at, created_at)
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
     def get_all_workspaces(
-        self, user_id: UUID, page: int = 1, per_page: int = 10
+        self,
+        user_id: UUID,
+        page: int = 1,
+        per_page: int = 10,
+        include_total: bool = True,
+        cursor: str | None = None,
     ) -> WorkspaceListResponse:
         try:
             if page < 1:
@@ -62,13 +103,59 @@ class WorkspaceService:
 
             offset = (page - 1) * per_page
 
-            workspaces, total = self._workspace_repo.find_all_by_user_id(
-                user_id, offset=offset, limit=per_page
+            workspaces = self._workspace_repo.find_all_by_user_id(
+                user_id,
+                offset=offset,
+                limit=per_page,
+                with_total=include_total,
+                cursor=cursor,
+            )
+            workspaces.page = None if cursor else page
+            workspaces.per_page = per_page
+
+            return workspaces
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def get_all_workspaces_async(
+        self,
+        user_id: UUID,
+        page: int = 1,
+        per_page: int = 10,
+        include_total: bool = True,
+        cursor: str | None = None,
+    ) -> WorkspaceListResponse:
+        '''`get_all_workspaces` for `async def` routes.
+
+        Runs on the event loop with the async repository; without it
+        (DB_ASYNC_ENABLED off) the sync path runs in a worker thread.
+        '''
+        if self._async_workspace_repo is None:
+            return await asyncio.to_thread(
+                self.get_all_workspaces, user_id, page, per_page, include_total, cursor
             )
 
-            return WorkspaceListResponse(
-                workspaces=workspaces, total=total, page=page, per_page=per_page
+        try:
+            if page < 1:
+                raise HTTPException(status_code=400, detail='Page must be >= 1')
+            if per_page < 1:
+                raise HTTPException(status_code=400, detail='per_page must be >= 1')
+
+            offset = (page - 1) * per_page
+
+            workspaces = await self._async_workspace_repo.find_all_by_user_id(
+                user_id,
+                offset=offset,
+                limit=per_page,
+                with_total=include_total,
+                cursor=cursor,
             )
+            workspaces.page = None if cursor else page
+            workspaces.per_page = per_page
+
+            return workspaces
         except HTTPException:
             raise
         except Exception as e:
@@ -84,12 +171,36 @@ class WorkspaceService:
                 status=payload.status,
                 sorting=payload.sorting,
                 order=payload.order,
+                limit=payload.per_page,
+                with_total=payload.include_total,
+                cursor=payload.cursor,
             )
 
             return workspaces
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    async def search_workspace_async(
+        self, payload: SearchWorkspaceRequest, user_id: UUID
+    ) -> WorkspaceListResponse:
+        '''`search_workspace` for `async def` routes (see get_all_workspaces_async).'''
+        if self._async_workspace_repo is None:
+            return await asyncio.to_thread(self.search_workspace, payload, user_id)
+
+        try:
+            return await self._async_workspace_repo.search_by_criteria(
+                user_id,
+                name=payload.name,
+                status=payload.status,
+                sorting=payload.sorting,
+                order=payload.order,
+                limit=payload.per_page,
+                with_total=payload.include_total,
+                cursor=payload.cursor,
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     # def update_workspace(
     #     self, workspace_id: uuid.UUID, payload: UpdateWorkspaceRequest
     # ) -> UpdateWorkspaceResponse:
@@ -113,6 +224,13 @@ class WorkspaceService:
                 )
 
             self._workspace_repo.delete(found_workspace.id)
+            if self._ownership_cache is not None:
+                # once committed, or a concurrent check may cache it again
+                after_commit(
+                    functools.partial(
+                        self._ownership_cache.delete, (user_id, found_workspace.id)
+                    )
+                )
 
             return {'message': 'Workspace deleted successfully.'}
         except HTTPException:
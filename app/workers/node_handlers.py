@@ -0,0 +1,74 @@
+'''Node handlers executed by the workflow worker, keyed by node type.
+
+A handler is an async callable receiving a `NodeContext` and returning the
+node output, which becomes an input of the downstream nodes:
+
+  registry = NodeHandlerRegistry()
+
+  @registry.register('http')
+  async def http_node(ctx: NodeContext):
+      ...
+
+Types are the `NodeDefinition.type` values used in the workflow JSON and are
+matched case-insensitively. Nodes without a registered handler run the
+fallback handler, which passes its inputs through.
+'''
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NodeContext:
+    job: dict
+    node: dict
+    # outputs of the upstream nodes, by node name
+    inputs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def parameters(self) -> dict:
+        return self.node.get('parameters') or {}
+
+
+NodeHandler = Callable[[NodeContext], Awaitable[Any]]
+
+
+class NodeHandlerRegistry:
+    def __init__(self, fallback: Optional[NodeHandler] = None) -> None:
+        self._handlers: dict[str, NodeHandler] = {}
+        self.fallback = fallback or passthrough_handler
+
+    def register(self, node_type: str, handler: Optional[NodeHandler] = None):
+        '''Register `handler` for `node_type`; usable as a decorator.'''
+
+        def decorator(fn: NodeHandler) -> NodeHandler:
+            self._handlers[node_type.lower()] = fn
+            return fn
+
+        return decorator(handler) if handler is not None else decorator
+
+    def get(self, node_type: Optional[str]) -> NodeHandler:
+        return self._handlers.get((node_type or '').lower(), self.fallback)
+
+    def types(self) -> list[str]:
+        return sorted(self._handlers)
+
+
+async def passthrough_handler(ctx: NodeContext) -> Any:
+    return ctx.inputs
+
+
+async def trigger_handler(ctx: NodeContext) -> Any:
+    # the trigger output is the payload the job was enqueued with
+    return ctx.job.get('payload') or {}
+
+
+def default_registry() -> NodeHandlerRegistry:
+    registry = NodeHandlerRegistry()
+    registry.register('trigger', trigger_handler)
+    return registry
@@ -0,0 +1,428 @@
+'''Asyncio consumer of the workflow job queue.
+
+Pops jobs from the configured queue backend (`QUEUE_BACKEND`), resolves the
+workflow definition (inline `payload` of an activate job, or `workflow_hash`
+through `WorkflowDefinitionStore`), and walks the compiled graph from the
+job's node: a node is scheduled as soon as all of its upstream nodes have
+finished, so independent branches run concurrently.
+
+Two semaphores bound the work in flight:
+- WORKER_MAX_JOBS: jobs processed at the same time by this process,
+- WORKER_CONCURRENCY: node handlers running at the same time, all jobs
+  together.
+
+SIGINT/SIGTERM stop popping new jobs; jobs in flight get
+WORKER_SHUTDOWN_TIMEOUT seconds to finish before they are cancelled. With
+the stream backend a job is acknowledged only after it finished, so jobs of
+a killed worker are reclaimed by another one.
+
+Run:
+  python -m app.workers.workflow_worker [--concurrency 32] [--max-jobs 64]
+'''
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.cache.workflow_definition_store import WorkflowDefinitionStore
+from app.core.dependencies.execution_events import ExecutionEventPublisher
+from app.core.dependencies.job_codec import JobCodec
+from app.core.dependencies.queue_backends import QueueMessage, create_queue_backend
+from app.core.dependencies.redis import RedisConnectionManager
+from app.core.dependencies.workflow_graph import (
+    CompiledWorkflow,
+    compile_workflow,
+    workflow_content_hash,
+)
+from app.models.system_execution import ExecutionStatus
+from app.repositories.system_execution_repository import SystemExecutionRepository
+from app.services.execution_log_writer import ExecutionLogWriter
+from app.workers.node_handlers import (
+    NodeContext,
+    NodeHandlerRegistry,
+    default_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowJobError(Exception):
+    pass
+
+
+class WorkflowWorker:
+    def __init__(
+        self,
+        config: Any,
+        connection_manager: RedisConnectionManager,
+        definition_store: Optional[WorkflowDefinitionStore] = None,
+        graph_cache: Optional[TTLCache] = None,
+        registry: Optional[NodeHandlerRegistry] = None,
+        concurrency: Optional[int] = None,
+        max_jobs: Optional[int] = None,
+        log_writer: Optional[ExecutionLogWriter] = None,
+        event_publisher: Optional[ExecutionEventPublisher] = None,
+        execution_repo: Optional[SystemExecutionRepository] = None,
+    ) -> None:
+        self.config = config
+        self.connection_manager = connection_manager
+        self.definition_store = definition_store
+        self.graph_cache = graph_cache if graph_cache is not None else TTLCache()
+        self.registry = registry or default_registry()
+        self.codec = JobCodec.from_config(config)
+        # execution logs of jobs carrying an `execution_id`
+        self.log_writer = log_writer
+        # live `log` events for SSE / WebSocket subscribers
+        self.event_publisher = event_publisher
+        # moves running executions to completed / failed
+        self.execution_repo = execution_repo
+
+        self.concurrency = int(concurrency or config.get('WORKER_CONCURRENCY') or 32)
+        self.max_jobs = int(max_jobs or config.get('WORKER_MAX_JOBS') or 64)
+        self.pop_timeout = float(config.get('WORKER_POP_TIMEOUT') or 1)
+        self.shutdown_timeout = float(config.get('WORKER_SHUTDOWN_TIMEOUT') or 30)
+
+        self.queue = None
+        self._node_slots = asyncio.Semaphore(self.concurrency)
+        self._job_slots = asyncio.Semaphore(self.max_jobs)
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+        self.started_at: Optional[float] = None
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.nodes_run = 0
+
+    # ---------------- lifecycle ----------------
+    async def run(self) -> None:
+        if self.codec.binary:
+            redis = await self.connection_manager.get_raw_client()
+        else:
+            redis = await self.connection_manager.get_client()
+        self.queue = create_queue_backend(redis, self.config)
+
+        self.started_at = time.monotonic()
+        logger.info(
+            'Worker started: queue=%s concurrency=%d max_jobs=%d handlers=%s',
+            self.queue.name,
+            self.concurrency,
+            self.max_jobs,
+            self.registry.types(),
+        )
+
+        while not self._stopping.is_set():
+            await self._job_slots.acquire()
+            try:
+                message = await self.queue.pop(self.pop_timeout)
+            except Exception:
+                self._job_slots.release()
+                if self._stopping.is_set():
+                    break
+                logger.exception('Failed to pop a job, retrying')
+                await asyncio.sleep(self.pop_timeout)
+                continue
+
+            if message is None:
+                self._job_slots.release()
+                continue
+
+            task = asyncio.create_task(self._process(message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        await self._drain()
+        logger.info('Worker stopped: %s', self.stats())
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _drain(self) -> None:
+        if not self._tasks:
+            return
+        logger.info('Waiting for %d jobs in flight...', len(self._tasks))
+        _, pending = await asyncio.wait(self._tasks, timeout=self.shutdown_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            # not acknowledged: the stream backend hands them to another worker
+            logger.warning('Cancelled %d unfinished jobs', len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            'jobs_done': self.jobs_done,
+            'jobs_failed': self.jobs_failed,
+            'nodes_run': self.nodes_run,
+            'in_flight': len(self._tasks),
+            'elapsed_s': round(elapsed, 3),
+            'jobs_per_s': round(self.jobs_done / elapsed, 1) if elapsed else 0.0,
+        }
+
+    # ---------------- jobs ----------------
+    async def _process(self, message: QueueMessage) -> None:
+        job: dict = {}
+        try:
+            job = self.codec.decode(message.data)
+            await self.execute_job(job)
+            self.jobs_done += 1
+            await self._log(job, 'Execution finished')
+            await self._finish(job, ExecutionStatus.COMPLETED)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.jobs_failed += 1
+            logger.exception('Job failed')
+            await self._log(job, f'Execution failed: {e}', level='error')
+            await self._finish(job, ExecutionStatus.FAILED)
+        finally:
+            self._job_slots.release()
+
+        # failed jobs are acknowledged too: retrying a job that cannot be
+        # decoded or whose workflow is broken would fail the same way
+        try:
+            await self.queue.ack(message)
+        except Exception:
+            logger.exception('Failed to acknowledge job %s', message.message_id)
+
+    async def execute_job(self, job: dict) -> dict[str, Any]:
+        '''Run the graph of `job` from its start node; returns node outputs.'''
+
+        graph, job = await self._load_graph(job)
+        return await self.run_graph(graph, job, self._start_nodes(graph, job))
+
+    async def _load_graph(self, job: dict) -> tuple[CompiledWorkflow, dict]:
+        payload = job.get('payload') or {}
+        if 'nodes' in payload:
+            # activate job: the payload is the workflow definition itself
+            definition, content_hash = payload, workflow_content_hash(payload)
+            job = {**job, 'payload': {}}
+        elif job.get('workflow_hash'):
+            content_hash = job['workflow_hash']
+            definition = None
+            if self.definition_store is not None:
+                definition = await self.definition_store.resolve(content_hash)
+            if definition is None:
+                definition = await self._execution_definition(job, content_hash)
+            if definition is None:
+                raise WorkflowJobError(f'Unknown workflow hash {content_hash}')
+        else:
+            raise WorkflowJobError(
+                f"Job {job.get('job_id')} has no workflow definition or hash"
+            )
+
+        key = (definition.get('id'), content_hash)
+        graph = self.graph_cache.get(key)
+        if graph is None:
+            graph = compile_workflow(definition, content_hash)
+            self.graph_cache.set(key, graph)
+        return graph, job
+
+    async def _execution_definition(
+        self, job: dict, content_hash: str
+    ) -> Optional[dict]:
+        '''The inline `system_json` of the job's execution, if it has that hash.
+
+        Fallback for definitions that were never saved to the store and are no
+        longer (or not yet) in Redis.
+        '''
+        execution_id = job.get('execution_id')
+        if self.execution_repo is None or not execution_id:
+            return None
+        execution = await asyncio.to_thread(
+            self.execution_repo.find_by_id, UUID(execution_id)
+        )
+        definition = execution.system_json if execution is not None else None
+        if not definition or workflow_content_hash(definition) != content_hash:
+            return None
+        return definition
+
+    def _start_nodes(self, graph: CompiledWorkflow, job: dict) -> list[int]:
+        node_name = job.get('node_name')
+        if node_name:
+            if node_name not in graph.node_index:
+                raise WorkflowJobError(f'Node "{node_name}" not in workflow')
+            return [graph.node_index[node_name]]
+
+        trigger = graph.type_index.get('trigger')
+        if trigger:
+            return [trigger[0]]
+        return [i for i, preds in enumerate(graph.predecessors) if not preds]
+
+    async def run_graph(
+        self, graph: CompiledWorkflow, job: dict, start: list[int]
+    ) -> dict[str, Any]:
+        # only the part of the graph reachable from the start nodes runs
+        reachable = set(start)
+        stack = list(start)
+        while stack:
+            for tgt in graph.successors[stack.pop()]:
+                if tgt not in reachable:
+                    reachable.add(tgt)
+                    stack.append(tgt)
+
+        waiting_on = {
+            i: sum(1 for p in graph.predecessors[i] if p in reachable)
+            for i in reachable
+        }
+        outputs: dict[int, Any] = {}
+        running: dict[asyncio.Task, int] = {}
+
+        def schedule(i: int) -> None:
+            inputs = {
+                graph.node_names[p]: outputs[p]
+                for p in graph.predecessors[i]
+                if p in outputs
+            }
+            ctx = NodeContext(job=job, node=graph.nodes[i], inputs=inputs)
+            running[asyncio.create_task(self._run_node(ctx))] = i
+
+        for i in start:
+            schedule(i)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    i = running.pop(task)
+                    outputs[i] = task.result()
+                    for tgt in graph.successors[i]:
+                        waiting_on[tgt] -= 1
+                        if waiting_on[tgt] == 0:
+                            schedule(tgt)
+        finally:
+            # a failed node fails the job: stop its sibling branches
+            for task in running:
+                task.cancel()
+
+        if len(outputs) < len(reachable):
+            logger.warning(
+                "Workflow '%s': %d nodes on a cycle were not run",
+                graph.name,
+                len(reachable) - len(outputs),
+            )
+        return {graph.node_names[i]: out for i, out in outputs.items()}
+
+    async def _run_node(self, ctx: NodeContext) -> Any:
+        handler = self.registry.get(ctx.node.get('type'))
+        async with self._node_slots:
+            started = time.perf_counter()
+            try:
+                result = await handler(ctx)
+            except Exception as e:
+                await self._log(
+                    ctx.job, f'Node failed: {e}', 'error', ctx.node.get('name')
+                )
+                raise
+            duration_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        self.nodes_run += 1
+        await self._log(
+            ctx.job,
+            'Node finished',
+            node_name=ctx.node.get('name'),
+            data={'duration_ms': duration_ms},
+        )
+        return result
+
+    async def _finish(self, job: dict, status: str) -> None:
+        execution_id = job.get('execution_id')
+        if self.execution_repo is None or not execution_id:
+            return
+        try:
+            # compare-and-set from running: an execution stopped meanwhile
+            # stays stopped
+            execution = await asyncio.to_thread(
+                self.execution_repo.transition_status,
+                UUID(execution_id),
+                ExecutionStatus.STOPPABLE,
+                status,
+                set_stopped=True,
+            )
+            if execution is not None and self.event_publisher is not None:
+                await self.event_publisher.publish(
+                    execution_id, 'status', {'status': status}
+                )
+        except Exception as e:
+            logger.warning('Failed to finish execution %s: %s', execution_id, e)
+
+    async def _log(
+        self,
+        job: dict,
+        message: str,
+        level: str = 'info',
+        node_name: Optional[str] = None,
+        data: Optional[dict] = None,
+    ) -> None:
+        execution_id = job.get('execution_id')
+        if not execution_id:
+            return
+        if self.log_writer is not None:
+            self.log_writer.append(UUID(execution_id), message, level, node_name, data)
+        if self.event_publisher is not None:
+            try:
+                await self.event_publisher.publish(
+                    execution_id,
+                    'log',
+                    {
+                        'level': level,
+                        'message': message,
+                        'node_name': node_name,
+                        'data': data,
+                    },
+                )
+            except Exception as e:
+                logger.warning('Failed to publish execution log event: %s', e)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Workflow queue worker')
+    p.add_argument('--concurrency', type=int, help='node handlers in flight')
+    p.add_argument('--max-jobs', type=int, help='jobs in flight')
+    return p.parse_args()
+
+
+async def main(args) -> None:
+    from app.configs.app_config import configs
+    from app.core.containers.application_container import ApplicationContainer
+
+    container = ApplicationContainer.create(config_data=configs.model_dump())
+    connection_manager = container.custom_containers.redis_manager()
+    await connection_manager.start()
+    log_writer = container.services.execution_log_writer()
+    await log_writer.start()
+
+    worker = WorkflowWorker(
+        config=container.config(),
+        connection_manager=connection_manager,
+        definition_store=container.services.workflow_definition_store(),
+        graph_cache=container.custom_containers.workflow_graph_cache(),
+        concurrency=args.concurrency,
+        max_jobs=args.max_jobs,
+        log_writer=log_writer,
+        event_publisher=container.custom_containers.execution_event_publisher(),
+        execution_repo=container.repositories.system_execution_repository(),
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await log_writer.stop()
+        await connection_manager.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,122 @@
+'''Size and speed of the queue job codecs (app/core/dependencies/job_codec.py).
+
+Encodes an activate job carrying a synthetic workflow definition, and a
+small trigger job, with every codec/compression pair and prints the message
+size and the mean encode / decode time.
+
+Run (from the repository root):
+  python -m scripts.bench_job_codec [--nodes 60] [--rounds 2000]
+'''
+
+import argparse
+import time
+import uuid
+
+from app.core.dependencies.job_codec import JobCodec, JobCodecError
+
+SETTINGS = [
+    ('legacy', 'none'),
+    ('json', 'none'),
+    ('msgpack', 'none'),
+    ('json', 'zlib'),
+    ('json', 'zstd'),
+    ('msgpack', 'zstd'),
+]
+
+
+def make_workflow(node_count: int) -> dict:
+    nodes = [
+        {
+            'id': str(uuid.uuid4()),
+            'name': f'Node {i}',
+            'type': 'trigger' if i == 0 else 'http_request',
+            'position': [i * 220, 300],
+            'parameters': {
+                'method': 'POST',
+                'url': f'https://api.example.com/v1/resources/{i}',
+                'headers': {'Content-Type': 'application/json', 'X-Node': str(i)},
+                'body': {'query': 'select * from items where owner = :owner'},
+                'timeout': 30,
+                'retry': {'attempts': 3, 'backoff': 'exponential'},
+            },
+        }
+        for i in range(node_count)
+    ]
+    connections = [
+        {
+            'main': [
+                [
+                    {
+                        'sourceNode': nodes[i]['name'],
+                        'targetNode': nodes[i + 1]['name'],
+                    }
+                ]
+            ]
+        }
+        for i in range(node_count - 1)
+    ]
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'benchmark',
+        'nodes': nodes,
+        'connections': connections,
+    }
+
+
+def make_jobs(node_count: int) -> dict[str, dict]:
+    base = {
+        'job_id': str(uuid.uuid4()),
+        'instance_id': str(uuid.uuid4()),
+        'exec_id': str(uuid.uuid4()),
+        'created_at': int(time.time()),
+    }
+    return {
+        f'activate ({node_count} nodes)': {
+            **base,
+            'task_name': 'start',
+            'payload': make_workflow(node_count),
+        },
+        'trigger': {
+            **base,
+            'node_name': 'Node 0',
+            'workflow_hash': 'a' * 64,
+            'payload': {'trigger': 'manual', 'timestamp': '2024-01-01T00:00:00'},
+            'is_trigger_job': True,
+        },
+    }
+
+
+def mean_us(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=60)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    for label, job in make_jobs(args.nodes).items():
+        print(f'{label}:')
+        print(f'  {"codec":18s} {"bytes":>8s} {"encode us":>10s} {"decode us":>10s}')
+        for codec_name, compression in SETTINGS:
+            try:
+                codec = JobCodec(codec_name, compression)
+            except JobCodecError as e:
+                print(f'  {codec_name}+{compression}: skipped ({e})')
+                continue
+            message = codec.encode(job)
+            assert codec.decode(message) == job
+            encode = mean_us(lambda: codec.encode(job), args.rounds)
+            decode = mean_us(lambda: codec.decode(message), args.rounds)
+            print(
+                f'  {codec_name + "+" + compression:18s} {len(message):8d} '
+                f'{encode:10.1f} {decode:10.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+'''Throughput of the job queue backends and stream reclaim behaviour
+(app/core/dependencies/queue_backends.py).
+
+For the list and the stream backend: push `--jobs` messages in batches of
+`--batch`, then pop and acknowledge all of them, and print messages per
+second for both phases. Then for the stream backend: leave `--stuck` entries
+pending with a consumer that never acknowledges them and count the
+`XAUTOCLAIM` sweeps another consumer needs to take all of them over.
+
+Keys are prefixed with a random `bench:` name and deleted afterwards.
+
+Run (from the repository root):
+  python -m scripts.bench_queue_backends [--redis-url redis://...] [--jobs 20000]
+  python -m scripts.bench_queue_backends --fake   # fakeredis, no server needed
+
+Timings with `--fake` only measure the client side; the reclaim sweep count
+is meaningful either way.
+'''
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import redis.asyncio as aioredis
+
+from app.core.dependencies.queue_backends import ListQueueBackend, StreamQueueBackend
+
+
+def make_client(args) -> aioredis.Redis:
+    if args.fake:
+        import fakeredis
+
+        return fakeredis.aioredis.FakeRedis()
+    return aioredis.from_url(args.redis_url)
+
+
+async def throughput(backend, jobs: int, batch: int) -> tuple[float, float]:
+    message = '{"job_id":"%s","node_name":"Trigger","payload":{}}' % uuid.uuid4()
+
+    start = time.perf_counter()
+    for offset in range(0, jobs, batch):
+        await backend.push([message] * min(batch, jobs - offset))
+    pushed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(jobs):
+        item = await backend.pop(timeout=1.0)
+        if item is None:
+            raise RuntimeError('queue drained early')
+        await backend.ack(item)
+    popped = time.perf_counter() - start
+    return jobs / pushed, jobs / popped
+
+
+async def reclaim(redis: aioredis.Redis, stream: str, stuck: int, batch: int):
+    crashed = StreamQueueBackend(redis, stream, consumer='crashed', batch_size=batch)
+    await crashed.push([f'job-{i}' for i in range(stuck)])
+    for _ in range(stuck):
+        # read, never acknowledged: stays in the group's pending entries list
+        await crashed.pop(timeout=1.0)
+
+    idle_ms = 50
+    await asyncio.sleep(idle_ms / 1000 * 2)
+    survivor = StreamQueueBackend(
+        redis, stream, consumer='survivor', claim_idle_ms=idle_ms, batch_size=batch
+    )
+    sweeps = 0
+    xautoclaim = redis.xautoclaim
+
+    async def counted(*args, **kwargs):
+        nonlocal sweeps
+        sweeps += 1
+        return await xautoclaim(*args, **kwargs)
+
+    redis.xautoclaim = counted
+    try:
+        start = time.perf_counter()
+        reclaimed = 0
+        while reclaimed < stuck:
+            item = await survivor.pop(timeout=0.1)
+            if item is None:
+                break
+            await survivor.ack(item)
+            reclaimed += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        redis.xautoclaim = xautoclaim
+    return reclaimed, sweeps, elapsed
+
+
+async def run(args) -> None:
+    redis = make_client(args)
+    prefix = f'bench:{uuid.uuid4().hex[:8]}'
+    try:
+        backends = [
+            ListQueueBackend(redis, f'{prefix}:list'),
+            StreamQueueBackend(
+                redis, f'{prefix}:stream', maxlen=args.jobs * 2, batch_size=args.batch
+            ),
+        ]
+        print(f'{args.jobs} jobs, push batches of {args.batch}')
+        for backend in backends:
+            push_rate, pop_rate = await throughput(backend, args.jobs, args.batch)
+            print(
+                f'  {backend.name:6s} push {push_rate:10.0f}/s   '
+                f'pop+ack {pop_rate:10.0f}/s'
+            )
+
+        reclaimed, sweeps, elapsed = await reclaim(
+            redis, f'{prefix}:reclaim', args.stuck, args.batch
+        )
+        print(
+            f'stream reclaim: {reclaimed}/{args.stuck} stuck entries in '
+            f'{sweeps} XAUTOCLAIM sweeps ({elapsed * 1000:.0f} ms, '
+            f'batch {args.batch})'
+        )
+    finally:
+        await redis.delete(f'{prefix}:list', f'{prefix}:stream', f'{prefix}:reclaim')
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--redis-url', default=os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    )
+    parser.add_argument('--fake', action='store_true', help='use fakeredis')
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=16)
+    parser.add_argument('--stuck', type=int, default=40)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+'''Workflow triggers per second, with and without the shared Redis pool
+(app/core/dependencies/redis.py).
+
+Each trigger does what `trigger_workflow_in_background` does: create a
+`WorkflowClient`, connect, load the workflow, push the manual trigger job and
+close. Measured two ways:
+
+  per trigger  no connection manager: `from_url` + `PING` on every trigger
+  shared pool  one `RedisConnectionManager` for the whole run
+
+`--concurrency` triggers run at a time. Jobs go to a random `bench:` list
+that is deleted afterwards. Needs a reachable Redis server.
+
+Run (from the repository root):
+  python -m scripts.bench_workflow_triggers [--redis-url redis://localhost:6379/0]
+                                            [--triggers 2000] [--concurrency 20]
+'''
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+from app.core.dependencies.redis import RedisConnectionManager, WorkflowClient
+
+WORKFLOW = {
+    'id': str(uuid.uuid4()),
+    'name': 'benchmark',
+    'nodes': [
+        {'id': str(uuid.uuid4()), 'name': 'Start', 'type': 'trigger'},
+        {'id': str(uuid.uuid4()), 'name': 'Fetch', 'type': 'http_request'},
+    ],
+    'connections': [{'main': [[{'sourceNode': 'Start', 'targetNode': 'Fetch'}]]}],
+}
+
+
+async def trigger(config: dict, manager) -> None:
+    client = WorkflowClient(config, connection_manager=manager)
+    await client.connect()
+    try:
+        client.load_workflow(WORKFLOW)
+        await client.trigger_node_manual(execution_id=str(uuid.uuid4()))
+    finally:
+        await client.close()
+
+
+async def rate(config: dict, manager, triggers: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, triggers, concurrency):
+        await asyncio.gather(
+            *(
+                trigger(config, manager)
+                for _ in range(min(concurrency, triggers - offset))
+            )
+        )
+    return triggers / (time.perf_counter() - start)
+
+
+async def run(args) -> None:
+    config = {
+        'REDIS_URL': args.redis_url,
+        'QUEUE_BACKEND': 'list',
+        'MAIN_QUEUE': f'bench:{uuid.uuid4().hex[:8]}',
+    }
+    manager = RedisConnectionManager(config)
+    await manager.start()
+    try:
+        per_trigger = await rate(config, None, args.triggers, args.concurrency)
+        shared = await rate(config, manager, args.triggers, args.concurrency)
+        print(f'{args.triggers} triggers, {args.concurrency} at a time')
+        print(f'  per trigger {per_trigger:8.0f}/s')
+        print(f'  shared pool {shared:8.0f}/s   ({shared / per_trigger:.1f}x)')
+    finally:
+        client = await manager.get_client()
+        await client.delete(config['MAIN_QUEUE'])
+        await manager.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--redis-url', default=os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    )
+    parser.add_argument('--triggers', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    args = parser.parse_args()
+    # one INFO line per connect and per enqueued job otherwise
+    logging.getLogger('trigger_sim').setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+'''Cost of a workspace listing page (app/repositories/pagination.py).
+
+Seeds `--rows` workspaces for one new user, then times one page of
+`--limit` rows at a few offsets, four ways:
+
+  count+page  `query.count()` then the page query (two statements)
+  window      `fetch_page(with_total=True)`: `COUNT(*) OVER ()` in the page
+  no total    `fetch_page(with_total=False)`: limit + 1 rows, no count
+  cursor      keyset page after the last row of the previous page
+
+The seeded user and workspaces are deleted afterwards. Without
+`--database-uri` (or DATABASE_URI) a temporary sqlite file is used.
+
+Run (from the repository root):
+  python -m scripts.bench_workspace_pages [--database-uri postgresql://...]
+                                          [--rows 100000] [--limit 20]
+'''
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+from sqlmodel import SQLModel
+
+from app.db.databases.postgres import PostgresDatabase
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.repositories.pagination import fetch_page
+from app.repositories.workspace_repository import _keyset, _search_query
+
+
+def seed(db: PostgresDatabase, user_id: uuid.UUID, rows: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with db.session_factory() as session:
+        session.execute(insert(User), [{'id': user_id, 'email': f'{user_id}@bench'}])
+        for offset in range(0, rows, 5000):
+            session.execute(
+                insert(Workspace),
+                [
+                    {
+                        'id': uuid.uuid4(),
+                        'name': f'workspace {i}',
+                        'status': 'active',
+                        'systems_count': 0,
+                        'user_id': user_id,
+                        'created_at': start + timedelta(seconds=i),
+                    }
+                    for i in range(offset, min(offset + 5000, rows))
+                ],
+            )
+
+
+def cleanup(db: PostgresDatabase, user_id: uuid.UUID) -> None:
+    with db.session_factory() as session:
+        session.execute(delete(Workspace).where(Workspace.user_id == user_id))
+        session.execute(delete(User).where(User.id == user_id))
+
+
+def mean_ms(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def run(db: PostgresDatabase, user_id: uuid.UUID, args) -> None:
+    keyset = _keyset(None, None)
+
+    def query(session, cursor=None):
+        return _search_query(
+            session.query(Workspace), keyset, user_id, None, None, cursor
+        )
+
+    with db.session_factory() as session:
+
+        def count_and_page(offset):
+            total = query(session).order_by(None).count()
+            items = query(session).offset(offset).limit(args.limit).all()
+            return items, total
+
+        def window(offset):
+            return fetch_page(query(session), offset=offset, limit=args.limit)
+
+        def no_total(offset):
+            return fetch_page(
+                query(session), offset=offset, limit=args.limit, with_total=False
+            )
+
+        print(f'{args.rows} workspaces, pages of {args.limit}, mean ms per page')
+        print(f'  {"offset":>8s} {"count+page":>11s} {"window":>8s} {"no total":>9s}')
+        for offset in (0, args.rows // 2, args.rows - args.limit):
+            items, total, _ = window(offset)
+            assert (items, total) == count_and_page(offset)
+            timings = [
+                mean_ms(lambda: fn(offset), args.rounds)
+                for fn in (count_and_page, window, no_total)
+            ]
+            print(
+                f'  {offset:8d} {timings[0]:11.2f} {timings[1]:8.2f} '
+                f'{timings[2]:9.2f}'
+            )
+
+        # the row right before the middle of the listing
+        (previous,) = query(session).offset(args.rows // 2 - 1).limit(1).all()
+        cursor = keyset.cursor_for(previous)
+        cursor_ms = mean_ms(
+            lambda: fetch_page(
+                query(session, cursor), limit=args.limit, with_total=False
+            ),
+            args.rounds,
+        )
+        print(f'  cursor at {args.rows // 2}: {cursor_ms:.2f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-uri', default=os.getenv('DATABASE_URI'))
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    path = None
+    if args.database_uri:
+        db = PostgresDatabase(args.database_uri)
+    else:
+        path = tempfile.mktemp(suffix='.db')
+        db = PostgresDatabase(f'sqlite:///{path}')
+        SQLModel.metadata.create_all(
+            db.engine, tables=[User.__table__, Workspace.__table__]
+        )
+
+    user_id = uuid.uuid4()
+    try:
+        seed(db, user_id, args.rows)
+        run(db, user_id, args)
+    finally:
+        cleanup(db, user_id)
+        db.engine.dispose()
+        if path:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()